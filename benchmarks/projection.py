@@ -0,0 +1,91 @@
+"""
+File      : projection.py
+Date      : October, 2026
+Author    : agent
+Desc      : Compares the column projection read path with the ORM serialize() path,
+            run with python -m benchmarks.projection [number_of_items]
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+
+os.environ.setdefault('BUCKETLIST_SECRET_KEY', 'benchmark-secret')
+
+from datetime import date
+
+from bucketlist.controllers.database_controller import DatabaseController
+from bucketlist.models.db_model import Model
+from bucketlist.models.users import Users
+from bucketlist.models.bucketlist import Bucketlist
+from bucketlist.models.bucketlist_items import BucketlistItems
+
+ITEMS_PER_BUCKETLIST = 100
+
+
+def create_dataset(database_uri, number_of_items):
+    """
+    Inserts one user owning number_of_items items spread over bucketlists of ITEMS_PER_BUCKETLIST items
+    """
+    controller = DatabaseController(database_uri)
+    Model.metadata.create_all(controller.db_engine)
+    number_of_bucketlists = max(number_of_items // ITEMS_PER_BUCKETLIST, 1)
+
+    with controller.db_engine.begin() as connection:
+        connection.execute(Users.__table__.insert(), [{
+            'user_id': 1, 'first_name': 'bench', 'last_name': 'mark', 'username': 'benchmark',
+            'email': 'benchmark@mail.com', 'hash_password': '', 'data_version': 0}])
+        connection.execute(Bucketlist.__table__.insert(), [{
+            'bucketlist_id': index + 1, 'bucketlist_name': 'list {}'.format(index), 'date': date.today(), 'user': 1}
+            for index in range(number_of_bucketlists)])
+        connection.execute(BucketlistItems.__table__.insert(), [{
+            'item_id': index + 1, 'item_name': 'item {}'.format(index), 'date_created': date.today(),
+            'done': index % 3 == 0, 'description': 'description of item {}'.format(index),
+            'bucketlist': index % number_of_bucketlists + 1}
+            for index in range(number_of_items)])
+    controller.db_engine.dispose()
+
+
+def measure(database_uri, mode, results):
+    """
+    Runs one read path in a fresh process so the peak memory of the two paths is measured separately
+    """
+    controller = DatabaseController(database_uri)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.time()
+    if mode == 'serialize':
+        bucketlists = controller.get_bucketlist_by_id(user=1, serialize=True)
+    else:
+        bucketlists = controller.get_bucketlist_projection(user=1)
+    elapsed = time.time() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rows = sum(len(bucketlist['bucketlist_items']) for bucketlist in bucketlists)
+    results.put((mode, rows, elapsed, rss_after - rss_before))
+
+
+def run(number_of_items):
+    database_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database_file.close()
+    database_uri = 'sqlite:///' + database_file.name
+    try:
+        create_dataset(database_uri, number_of_items)
+        results = multiprocessing.Queue()
+        for mode in ('serialize', 'projection'):
+            process = multiprocessing.Process(target=measure, args=(database_uri, mode, results))
+            process.start()
+            mode, rows, elapsed, peak_kb = results.get()
+            process.join()
+            print('{:<10} {:>8} items  {:>10.0f} rows/s  {:>8.2f} s  peak +{:.1f} MB'.format(
+                mode, rows, rows / elapsed, elapsed, peak_kb / 1024.0))
+    finally:
+        os.remove(database_file.name)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,384 @@
+"""
+File      : routes.py
+Date      : October, 2026
+Author    : agent
+Desc      : Times every route registered by initialize_api_routes against a synthetic SQLite dataset,
+            run with python -m benchmarks.routes run [--sizes 100,1000,10000] [--output results.json]
+            and compare two runs with python -m benchmarks.routes compare baseline.json results.json
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import re
+import sys
+import json
+import time
+import platform
+import resource
+import tempfile
+import argparse
+import multiprocessing
+
+from datetime import date
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+DEFAULT_REQUESTS = 100
+
+# relative increase of the p50 or p95 latency, or of the queries per request, reported as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# latency changes smaller than this are timer noise, not regressions
+MIN_LATENCY_CHANGE_MS = 1.0
+
+ITEMS_PER_BUCKETLIST = 10
+
+PASSWORD = 'benchmark-password'
+
+# the reads run first so that they see the dataset as it was created, the deletes last
+METHOD_ORDER = ['GET', 'PUT', 'POST', 'DELETE']
+
+ROUTE_ARGUMENT = re.compile(r'<(?:[^:<>]+:)?([^<>]+)>')
+
+
+def percentile(values, fraction):
+    """
+    :param values: sorted list of numbers
+    :param fraction: percentile between 0 and 1
+    :return: the nearest-rank percentile of the values
+    """
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def create_dataset(controller, size):
+    """
+    Inserts the benchmark user, owning size items spread over bucketlists of ITEMS_PER_BUCKETLIST items,
+    and another user with a copy of the same data
+
+    :param controller: DatabaseController of the benchmark database
+    :param size: number of items of each user
+    :return: id of the benchmark user
+    """
+    from bucketlist.models import search_index
+    from bucketlist.models.db_model import Model
+    from bucketlist.models.users import Users
+    from bucketlist.models.bucketlist import Bucketlist
+    from bucketlist.models.bucketlist_items import BucketlistItems
+
+    Model.metadata.create_all(controller.db_engine)
+    search_index.create_search_index(controller.db_engine)
+    hash_password = controller.password_hasher.hash(PASSWORD)
+    number_of_bucketlists = max(size // ITEMS_PER_BUCKETLIST, 1)
+
+    with controller.db_engine.begin() as connection:
+        connection.execute(Users.__table__.insert(), [
+            {'user_id': user_id, 'first_name': 'bench', 'last_name': 'mark {}'.format(user_id),
+             'username': 'benchmark{}'.format(user_id), 'email': 'benchmark{}@mail.com'.format(user_id),
+             'hash_password': hash_password, 'data_version': 0}
+            for user_id in (1, 2)])
+        connection.execute(Bucketlist.__table__.insert(), [
+            {'bucketlist_id': user_offset * number_of_bucketlists + index + 1,
+             'bucketlist_name': 'list {}'.format(index), 'date': date.today(), 'user': user_offset + 1}
+            for user_offset in (0, 1) for index in range(number_of_bucketlists)])
+        connection.execute(BucketlistItems.__table__.insert(), [
+            {'item_id': user_offset * size + index + 1, 'item_name': 'item {}'.format(index),
+             'date_created': date.today(), 'done': index % 3 == 0,
+             'description': 'description of item {} on the benchmark list'.format(index),
+             'bucketlist': user_offset * number_of_bucketlists + index % number_of_bucketlists + 1}
+            for user_offset in (0, 1) for index in range(size)])
+
+    controller.repair_item_counts()
+    controller.rebuild_search_index()
+    return 1
+
+
+class RouteRequests(object):
+    """
+    Builds the requests sent to each route. Routes writing data get a fresh body, and the routes deleting
+    a resource get a fresh resource, created before the request outside of the timing.
+    """
+
+    def __init__(self, controller, user_id, token):
+        self.controller = controller
+        self.user_id = user_id
+        self.headers = {'TOKEN': token}
+        self.counter = 0
+        bucketlist = controller.get_bucketlist_by_id(user=user_id)[0]
+        self.arguments = {
+            'user_id': user_id,
+            'bucket_id': bucketlist.bucketlist_id,
+            'item_id': controller.get_item_by_id(bucket_id=bucketlist.bucketlist_id)[0].item_id,
+            'search_value': 'benchmark'
+        }
+
+    def unique(self):
+        self.counter += 1
+        return self.counter
+
+    def new_user(self):
+        from bucketlist.models.users import Users
+        number = self.unique()
+        user_id = self.controller.insert_rows(Users, [{
+            'first_name': 'deleted', 'last_name': 'user', 'username': 'deleted{}'.format(number),
+            'email': 'deleted{}@mail.com'.format(number), 'hash_password': ''}])[0]
+        self.controller.session.commit()
+        return {'user_id': user_id}
+
+    def new_bucketlist(self):
+        return {'bucket_id': self.controller.create_bucketlists(['deleted list'], self.user_id)[0]}
+
+    def new_item(self):
+        return {'item_id': self.controller.create_bucketlist_items([{'item_name': 'deleted item'}],
+                                                                   self.arguments['bucket_id'])[0]}
+
+    def body(self, endpoint):
+        """
+        :param endpoint: endpoint name of the route
+        :return: request body of the route, or None
+        """
+        number = self.unique()
+        if endpoint == 'add_user':
+            return {'first_name': 'new', 'last_name': 'user', 'username': 'new{}'.format(number),
+                    'email': 'new{}@mail.com'.format(number), 'password': PASSWORD}
+        if endpoint == 'login':
+            return {'username': 'benchmark{}'.format(self.user_id), 'password': PASSWORD}
+        if endpoint == 'update_user':
+            return {'first_name': 'bench', 'last_name': 'mark', 'username': 'benchmark{}'.format(self.user_id),
+                    'email': 'benchmark{}@mail.com'.format(self.user_id)}
+        if endpoint in ('create_bucketlist', 'update_bucketlist'):
+            return {'name': 'list {}'.format(number)}
+        if endpoint == 'create_bucketlist_item':
+            return {'name': 'item {}'.format(number), 'description': 'benchmark item'}
+        if endpoint == 'update_item':
+            return {'name': 'item {}'.format(number), 'done': 'True', 'description': 'benchmark item'}
+        if endpoint == 'import_data':
+            lines = [{'type': 'bucketlist', 'bucketlist_id': 1, 'bucketlist_name': 'imported {}'.format(number)}]
+            lines += [{'type': 'item', 'bucketlist': 1, 'item_name': 'imported item {}'.format(index)}
+                      for index in range(ITEMS_PER_BUCKETLIST)]
+            return '\n'.join(json.dumps(line) for line in lines)
+        return None
+
+    def prepare(self, rule, method):
+        """
+        :param rule: werkzeug rule of the route
+        :param method: HTTP method
+        :return: (path, body) of the next request, or None if the route takes an unknown argument
+        """
+        arguments = dict(self.arguments)
+        if method == 'DELETE':
+            if 'user_id' in rule.arguments:
+                arguments.update(self.new_user())
+            if 'bucket_id' in rule.arguments:
+                arguments.update(self.new_bucketlist())
+            if 'item_id' in rule.arguments:
+                arguments.update(self.new_item())
+        if not set(rule.arguments) - set(rule.defaults or ()) <= set(arguments):
+            return None
+
+        path = ROUTE_ARGUMENT.sub(lambda match: str(arguments[match.group(1)]), rule.rule)
+        body = self.body(rule.endpoint)
+        if isinstance(body, dict):
+            body = json.dumps(body)
+        return path, body
+
+
+def benchmark_size(size, number_of_requests, results):
+    """
+    Creates a database of the given size and times number_of_requests requests to each route.
+    It runs in its own process, so that the peak memory of every size is measured on its own.
+
+    :param size: number of items of the benchmark user
+    :param number_of_requests: requests sent to each route
+    :param results: queue receiving the results of the routes
+    :return: None
+    """
+    database_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database_file.close()
+
+    try:
+        from sqlalchemy import event
+        from bucketlist.app import create_app
+        from bucketlist.controllers.controller import EXTENSION_KEY
+
+        app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + database_file.name})
+        data_controller = app.extensions[EXTENSION_KEY]['data_controller']
+        user_id = create_dataset(data_controller, size)
+        client = app.test_client()
+        login = client.post('/auth/login/', data=json.dumps({'username': 'benchmark1', 'password': PASSWORD}),
+                            content_type='text/plain')
+        requests = RouteRequests(data_controller, user_id, json.loads(login.data)['TOKEN'])
+
+        queries = [0]
+
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            queries[0] += 1
+
+        event.listen(data_controller.db_engine, 'before_cursor_execute', count_query)
+
+        routes = [(rule, method) for rule in app.url_map.iter_rules() if rule.endpoint != 'static'
+                  for method in METHOD_ORDER if method in rule.methods]
+        routes.sort(key=lambda route: METHOD_ORDER.index(route[1]))
+
+        measured = {}
+        for rule, method in routes:
+            name = '{} {}'.format(method, rule.rule)
+            latencies = []
+            statuses = set()
+            query_count = 0
+            for _ in range(number_of_requests):
+                request = requests.prepare(rule, method)
+                if request is None:
+                    break
+                path, body = request
+                queries[0] = 0
+                started = time.time()
+                response = client.open(path, method=method, data=body, headers=requests.headers,
+                                       content_type='text/plain')
+                response.get_data()
+                latencies.append(time.time() - started)
+                query_count += queries[0]
+                statuses.add(response.status_code)
+            if not latencies:
+                measured[name] = {'skipped': 'unknown route argument'}
+                continue
+
+            latencies.sort()
+            measured[name] = {
+                'requests': len(latencies),
+                'status_codes': sorted(statuses),
+                'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+                'requests_per_second': round(len(latencies) / sum(latencies), 1),
+                'queries_per_request': round(float(query_count) / len(latencies), 2),
+                'peak_rss_mb': round(peak_rss_mb(), 1)
+            }
+        results.put((size, measured))
+    except Exception as err:
+        results.put((size, {'error': repr(err)}))
+        raise
+    finally:
+        os.remove(database_file.name)
+
+
+def peak_rss_mb():
+    """
+    :return: peak resident memory of this process in MB, ru_maxrss is in KB on Linux and in bytes on macOS
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def run(sizes, number_of_requests):
+    """
+    :param sizes: dataset sizes, each benchmarked in a fresh process
+    :param number_of_requests: requests sent to each route
+    :return: dictionary of the run's environment and the results of every route at every size
+    """
+    os.environ.setdefault('BUCKETLIST_SECRET_KEY', 'benchmark-secret')
+    os.environ.setdefault('BUCKETLIST_ENV', 'production')
+    # the routes are timed doing their work, not answering from the response cache
+    os.environ.setdefault('BUCKETLIST_RESPONSE_CACHE_SIZE', '0')
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests_per_route': number_of_requests,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'sizes': {}
+    }
+    for size in sizes:
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=benchmark_size, args=(size, number_of_requests, results))
+        process.start()
+        size, measured = results.get()
+        process.join()
+        report['sizes'][str(size)] = measured
+        print_results(size, measured)
+    return report
+
+
+def print_results(size, measured):
+    print('\n{} items'.format(size))
+    if 'error' in measured:
+        print('  failed: {}'.format(measured['error']))
+        return
+    print('  {:<58} {:>9} {:>9} {:>9} {:>9} {:>8} {:>8}'.format('route', 'p50 ms', 'p95 ms', 'p99 ms', 'req/s',
+                                                            'queries', 'rss MB'))
+    for name in sorted(measured):
+        result = measured[name]
+        if 'skipped' in result:
+            print('  {:<58} skipped, {}'.format(name, result['skipped']))
+            continue
+        print('  {:<58} {:>9} {:>9} {:>9} {:>9} {:>8} {:>8}'.format(
+            name, result['p50_ms'], result['p95_ms'], result['p99_ms'], result['requests_per_second'],
+            result['queries_per_request'], result['peak_rss_mb']))
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    :param baseline: report of a saved run
+    :param current: report of the run being checked
+    :param threshold: relative increase reported as a regression
+    :return: list of regression messages
+    """
+    regressions = []
+    for size, routes in sorted(current['sizes'].items()):
+        for name, result in sorted(routes.items()):
+            before = baseline['sizes'].get(size, {}).get(name)
+            if not before or 'p50_ms' not in before or 'p50_ms' not in result:
+                continue
+            for metric in ('p50_ms', 'p95_ms', 'queries_per_request'):
+                if metric.endswith('_ms') and result[metric] - before[metric] < MIN_LATENCY_CHANGE_MS:
+                    continue
+                if result[metric] > before[metric] * (1 + threshold):
+                    regressions.append('{} items, {}: {} {} -> {}'.format(size, name, metric, before[metric],
+                                                                          result[metric]))
+    return regressions
+
+
+def report_regressions(regressions):
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    print('{} regressions'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark every route of the bucketlist api')
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='benchmark the routes')
+    run_parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                            help='comma separated numbers of items of the benchmark user')
+    run_parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='requests sent to each route')
+    run_parser.add_argument('--output', default='benchmark_results.json', help='file the results are written to')
+    run_parser.add_argument('--baseline', help='saved results the run is compared with')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser('compare', help='compare saved results with a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    arguments = parser.parse_args(argv)
+
+    if arguments.command == 'compare':
+        with open(arguments.baseline) as baseline, open(arguments.results) as results:
+            return report_regressions(compare(json.load(baseline), json.load(results), arguments.threshold))
+
+    report = run([int(size) for size in arguments.sizes.split(',') if size.strip()], arguments.requests)
+    with open(arguments.output, 'w') as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print('\nResults written to {}'.format(arguments.output))
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline:
+            return report_regressions(compare(json.load(baseline), report, arguments.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
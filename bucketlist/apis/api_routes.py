@@ -11,7 +11,8 @@ from flask import jsonify
 
 from bucketlist.controllers.controller import add_user, users, delete_user, update_user, search, authenticate
 from bucketlist.controllers.controller import create_bucketlist, bucketlist, update_bucketlist, delete_bucketlist
-from bucketlist.controllers.controller import create_item, update_item, delete_item, login, item
+from bucketlist.controllers.controller import create_item, update_item, delete_item, login, item, cache_stats
+from bucketlist.controllers.controller import bucketlist_summary, export, import_data, metrics
 
 
 def initialize_api_routes(app):
@@ -26,6 +27,7 @@ def initialize_api_routes(app):
         app.add_url_rule('/api/v1/user/<string:user_id>', 'users', users, methods=['GET'])
         app.add_url_rule('/api/v1/user/<string:user_id>', 'update_user', update_user, methods=['PUT'])
         app.add_url_rule('/api/v1/bucketlists/', 'create_bucketlist', create_bucketlist, methods=['POST'])
+        app.add_url_rule('/api/v1/bucketlists/summary', 'bucketlist_summary', bucketlist_summary, methods=['GET'])
         app.add_url_rule('/api/v1/bucketlists/<string:bucket_id>', 'bucketlist_by_id', bucketlist, methods=['GET'])
         app.add_url_rule('/api/v1/bucketlists/<string:bucket_id>',
                          'update_bucketlist', update_bucketlist, methods=['PUT'])
@@ -43,6 +45,10 @@ def initialize_api_routes(app):
         app.add_url_rule('/api/v1/bucketlists/items/<string:item_id>',
                          'delete_bucketlist_item', delete_item,
                          methods=['DELETE'])
+        app.add_url_rule('/api/v1/export', 'export', export, methods=['GET'])
+        app.add_url_rule('/api/v1/import', 'import_data', import_data, methods=['POST'])
+        app.add_url_rule('/api/v1/cache/stats', 'cache_stats', cache_stats, methods=['GET'])
+        app.add_url_rule('/api/v1/_metrics', 'metrics', metrics, methods=['GET'])
         app.add_url_rule('/api/v1/', 'list_app_routes', list_app_routes, methods=['GET'], defaults={'app': app})
 
 
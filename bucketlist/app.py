@@ -2,31 +2,51 @@
 File      : app.py
 Date      : April, 2017
 Author    : eugene liyai
-Desc      : Runs the flask api application
+Desc      : Creates the flask api application
 """
 
 # ============================================================================
 # necessary imports
 # ============================================================================
+import os
+
 from flask import Flask
 from flask_login import LoginManager
 from flask_cors import CORS
 
 from bucketlist.config import app_config
 
-# Create flask application
-app = Flask(__name__, instance_path='/instance')
-
-CORS(app)
-app.config.from_object(app_config['development'])
-app.config.from_pyfile('config.py')
-
 # Configure authentication
 login_manager = LoginManager()
 login_manager.session_protection = "strong"
-login_manager.init_app(app)
-
 
-from bucketlist.apis.api_routes import initialize_api_routes
-initialize_api_routes(app)
 
+def create_app(config=None):
+    """
+    Creates the application. The database engine, and its connection pool, is only created by the first
+    statement, so creating the application is cheap and a pre-fork server can fork before any connection
+    is opened.
+
+    :param config: name of a configuration in config.app_config, a configuration class or a dictionary
+    of settings, the configuration named by BUCKETLIST_ENV by default
+    :return: flask application
+    """
+    app = Flask(__name__, instance_path='/instance')
+    CORS(app)
+
+    if isinstance(config, str):
+        config = app_config[config]
+    settings = config if isinstance(config, dict) else {}
+    if config is None or isinstance(config, dict):
+        config = app_config[os.environ.get('BUCKETLIST_ENV', 'development')]
+    app.config.from_object(config)
+    app.config.from_pyfile('config.py')
+    app.config.update(settings)
+
+    login_manager.init_app(app)
+
+    from bucketlist.controllers import controller
+    from bucketlist.apis.api_routes import initialize_api_routes
+    controller.init_app(app)
+    initialize_api_routes(app)
+    return app
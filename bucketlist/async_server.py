@@ -0,0 +1,91 @@
+"""
+File      : async_server.py
+Date      : October, 2026
+Author    : agent
+Desc      : Serves the api on gevent greenlets, many slow clients share one OS thread and the
+            database connection pool. Run with python -m bucketlist.async_server
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import sys
+import argparse
+
+try:
+    from gevent import monkey
+except ImportError:
+    monkey = None
+
+DEFAULT_HOST = '127.0.0.1'
+
+DEFAULT_PORT = 5000
+
+# clients served at once, every client is a greenlet
+DEFAULT_CONNECTIONS = 1000
+
+
+def patch():
+    """
+    Makes the standard library sockets, threads and locks cooperative, and psycopg2 when psycogreen is
+    installed, so that a greenlet waiting on a client or on the database lets the others run.
+    It has to run before the application is imported.
+
+    :return: None
+    """
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        return
+    patch_psycopg()
+
+
+def serve(app=None, host=DEFAULT_HOST, port=DEFAULT_PORT, connections=DEFAULT_CONNECTIONS):
+    """
+    Serves the WSGI application on a pool of greenlets. The sessions of the DatabaseController are
+    already scoped per greenlet, each request checks a connection out of the engine's pool for as
+    long as it runs, so the database sees at most SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW
+    connections whatever the number of clients. The sqlite3 module is not cooperative, a SQLite
+    query blocks every greenlet until it returns.
+
+    :param app: flask application, created from the environment by default
+    :param host: interface to listen on
+    :param port: port to listen on, 0 picks a free port
+    :param connections: number of clients served at once
+    :return: None
+    """
+    from gevent import get_hub
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+
+    from bucketlist.app import create_app
+    from bucketlist.controllers.controller import EXTENSION_KEY
+
+    if app is None:
+        app = create_app()
+    # worker processes do not mix with a patched standard library, hash on the hub's OS threads instead
+    app.extensions[EXTENSION_KEY]['password_hasher'].executor = get_hub().threadpool.apply
+
+    server = WSGIServer((host, int(port)), app, spawn=Pool(int(connections)))
+    server.start()
+    print('Serving on http://{}:{} with {} greenlets'.format(host, server.server_port, connections))
+    sys.stdout.flush()
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the bucketlist api on gevent greenlets')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    arguments = parser.parse_args(argv)
+
+    if monkey is None:
+        sys.exit('The async serving mode needs gevent: pip install gevent psycogreen')
+    patch()
+    serve(host=arguments.host, port=arguments.port, connections=arguments.connections)
+
+
+if __name__ == '__main__':
+    main()
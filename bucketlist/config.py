@@ -1,4 +1,5 @@
 import os
+import multiprocessing
 
 
 class Config(object):
@@ -6,6 +7,45 @@ class Config(object):
     Common configurations
     """
 
+    # Database connection pool
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get('BUCKETLIST_SQLALCHEMY_POOL_SIZE', 5))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get('BUCKETLIST_SQLALCHEMY_MAX_OVERFLOW', 10))
+    SQLALCHEMY_POOL_RECYCLE = int(os.environ.get('BUCKETLIST_SQLALCHEMY_POOL_RECYCLE', 1800))
+    SQLALCHEMY_POOL_PRE_PING = True
+
+    # Read replicas, separated by spaces, the reads of a client stay on the primary for a few seconds after a write
+    SQLALCHEMY_REPLICA_URIS = os.environ.get('BUCKETLIST_SQLALCHEMY_REPLICA_URIS', '').split()
+    SQLALCHEMY_REPLICA_CHECK_INTERVAL = float(os.environ.get('BUCKETLIST_SQLALCHEMY_REPLICA_CHECK_INTERVAL', 5))
+    SQLALCHEMY_REPLICA_STICKY_SECONDS = float(os.environ.get('BUCKETLIST_SQLALCHEMY_REPLICA_STICKY_SECONDS', 5))
+
+    # Milliseconds after which the database cancels a statement
+    SQLALCHEMY_STATEMENT_TIMEOUT = int(os.environ.get('BUCKETLIST_SQLALCHEMY_STATEMENT_TIMEOUT', 30000))
+
+    # Password hashing, existing hashes are upgraded to PASSWORD_HASH_METHOD on the next login
+    PASSWORD_HASH_METHOD = os.environ.get('BUCKETLIST_PASSWORD_HASH_METHOD', 'pbkdf2:sha256:50000')
+    PASSWORD_SALT_LENGTH = 8
+    PASSWORD_HASH_PROCESSES = int(os.environ.get('BUCKETLIST_PASSWORD_HASH_PROCESSES', 0))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('BUCKETLIST_PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_TIMEOUT = 10
+
+    # Cached bucketlist and item responses, 0 entries disables the cache
+    RESPONSE_CACHE_SIZE = int(os.environ.get('BUCKETLIST_RESPONSE_CACHE_SIZE', 1024))
+    RESPONSE_CACHE_TTL = int(os.environ.get('BUCKETLIST_RESPONSE_CACHE_TTL', 300))
+
+    # Records inserted in each transaction of an import
+    IMPORT_BATCH_SIZE = int(os.environ.get('BUCKETLIST_IMPORT_BATCH_SIZE', 1000))
+
+    # Request metrics served at /api/v1/_metrics, the worker processes of a server share METRICS_DIR
+    METRICS_ENABLED = os.environ.get('BUCKETLIST_METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_DIR = os.environ.get('BUCKETLIST_METRICS_DIR')
+
+    # Statements slower than SLOW_QUERY_THRESHOLD milliseconds are logged with their plan, 0 disables the log
+    SLOW_QUERY_THRESHOLD = float(os.environ.get('BUCKETLIST_SLOW_QUERY_THRESHOLD', 500))
+    SLOW_QUERY_LOG = os.environ.get('BUCKETLIST_SLOW_QUERY_LOG')
+    SLOW_QUERY_EXPLAIN_ANALYZE = os.environ.get('BUCKETLIST_SLOW_QUERY_EXPLAIN_ANALYZE', '').lower() in ('1', 'true')
+    SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('BUCKETLIST_SLOW_QUERY_SAMPLE_RATE', 1.0))
+    SLOW_QUERY_MAX_PER_MINUTE = int(os.environ.get('BUCKETLIST_SLOW_QUERY_MAX_PER_MINUTE', 30))
+
 
 class DevelopmentConfig(Config):
     """
@@ -15,8 +55,8 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
     SQLALCHEMY_TRACK_MODIFICATIONS = True
-    SQLALCHEMY_DATABASE_URI = os.environ['BUCKETLIST_SQLALCHEMY_DATABASE_URI']
-    SECRET_KEY = os.environ['BUCKETLIST_SECRET_KEY']
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BUCKETLIST_SQLALCHEMY_DATABASE_URI')
+    SECRET_KEY = os.environ.get('BUCKETLIST_SECRET_KEY')
 
 
 class ProductionConfig(Config):
@@ -25,6 +65,13 @@ class ProductionConfig(Config):
     """
 
     DEBUG = False
+    SQLALCHEMY_ECHO = False
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BUCKETLIST_SQLALCHEMY_DATABASE_URI')
+    SECRET_KEY = os.environ.get('BUCKETLIST_SECRET_KEY')
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get('BUCKETLIST_SQLALCHEMY_POOL_SIZE', 10))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get('BUCKETLIST_SQLALCHEMY_MAX_OVERFLOW', 20))
+    PASSWORD_HASH_PROCESSES = int(os.environ.get('BUCKETLIST_PASSWORD_HASH_PROCESSES', multiprocessing.cpu_count()))
 
 
 class TestingConfig(Config):
@@ -36,11 +83,12 @@ class TestingConfig(Config):
     SQLALCHEMY_ECHO = True
     SQLALCHEMY_TRACK_MODIFICATIONS = True
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = os.environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI']
-    SECRET_KEY = os.environ['BUCKETLIST_SECRET_KEY']
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI')
+    SECRET_KEY = os.environ.get('BUCKETLIST_SECRET_KEY')
 
 
 app_config = {
     'development': DevelopmentConfig,
-    'production': ProductionConfig
+    'production': ProductionConfig,
+    'testing': TestingConfig
 }
@@ -8,12 +8,14 @@ Desc      : Controller file handles access and authorization
 # ============================================================================
 # necessary imports
 # ============================================================================
-import os
 import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
 
-from flask import request, make_response, jsonify
+from flask import current_app, request, make_response, jsonify
 import jwt
 
 from datetime import datetime, timedelta
@@ -22,7 +24,72 @@ from bucketlist.controllers.database_controller import DatabaseController
 
 TOKEN_HEADER_NAME = "TOKEN"
 
-JWT_SECRET_TOKEN = os.environ['BUCKETLIST_SECRET_KEY']
+DECODED_TOKEN_KEY = "bucketlist.decoded_token"
+
+TOKEN_CACHE_SIZE = 1024
+
+
+class TokenCache(object):
+    """
+    Bounded LRU of recently verified tokens, keyed by the key the token was verified with and the SHA-256
+    digest of the token, so a token is only served to an application signing with that key. A token is
+    only served from the cache until its exp claim.
+    """
+
+    def __init__(self, max_size=TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.tokens = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, secret, auth_token):
+        """
+        :param secret: key the token is verified with
+        :param auth_token: encoded authentication token
+        :return: decoded payload or None if the token is not cached for this key or has expired
+        """
+        key = (secret, hashlib.sha256(auth_token).hexdigest())
+        with self.lock:
+            payload = self.tokens.pop(key, None)
+            if payload is None or payload['exp'] <= time.time():
+                return None
+            self.tokens[key] = payload
+            return payload
+
+    def set(self, secret, auth_token, payload):
+        """
+        :param secret: key the token was verified with
+        :param auth_token: encoded authentication token
+        :param payload: payload of the verified token
+        :return: None
+        """
+        if self.max_size < 1 or 'exp' not in payload:
+            return
+        key = (secret, hashlib.sha256(auth_token).hexdigest())
+        with self.lock:
+            self.tokens.pop(key, None)
+            self.tokens[key] = payload
+            while len(self.tokens) > self.max_size:
+                self.tokens.popitem(last=False)
+
+    def clear(self):
+        """
+        :return: None
+        """
+        with self.lock:
+            self.tokens.clear()
+
+
+TOKEN_CACHE = TokenCache()
+
+
+def jwt_secret():
+    """
+    :return: key the tokens are signed with, the SECRET_KEY of the current application's configuration
+    """
+    secret = current_app.config.get('SECRET_KEY')
+    if not secret:
+        raise RuntimeError('SECRET_KEY is not configured, set BUCKETLIST_SECRET_KEY to sign the tokens')
+    return secret
 
 
 def encode_auth_token(user_id):
@@ -30,6 +97,7 @@ def encode_auth_token(user_id):
     Generates and encodes the JWT authentication token
     :return: string
     """
+    secret = jwt_secret()
     try:
         payload = {
             'exp': datetime.utcnow() + timedelta(days=0, seconds=3600),
@@ -38,7 +106,7 @@ def encode_auth_token(user_id):
         }
         return jwt.encode(
             payload,
-            JWT_SECRET_TOKEN,
+            secret,
             algorithm='HS256'
         )
     except Exception as e:
@@ -52,7 +120,12 @@ def decode_auth_token(auth_token):
     :return: user id
     """
     try:
-        payload = jwt.decode(auth_token, JWT_SECRET_TOKEN)
+        # a cached token was verified with the current key, a token signed with another key is decoded again
+        secret = jwt_secret()
+        payload = TOKEN_CACHE.get(secret, auth_token) if auth_token else None
+        if payload is None:
+            payload = jwt.decode(auth_token, secret)
+            TOKEN_CACHE.set(secret, auth_token, payload)
         data = {'status': True, 'decode_data': payload['sub']}
         return data
     except jwt.ExpiredSignatureError:
@@ -63,10 +136,21 @@ def decode_auth_token(auth_token):
         return data
 
 
+def get_decoded_token():
+    """
+    Returns the token of the current request, decoded once and kept in the request environment
+
+    :return: dictionary of the decode status and user id
+    """
+    if DECODED_TOKEN_KEY not in request.environ:
+        request.environ[DECODED_TOKEN_KEY] = decode_auth_token(request.headers.get(TOKEN_HEADER_NAME))
+    return request.environ[DECODED_TOKEN_KEY]
+
+
 def check_token(func):
     @wraps(func)
     def decorated(*args, **kwargs):
-        decode = decode_auth_token(request.headers[TOKEN_HEADER_NAME])
+        decode = get_decoded_token()
         if decode['status'] is False:
             data = {
                 'STATUS': 'fail',
@@ -0,0 +1,99 @@
+"""
+File      : data_export.py
+Date      : October, 2026
+Author    : agent
+Desc      : Writes exported bucketlists and items as NDJSON or CSV, one chunk of lines at a time
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import json
+
+from bucketlist.controllers.database_controller import RESOURCES
+
+# bytes of lines joined into each chunk of the response
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+BUCKETLIST_FIELDS = RESOURCES['bucketlists']['fields']
+
+# the bucketlist column of an item repeats the bucketlist_id of its row
+ITEM_FIELDS = [name for name in RESOURCES['bucketlist_items']['fields'] if name != 'bucketlist']
+
+
+def ndjson_lines(rows):
+    """
+    Writes a line for each bucketlist, followed by a line for each of its items
+
+    :param rows: (bucketlist, item) tuples of DatabaseController.export_bucketlists
+    :return: generator of NDJSON lines
+    """
+    bucketlist_id = None
+    for bucketlist, item in rows:
+        if bucketlist['bucketlist_id'] != bucketlist_id:
+            bucketlist_id = bucketlist['bucketlist_id']
+            yield json.dumps(dict(bucketlist, type='bucketlist')) + '\n'
+        if item is not None:
+            yield json.dumps(dict(item, type='item')) + '\n'
+
+
+def csv_value(value):
+    """
+    :param value: value of a field
+    :return: the value as a CSV field, quoted when it contains a separator, quote or line break
+    """
+    if value is None:
+        return u''
+    if isinstance(value, bool):
+        value = int(value)
+    if not isinstance(value, type(u'')):
+        value = u'{}'.format(value)
+    if any(character in value for character in u',"\r\n'):
+        value = u'"{}"'.format(value.replace(u'"', u'""'))
+    return value
+
+
+def csv_lines(rows):
+    """
+    Writes a header and a line for each item with the fields of its bucketlist, a bucketlist
+    without items gets a line with empty item fields
+
+    :param rows: (bucketlist, item) tuples of DatabaseController.export_bucketlists
+    :return: generator of CSV lines
+    """
+    yield u','.join(BUCKETLIST_FIELDS + ITEM_FIELDS) + u'\r\n'
+    for bucketlist, item in rows:
+        values = [bucketlist[name] for name in BUCKETLIST_FIELDS]
+        values += [item[name] if item else None for name in ITEM_FIELDS]
+        yield u','.join(csv_value(value) for value in values) + u'\r\n'
+
+
+def chunks(lines, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Joins lines into chunks of about chunk_size bytes, so that the server does not write every line on its own
+
+    :param lines: generator of lines
+    :param chunk_size: bytes in a chunk
+    :return: generator of utf-8 encoded chunks
+    """
+    chunk = []
+    length = 0
+    for line in lines:
+        line = line.encode('utf-8') if isinstance(line, type(u'')) else line
+        chunk.append(line)
+        length += len(line)
+        if length >= chunk_size:
+            yield b''.join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield b''.join(chunk)
+
+
+#
+# mimetype and line writer of each export format
+#
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv', csv_lines)
+}
@@ -0,0 +1,98 @@
+"""
+File      : data_import.py
+Date      : October, 2026
+Author    : agent
+Desc      : Reads NDJSON users, bucketlists and items one line at a time and validates them for an import
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import json
+
+from datetime import datetime
+
+# records inserted in each transaction of an import
+IMPORT_BATCH_SIZE = 1000
+
+# invalid lines listed in the import report, the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+#
+# The required fields of each record type and the longest value of each text field
+#
+RECORD_FIELDS = {
+    'user': {'required': ['user_id', 'first_name', 'last_name', 'username', 'email', 'password'],
+             'lengths': {'first_name': 100, 'last_name': 100, 'username': 200, 'email': 200}},
+    'bucketlist': {'required': ['bucketlist_id', 'bucketlist_name'],
+                   'lengths': {'bucketlist_name': 100}},
+    'item': {'required': ['item_name', 'bucketlist'],
+             'lengths': {'item_name': 100, 'description': 500}}
+}
+
+DATE_FIELDS = ['date', 'date_created', 'date_completed']
+
+
+def parse_date(value):
+    """
+    :param value: date in ISO format, an empty string or None
+    :return: date, or None when no date is given
+    """
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def record_error(record, owner=None):
+    """
+    :param record: dictionary read from a line
+    :param owner: id of the user who owns every imported bucketlist, users cannot be imported with an owner
+    :return: error message of an invalid record, or None
+    """
+    if not isinstance(record, dict):
+        return 'Every line must be a JSON object.'
+
+    record_type = record.get('type')
+    if record_type not in RECORD_FIELDS:
+        return 'The type must be one of {}.'.format(', '.join(sorted(RECORD_FIELDS)))
+    if record_type == 'user' and owner is not None:
+        return 'Users cannot be imported into an account.'
+
+    for name in RECORD_FIELDS[record_type]['required']:
+        if record.get(name) in (None, ''):
+            return 'The {} {} is required.'.format(record_type, name)
+    for name, max_length in RECORD_FIELDS[record_type]['lengths'].items():
+        if len(u'{}'.format(record.get(name) or '')) > max_length:
+            return 'The {} {} is longer than {} characters.'.format(record_type, name, max_length)
+    for name in DATE_FIELDS:
+        try:
+            parse_date(record.get(name))
+        except (TypeError, ValueError):
+            return 'The {} {} is not a date.'.format(record_type, name)
+    return None
+
+
+def ndjson_records(lines, owner=None):
+    """
+    Parses the lines as they are read, blank lines are skipped
+
+    :param lines: iterable of NDJSON lines, a file or a request stream
+    :param owner: id of the user who owns every imported bucketlist
+    :return: generator of (line number, record, error message) tuples, record is None for an invalid line
+    """
+    for line_number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError:
+                yield line_number, None, 'The line is not valid UTF-8.'
+                continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'The line is not valid JSON.'
+            continue
+        error = record_error(record, owner)
+        yield line_number, None if error else record, error
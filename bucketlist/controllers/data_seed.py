@@ -0,0 +1,130 @@
+"""
+File      : data_seed.py
+Date      : October, 2026
+Author    : agent
+Desc      : Generates deterministic synthetic users, bucketlists and items for load tests
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import random
+
+from datetime import date, timedelta
+
+# every seeded user logs in with this password, hashing a password per user would take longer than the seed
+SEED_PASSWORD = 'password'
+
+# days over which the bucketlists are created, up to the end date
+DATE_SPREAD_DAYS = 3 * 365
+
+# end date of the seeded dates unless another is given, a fixed date keeps the rows of a seed the same from day to day
+DEFAULT_END_DATE = date(2017, 4, 30)
+
+# distinct descriptions drawn at the start of a seed, the items pick from them instead of drawing every word
+DESCRIPTION_POOL_SIZE = 4096
+
+FIRST_NAMES = ['amina', 'brian', 'cynthia', 'david', 'esther', 'felix', 'grace', 'hassan', 'irene', 'james',
+               'kevin', 'lucy', 'mercy', 'njeri', 'otieno', 'peter', 'queen', 'rose', 'samuel', 'wanjiku']
+
+LAST_NAMES = ['achieng', 'barasa', 'chege', 'kamau', 'kariuki', 'kiprop', 'mutua', 'njoroge', 'odhiambo',
+              'ochieng', 'omondi', 'otieno', 'wafula', 'wambui', 'wanjala']
+
+LIST_TOPICS = ['Travel', 'Adventure', 'Food', 'Learning', 'Fitness', 'Family', 'Career', 'Music', 'Reading',
+               'Giving back', 'Photography', 'Outdoors']
+
+LIST_QUALIFIERS = ['', ' goals', ' before 30', ' this year', ' someday', ' with friends', ' list']
+
+ITEM_VERBS = ['Visit', 'Climb', 'Learn', 'Cook', 'Run', 'Photograph', 'Read', 'Write', 'Swim in', 'Sail to',
+              'Volunteer at', 'Camp at', 'Dance at', 'See']
+
+ITEM_OBJECTS = ['Mount Kenya', 'Lake Naivasha', 'the Maasai Mara', 'Lamu island', 'a marathon', 'Swahili',
+                'the guitar', 'a novel', 'Diani beach', 'Hell\'s Gate', 'a food festival', 'Zanzibar',
+                'the Great Rift Valley', 'a children\'s home', 'Kilimanjaro', 'the Northern lights']
+
+DESCRIPTION_WORDS = ['plan', 'book', 'tickets', 'with', 'friends', 'family', 'early', 'morning', 'weekend',
+                     'trip', 'save', 'money', 'for', 'the', 'next', 'holiday', 'guide', 'gear', 'camera',
+                     'train', 'practice', 'every', 'day', 'before', 'season', 'starts', 'and', 'finally']
+
+
+class SeedGenerator(object):
+    """
+    Builds the rows of a seeded database from a random generator, the same seed always gives the same rows.
+    Description lengths follow a long tailed distribution, each bucketlist has its own share of done items
+    and the item dates fall between the bucketlist's date and the end date.
+    """
+
+    def __init__(self, seed=0, end_date=None):
+        """
+        :param seed: seed of the random generator
+        :param end_date: latest date of the rows, the bucketlists are created over the three years before it
+        """
+        self.random = random.Random(seed)
+        self.end_date = end_date or DEFAULT_END_DATE
+        self.item_names = ['{} {}'.format(verb, name)[:100] for verb in ITEM_VERBS for name in ITEM_OBJECTS]
+        self.list_names = [topic + qualifier for topic in LIST_TOPICS for qualifier in LIST_QUALIFIERS]
+        self.descriptions = [self.description() for _ in range(DESCRIPTION_POOL_SIZE)]
+
+    def pick(self, values):
+        return values[int(self.random.random() * len(values))]
+
+    def days(self, most):
+        """
+        :param most: largest number of days
+        :return: number of days from 0 to most
+        """
+        return int(self.random.random() * (most + 1))
+
+    def user(self, user_id, hash_password):
+        """
+        :param user_id: id of the new user
+        :param hash_password: password hash shared by the seeded users
+        :return: row of the Users table
+        """
+        first_name = self.pick(FIRST_NAMES)
+        last_name = self.pick(LAST_NAMES)
+        username = '{}.{}{}'.format(first_name, last_name, user_id)
+        return {'user_id': user_id, 'first_name': first_name.title(), 'last_name': last_name.title(),
+                'username': username, 'email': '{}@mail.com'.format(username), 'hash_password': hash_password,
+                'data_version': 0}
+
+    def bucketlist(self, bucketlist_id, user_id, number_of_items):
+        """
+        :param bucketlist_id: id of the new bucketlist
+        :param user_id: id of the owner
+        :param number_of_items: number of items of the bucketlist
+        :return: row of the Bucketlist table and the rows of its items, whose item_id is still to be set
+        """
+        created = self.end_date - timedelta(days=self.days(DATE_SPREAD_DAYS))
+        done_ratio = self.random.betavariate(2, 5)
+        items = [self.item(bucketlist_id, created, done_ratio) for _ in range(number_of_items)]
+        row = {'bucketlist_id': bucketlist_id, 'user': user_id, 'date': created,
+               'bucketlist_name': self.pick(self.list_names),
+               'item_count': len(items), 'done_count': sum(1 for item in items if item['done'])}
+        return row, items
+
+    def item(self, bucketlist_id, list_created, done_ratio):
+        """
+        :param bucketlist_id: id of the item's bucketlist
+        :param list_created: date the bucketlist was created
+        :param done_ratio: probability of the item being done
+        :return: row of the BucketlistItems table without its item_id
+        """
+        created = list_created + timedelta(days=self.days((self.end_date - list_created).days))
+        done = self.random.random() < done_ratio
+        completed = None
+        if done:
+            completed = created + timedelta(days=self.days((self.end_date - created).days))
+        return {'bucketlist': bucketlist_id, 'item_name': self.pick(self.item_names),
+                'description': self.pick(self.descriptions), 'done': done, 'date_created': created,
+                'date_completed': completed}
+
+    def description(self):
+        """
+        :return: description of a log-normal number of words, a fifth of the items have none
+        """
+        if self.random.random() < 0.2:
+            return None
+        number_of_words = max(1, int(self.random.lognormvariate(2.2, 0.6)))
+        words = [self.pick(DESCRIPTION_WORDS) for _ in range(number_of_words)]
+        return ' '.join(words).capitalize()[:500]
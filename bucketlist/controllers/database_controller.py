@@ -8,30 +8,562 @@ Desc      : Acts as a service file for database population and db engine to be u
 # ============================================================================
 # necessary imports
 # ============================================================================
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import os
+import base64
+import json
+import logging
+import threading
+import time
+
+from math import ceil
+from datetime import datetime
+from functools import wraps
+
+from flask import _app_ctx_stack
+from sqlalchemy import create_engine, event, exc, select, and_, or_, case, func, bindparam, Date
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import Session, sessionmaker, scoped_session, joinedload, subqueryload
 
 from bucketlist.models.bucketlist import Bucketlist
 from bucketlist.models.users import Users
 from bucketlist.models.bucketlist_items import BucketlistItems
 from bucketlist.models.initialize_db import init_bucketlist_database, drop_bucketlist_database
+from bucketlist.models import search_index
+from bucketlist.controllers.password_hasher import PasswordHasher
+from bucketlist.controllers.data_import import IMPORT_BATCH_SIZE, MAX_REPORTED_ERRORS, parse_date
+from bucketlist.controllers.data_seed import SeedGenerator, SEED_PASSWORD
+from bucketlist.controllers.replica_router import ReplicaRouter, DEFAULT_CHECK_INTERVAL
+
+DEFAULT_PAGE_SIZE = 2
+
+MAX_PAGE_SIZE = 100
+
+# session.info key of the users whose cached responses are dropped when the transaction commits
+PENDING_INVALIDATIONS = 'bucketlist.pending_invalidations'
+
+# session.info key set once the transaction flushed changes, its reads then stay on the primary
+FLUSHED_CHANGES = 'bucketlist.flushed_changes'
+
+# session.info key of the replica engine the statements of a read only method run on
+REPLICA_BIND = 'bucketlist.replica_bind'
+
+SUMMARY_FIELDS = 'bucketlist_id,bucketlist_name,item_count,done_count'
+
+# rows fetched from the cursor at a time by an export
+EXPORT_BATCH_SIZE = 1000
+
+# items inserted in each transaction of a seed
+SEED_BATCH_SIZE = 20000
+
+#
+# The public fields of every resource, the nested resources it can expand and the order of its rows.
+# A nested resource is selected through its parent_key column, the foreign key to the resource above it.
+#
+RESOURCES = {
+    'users': {
+        'model': Users,
+        'key': 'user_id',
+        'fields': ['user_id', 'first_name', 'last_name', 'username', 'email'],
+        'order_by': ['last_name', 'user_id'],
+        'expand': ['bucketlists']
+    },
+    'bucketlists': {
+        'model': Bucketlist,
+        'key': 'bucketlist_id',
+        'parent_key': 'user',
+        'fields': ['bucketlist_id', 'bucketlist_name', 'date', 'user', 'item_count', 'done_count'],
+        'order_by': ['bucketlist_id'],
+        'expand': ['bucketlist_items']
+    },
+    'bucketlist_items': {
+        'model': BucketlistItems,
+        'key': 'item_id',
+        'parent_key': 'bucketlist',
+        'fields': ['item_id', 'item_name', 'date_created', 'date_completed', 'done', 'description', 'bucketlist'],
+        'order_by': ['item_id'],
+        'expand': []
+    }
+}
+
+
+def encode_cursor(values):
+    """
+    Encodes the sort key of the last row on a page into an opaque cursor
+
+    :param values: list of the values of the ordering columns
+    :return: url safe string
+    """
+    encoded = base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+    return encoded.rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor created by encode_cursor
+
+    :param cursor: opaque cursor string
+    :return: list of the values of the ordering columns
+    """
+    try:
+        cursor = str(cursor)
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8'))
+    except (TypeError, ValueError):
+        raise ValueError('Parameter [cursor] is not valid!')
+
+    if not isinstance(values, list):
+        raise ValueError('Parameter [cursor] is not valid!')
+    return values
+
+
+def keyset_filter(columns, values):
+    """
+    Builds the WHERE clause that selects the rows sorted after the given key,
+    (a > :a) OR (a = :a AND b > :b) for an ordering on columns a, b
+
+    :param columns: ordering columns
+    :param values: values of the ordering columns of the last row seen
+    :return: SQLAlchemy filter clause
+    """
+    if len(columns) != len(values):
+        raise ValueError('Parameter [cursor] is not valid!')
+
+    clauses = []
+    for index, column in enumerate(columns):
+        equal_to = [columns[position] == values[position] for position in range(index)]
+        clauses.append(and_(*(equal_to + [column > values[index]])))
+    return or_(*clauses)
+
+
+def ping_connection(connection, branch):
+    """
+    Tests a pooled connection with SELECT 1 when it is checked out, a connection dropped by the
+    database server is invalidated and replaced before the request gets to use it
+
+    :param connection: connection checked out from the pool
+    :param branch: True for sub-connections of an already checked out connection
+    :return: None
+    """
+    if branch:
+        return
+
+    should_close_with_result = connection.should_close_with_result
+    connection.should_close_with_result = False
+    try:
+        connection.scalar(select([1]))
+    except exc.DBAPIError as err:
+        if err.connection_invalidated:
+            connection.scalar(select([1]))
+        else:
+            raise
+    finally:
+        connection.should_close_with_result = should_close_with_result
+
+
+def split_parameter(value):
+    """
+    :param value: comma separated query string parameter
+    :return: list of the non empty values
+    """
+    if not value:
+        return []
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def column_value(column, value):
+    """
+    :param column: selected column
+    :param value: value of the column in a row
+    :return: the value as it is serialized, dates in ISO format
+    """
+    if isinstance(column.type, Date):
+        return value.isoformat() if value else ""
+    return value
+
+
+def serialize_row(resource, row):
+    """
+    :param resource: name of the resource in RESOURCES
+    :param row: row with every field of the resource
+    :return: dictionary of the fields of the resource, without its nested resources
+    """
+    table = RESOURCES[resource]['model'].__table__
+    return dict((name, column_value(table.c[name], row[name])) for name in RESOURCES[resource]['fields'])
+
+
+def full_fieldset(resource):
+    """
+    :param resource: name of the resource in RESOURCES
+    :return: fieldset with every field of the resource and of all its nested resources
+    """
+    return {
+        'resource': resource,
+        'fields': list(RESOURCES[resource]['fields']),
+        'expand': dict((name, full_fieldset(name)) for name in RESOURCES[resource]['expand'])
+    }
+
+
+def build_fieldset(resource, fields=None, expand=None):
+    """
+    Parses the fields and expand query parameters into the tree of columns and nested resources to be loaded.
+    fields=user_id,bucketlists.bucketlist_name&expand=bucketlists.bucketlist_items selects the user ids, the
+    names of their bucketlists and every field of the bucketlist items. A dotted field expands the resource
+    it belongs to, and a resource without a listed field gets all its fields.
+
+    :param resource: name of the top level resource in RESOURCES
+    :param fields: comma separated field names
+    :param expand: comma separated nested resource names
+    :return: fieldset dictionary, or None if neither parameter was given
+    """
+    if fields is None and expand is None:
+        return None
+
+    def expand_path(names, parameter):
+        node = fieldset
+        for name in names:
+            if name not in RESOURCES[node['resource']]['expand']:
+                raise ValueError('Parameter [{}] is not valid!'.format(parameter))
+            node = node['expand'].setdefault(name, {'resource': name, 'fields': [], 'expand': {}})
+        return node
+
+    def complete(node):
+        if not node['fields']:
+            node['fields'] = list(RESOURCES[node['resource']]['fields'])
+        for nested in node['expand'].values():
+            complete(nested)
+        return node
+
+    fieldset = {'resource': resource, 'fields': [], 'expand': {}}
+    for path in split_parameter(expand):
+        expand_path(path.split('.'), 'expand')
+    for path in split_parameter(fields):
+        names = path.split('.')
+        node = expand_path(names[:-1], 'fields')
+        if names[-1] not in RESOURCES[node['resource']]['fields']:
+            raise ValueError('Parameter [fields] is not valid!')
+        if names[-1] not in node['fields']:
+            node['fields'].append(names[-1])
+    return complete(fieldset)
+
+
+def enable_foreign_keys(dbapi_connection, connection_record):
+    """
+    SQLite only enforces foreign keys, and their ON DELETE CASCADE actions, when it is switched on
+    for every new connection
+
+    :param dbapi_connection: new DBAPI connection
+    :param connection_record: pool record of the connection
+    :return: None
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+class RoutingSession(Session):
+    """
+    Session which runs the statements of a read only method on the replica chosen for it, and every
+    other statement and every flush on the primary
+    """
+
+    def get_bind(self, mapper=None, clause=None):
+        replica = self.info.get(REPLICA_BIND)
+        if replica is not None and not self._flushing:
+            return replica
+        return Session.get_bind(self, mapper, clause)
+
+
+def read_only(method):
+    """
+    Runs a DatabaseController method which only reads on a read replica, when the controller has a
+    healthy one. A read which fails on the replica is run again on the primary, and the replica is
+    skipped until its next health check only when it lost its connection, not when the statement failed.
+
+    :param method: DatabaseController method
+    :return: the decorated method
+    """
+    @wraps(method)
+    def decorated(self, *args, **kwargs):
+        replica = self.choose_replica()
+        if replica is None:
+            return method(self, *args, **kwargs)
+
+        session = self.session
+        session.info[REPLICA_BIND] = replica
+        try:
+            return method(self, *args, **kwargs)
+        except exc.DBAPIError as err:
+            # a lost connection is invalidated by SQLAlchemy and a failed connect has no statement, a
+            # statement timeout or a lock timeout is an OperationalError of a working connection
+            lost_connection = err.connection_invalidated or err.statement is None
+            if not (lost_connection or isinstance(err, exc.OperationalError)):
+                raise
+            session.info.pop(REPLICA_BIND, None)
+            if lost_connection:
+                self.replica_router.failed(replica)
+            # the transaction holds no change, a replica is only chosen before the first one
+            session.rollback()
+            return method(self, *args, **kwargs)
+        finally:
+            session.info.pop(REPLICA_BIND, None)
+    return decorated
+
+
+def record_connection_pid(dbapi_connection, connection_record):
+    """
+    Notes the process which opened a new DBAPI connection
+
+    :param dbapi_connection: new DBAPI connection
+    :param connection_record: pool record of the connection
+    :return: None
+    """
+    connection_record.info['pid'] = os.getpid()
+
+
+def check_connection_pid(dbapi_connection, connection_record, connection_proxy):
+    """
+    Refuses a pooled connection inherited from a parent process, the pool then opens a new one. Using the
+    parent's connection would interleave both processes' statements on the same socket.
+
+    :param dbapi_connection: DBAPI connection being checked out
+    :param connection_record: pool record of the connection
+    :param connection_proxy: connection proxy handed to the caller
+    :return: None
+    """
+    if connection_record.info.get('pid', os.getpid()) != os.getpid():
+        # dropped without closing, closing it would also close the parent's connection
+        connection_record.connection = connection_proxy.connection = None
+        raise exc.DisconnectionError('Connection opened by process {}, checked out by process {}'.format(
+            connection_record.info['pid'], os.getpid()))
 
 
 class DatabaseController:
 
-    def __init__(self, engine):
+    def __init__(self, engine, pool_size=None, max_overflow=None, pool_recycle=None, pool_pre_ping=False,
+                 statement_timeout=None, echo=False, password_hasher=None, cache=None, metrics=None,
+                 slow_query_log=None, replicas=None, replica_check_interval=DEFAULT_CHECK_INTERVAL,
+                 read_your_writes=None):
         """
         :param engine: The engine route and login details
+        :param pool_size: number of connections kept open in the pool
+        :param max_overflow: number of connections opened above pool_size under load
+        :param pool_recycle: seconds after which a pooled connection is replaced
+        :param pool_pre_ping: test connections for liveness when they are checked out
+        :param statement_timeout: milliseconds after which the database cancels a statement(PostgreSQL only)
+        :param echo: log the SQL statements
+        :param password_hasher: PasswordHasher used for user passwords, hashes in the calling thread by default
+        :param cache: CacheBackend of the response cache, invalidated per user when a write commits
+        :param metrics: RequestMetrics counting and timing the statements of each request
+        :param slow_query_log: SlowQueryLog, with the threshold above which a statement is logged with its plan
+        :param replicas: engine routes of the read replicas, the read only methods run on them in turn
+        :param replica_check_interval: seconds between two health checks of a replica
+        :param read_your_writes: ReadYourWrites, which keeps the reads of a client who just wrote on the primary
         :return: a new instance of Database Controller class
         :type engine: string
         """
         if not engine:
             raise ValueError('The parameters specified in engine string are not supported by SQLAlchemy')
         self.engine = engine
-        db_engine = create_engine(engine)
-        self.db_engine = db_engine
-        db_session = sessionmaker(bind=db_engine)
-        self.session = db_session()
+        self.password_hasher = password_hasher or PasswordHasher(processes=0)
+        self.cache = cache
+        self.metrics = metrics
+        self.slow_query_log = slow_query_log
+        self.pool_pre_ping = pool_pre_ping
+        self.replicas = list(replicas or [])
+        self.replica_check_interval = replica_check_interval
+        self.read_your_writes = read_your_writes
+        self.replica_router = None
+
+        self.engine_options = {'echo': echo}
+        drivername = make_url(engine).drivername
+        if not drivername.startswith('sqlite'):
+            if pool_size is not None:
+                self.engine_options['pool_size'] = pool_size
+            if max_overflow is not None:
+                self.engine_options['max_overflow'] = max_overflow
+        if pool_recycle is not None:
+            self.engine_options['pool_recycle'] = pool_recycle
+        if statement_timeout and drivername.startswith('postgresql'):
+            self.engine_options['connect_args'] = {
+                'options': '-c statement_timeout={}'.format(int(statement_timeout))}
+
+        # the engine is created by the first statement, a command or test which never queries never pays for it
+        self._db_engine = None
+        self.engine_lock = threading.Lock()
+
+        # every thread, or greenlet, gets its own session which is removed when the request ends
+        self.session_factory = sessionmaker(class_=RoutingSession)
+        event.listen(self.session_factory, 'after_flush', self.note_flush)
+        event.listen(self.session_factory, 'after_commit', self.flush_invalidations)
+        event.listen(self.session_factory, 'after_rollback', self.discard_invalidations)
+        self._session = scoped_session(self.session_factory, scopefunc=_app_ctx_stack.__ident_func__)
+
+    @property
+    def db_engine(self):
+        """
+        :return: SQLAlchemy engine of the database, created on first use
+        """
+        if self._db_engine is None:
+            self.start_engine()
+        return self._db_engine
+
+    @property
+    def session(self):
+        """
+        :return: scoped session of the current thread or request, bound to the engine
+        """
+        if self._db_engine is None:
+            self.start_engine()
+        return self._session
+
+    def start_engine(self):
+        """
+        Creates the engine, and the engines of the replicas, once and binds the sessions to it
+
+        :return: None
+        """
+        with self.engine_lock:
+            if self._db_engine is None:
+                db_engine = self.create_engine()
+                if self.replicas:
+                    self.replica_router = ReplicaRouter([self.create_engine(replica) for replica in self.replicas],
+                                                        self.replica_check_interval)
+                self.session_factory.configure(bind=db_engine)
+                self._db_engine = db_engine
+
+    def reset_after_fork(self):
+        """
+        Replaces the connection pool and sessions inherited from the parent process, called in a worker
+        process right after it is forked. The parent's connections are left open for the parent.
+
+        :return: None
+        """
+        self.engine_lock = threading.Lock()
+        self._session.registry.clear()
+        if self._db_engine is not None:
+            self._db_engine.pool = self._db_engine.pool.recreate()
+        if self.replica_router is not None:
+            self.replica_router.reset_after_fork()
+
+    def create_engine(self, engine=None):
+        """
+        Creates the engine and its connection pool. A connection checked out in a process other than the one
+        which opened it, after a fork, is dropped from the pool and replaced, never shared by both processes.
+
+        :param engine: engine route, the primary database by default
+        :return: SQLAlchemy engine
+        """
+        db_engine = create_engine(engine or self.engine, **self.engine_options)
+        event.listen(db_engine, 'connect', record_connection_pid)
+        event.listen(db_engine, 'checkout', check_connection_pid)
+        if self.pool_pre_ping:
+            event.listen(db_engine, 'engine_connect', ping_connection)
+        if db_engine.dialect.name == 'sqlite':
+            event.listen(db_engine, 'connect', enable_foreign_keys)
+        if self.metrics is not None:
+            self.metrics.watch_engine(db_engine)
+        if self.slow_query_log is not None:
+            self.slow_query_log.watch_engine(db_engine)
+        return db_engine
+
+    def init_app(self, app):
+        """
+        Ties the session to the flask application context so that it is committed,
+        or rolled back, and removed at the end of every request
+
+        :param app: flask application
+        :return: None
+        """
+        app.teardown_appcontext(self.remove_session)
+
+    def invalidate_cache(self, user_id):
+        """
+        Marks the cached responses of a user to be dropped, and the reads of the client to stay on the primary,
+        once the current transaction commits. Dropping them earlier would let a concurrent read cache the
+        data from before the write.
+
+        :param user_id: id of the user whose data changed
+        :return: None
+        """
+        if (self.cache is not None or self.replicas) and user_id is not None:
+            self.session.info.setdefault(PENDING_INVALIDATIONS, set()).add(int(user_id))
+
+    def note_flush(self, session, flush_context):
+        """
+        Notes that the transaction holds changes, its later reads are not sent to a replica
+
+        :param session: session that flushed
+        :param flush_context: state of the flush
+        :return: None
+        """
+        session.info[FLUSHED_CHANGES] = True
+
+    def flush_invalidations(self, session):
+        """
+        Drops the cached responses of the users changed by a committed transaction, and notes the write
+        of the client so that its next reads stay on the primary
+
+        :param session: session that committed
+        :return: None
+        """
+        session.info.pop(FLUSHED_CHANGES, None)
+        user_ids = session.info.pop(PENDING_INVALIDATIONS, ())
+        if user_ids and self.replicas and self.read_your_writes is not None:
+            self.read_your_writes.wrote()
+        if self.cache is not None:
+            for user_id in user_ids:
+                self.cache.invalidate(user_id)
+
+    def discard_invalidations(self, session):
+        """
+        Forgets the invalidations of a rolled back transaction
+
+        :param session: session that rolled back
+        :return: None
+        """
+        session.info.pop(FLUSHED_CHANGES, None)
+        session.info.pop(PENDING_INVALIDATIONS, None)
+
+    def choose_replica(self):
+        """
+        Picks the replica of a read only method. The reads of a transaction which holds changes, and of
+        a client who wrote in the last sticky seconds, stay on the primary.
+
+        :return: engine of the replica, or None to read from the primary
+        """
+        if not self.replicas:
+            return None
+        session = self.session
+        info = session.info
+        if REPLICA_BIND in info or info.get(PENDING_INVALIDATIONS) or info.get(FLUSHED_CHANGES):
+            return None
+        if session.new or session.dirty or session.deleted:
+            return None
+        if self.read_your_writes is not None and self.read_your_writes.sticky():
+            return None
+        return self.replica_router.choose()
+
+    def remove_session(self, exception=None):
+        """
+        Ends the session of the current request. Pending changes are committed unless the request
+        failed, in which case they are rolled back.
+
+        :param exception: exception raised while handling the request, if any
+        :return: None
+        """
+        session = self._session
+        if not session.registry.has():
+            # the request never used the database
+            return
+        try:
+            if exception is None:
+                session.commit()
+            else:
+                session.rollback()
+        except exc.SQLAlchemyError:
+            logging.getLogger(__name__).exception('Error ending database session')
+            session.rollback()
+        finally:
+            session.remove()
 
     def initialize_database(self):
         """
@@ -47,6 +579,8 @@ class DatabaseController:
         :return: String
         """
         drop_bucketlist_database(self.db_engine)
+        if self.cache is not None:
+            self.cache.clear()
         return 'Database Dropped'
 
     def create_user(self, first_name, last_name, username, email, password):
@@ -63,7 +597,7 @@ class DatabaseController:
         """
 
         new_user = Users(first_name=first_name, last_name=last_name, username=username,
-                         email=email, password=password)
+                         email=email, hash_password=self.password_hasher.hash(password))
         self.session.add(new_user)
         self.session.commit()
 
@@ -91,6 +625,7 @@ class DatabaseController:
         else:
             return single_user
 
+    @read_only
     def get_user_by_id(self, user_id=None, serialize=False):
         """
         If the user_id parameter is  provided, the application looks up the user with the provided id,
@@ -100,52 +635,146 @@ class DatabaseController:
         :return: The user with the matching id or all users.
         """
 
-        all_users = []
-
-        if user_id is None:
-            all_users = self.session.query(Users).order_by(Users.last_name).all()
-        else:
-            if int(user_id) < 0:
-                raise ValueError('Parameter [user_id] should be positive!')
-            else:
-                all_users = self.session.query(Users).filter(Users.user_id == user_id).all()
+        all_users = self.query_users(user_id, eager=serialize).order_by(Users.last_name).all()
 
         if serialize:
             return [user.serialize() for user in all_users]
         else:
             return all_users
 
-    def update_user(self, user_id, new_user):
+    def query_users(self, user_id=None, eager=False):
         """
-        The application looks up the user with the provided user_id
-        in order to update the user's details
+        Builds the query that selects the user with the provided id, or all the users.
+        With eager set, the bucketlists and their items are loaded in a fixed number of queries,
+        a single user is joined to the bucketlists while many users load them with a subquery.
+
+        :param user_id: The id of the user intended to be searched(default value is None)
+        :param eager: load the user's bucketlists and items along with the users
+        :return: SQLAlchemy query
+        """
+        query = self.session.query(Users)
+
+        if user_id is not None:
+            if int(user_id) < 0:
+                raise ValueError('Parameter [user_id] should be positive!')
+            query = query.filter(Users.user_id == user_id)
+
+        if eager:
+            load_bucketlists = subqueryload(Users.bucketlists) if user_id is None else joinedload(Users.bucketlists)
+            query = query.options(load_bucketlists.subqueryload(Bucketlist.bucketlist_items))
+
+        return query
+
+    @read_only
+    def get_user_page(self, user_id=None, page=None, page_size=None, cursor=None, serialize=False, fieldset=None):
+        """
+        Returns a single page of users, ordered by last name
+
+        :param user_id: The id of the user intended to be searched(default value is None)
+        :param page: page number for LIMIT/OFFSET paging
+        :param page_size: number of users in a page
+        :param cursor: cursor returned with the previous page for keyset paging
+        :param fieldset: fields and nested resources of the serialized users
+        :return: dictionary with the page of users, the total count and the next cursor
+        """
+        return self.paginate(self.query_users(user_id, eager=serialize and fieldset is None),
+                             [Users.last_name, Users.user_id],
+                             page=page, page_size=page_size, cursor=cursor, serialize=serialize, fieldset=fieldset)
+
+    @read_only
+    def get_user_projection(self, user_id=None, fieldset=None):
+        """
+        Read-only fast path of get_user_by_id with serialize set, only the fields in the fieldset are
+        selected and only the nested resources it expands are loaded.
+
+        :param user_id: The id of the user intended to be searched(default value is None)
+        :param fieldset: fieldset built by build_fieldset, every field and nested resource by default
+        :return: list of serialized users
+        """
+        condition = Users.__table__.c.user_id.isnot(None)
+        if user_id is not None:
+            if int(user_id) < 0:
+                raise ValueError('Parameter [user_id] should be positive!')
+            condition = Users.__table__.c.user_id == user_id
+
+        return self.select_fieldset(fieldset or full_fieldset('users'), condition)
+
+    def select_fieldset(self, fieldset, condition):
+        """
+        Selects the columns in the fieldset, and each nested resource it expands with one more query,
+        and builds the serialized dictionaries from the rows without creating ORM objects.
+
+        :param fieldset: fieldset built by build_fieldset or full_fieldset
+        :param condition: WHERE clause on the table of the top level resource
+        :return: list of serialized rows
+        """
+        return [serialized for parent, serialized in self.select_fieldset_rows(fieldset, condition)]
+
+    def select_fieldset_rows(self, fieldset, condition):
+        """
+        :param fieldset: fieldset built by build_fieldset or full_fieldset
+        :param condition: WHERE clause on the table of the resource
+        :return: list of (parent_key, serialized row) tuples
+        """
+        resource = RESOURCES[fieldset['resource']]
+        table = resource['model'].__table__
+        key = table.c[resource['key']]
+        parent_key = table.c[resource['parent_key']] if 'parent_key' in resource else key
+
+        columns = [table.c[name] for name in fieldset['fields']]
+        rows = self.session.execute(
+            select(columns + [key.label('fieldset_key'), parent_key.label('fieldset_parent')])
+            .where(condition)
+            .order_by(*[table.c[name] for name in resource['order_by']])).fetchall()
+
+        nested = {}
+        for name, nested_fieldset in fieldset['expand'].items():
+            nested_table = RESOURCES[name]['model'].__table__
+            nested_condition = nested_table.c[RESOURCES[name]['parent_key']].in_(
+                select([key]).where(condition))
+            nested[name] = {}
+            for parent, serialized in self.select_fieldset_rows(nested_fieldset, nested_condition):
+                nested[name].setdefault(parent, []).append(serialized)
+
+        results = []
+        for row in rows:
+            serialized = {}
+            for column in columns:
+                serialized[column.key] = column_value(column, row[column])
+            for name in nested:
+                serialized[name] = nested[name].get(row['fieldset_key'], [])
+            results.append((row['fieldset_parent'], serialized))
+        return results
+
+    def update_user(self, user_id, new_user, owner=None):
+        """
+        The application updates the details of the user with the provided user_id
+        with a single conditional UPDATE
 
         :param user_id: The id of the user intended to be updated
         :param new_user: user object that holds updated details
-        :return: The user with the matching id.
+        :param owner: id of the user making the change, only their own details can be updated
+        :return: The serialized user, or None if there is no such user or it belongs to someone else.
         """
 
         if int(user_id) < 0:
             raise ValueError('Parameter [user_id] should be positive!')
 
-        updated_user = None
-        users = self.get_user_by_id(user_id)
-        user = None
-        if len(users) is not 1:
-            return updated_user
-        else:
-            user = users[0]
-
-        if user:
-            user.email = new_user["email"]
-            user.phone = new_user["username"]
-            user.first_name = new_user["first_name"]
-            user.last_name = new_user["last_name"]
-            self.session.add(user)
-            self.session.commit()
-            updated_user = self.get_user_by_id(user_id)[0]
+        users = Users.__table__
+        condition = users.c.user_id == user_id
+        if owner is not None:
+            condition = and_(condition, users.c.user_id == owner)
 
-        return updated_user.serialize()
+        user = self.update_returning(users, condition, {'email': new_user["email"],
+                                                        'first_name': new_user["first_name"],
+                                                        'last_name': new_user["last_name"]})
+        if user is None:
+            self.session.rollback()
+            return None
+
+        self.bump_data_version(user_id=user_id)
+        self.session.commit()
+        return serialize_row('users', user)
 
     def delete_user(self, user_id):
         """
@@ -160,11 +789,18 @@ class DatabaseController:
 
         if user_id:
             try:
-                user_deleted = self.session.query(Users).filter(Users.user_id == user_id).first()
-                self.session.delete(user_deleted)
+                self.invalidate_cache(user_id)
+                search_index.remove_user(self.session, user_id)
+                # the user's bucketlists and items are removed by ON DELETE CASCADE in the same statement
+                deleted = self.session.query(Users).filter(Users.user_id == user_id)\
+                    .delete(synchronize_session=False)
+                if deleted != 1:
+                    self.session.rollback()
+                    return False
                 self.session.commit()
                 return True
             except Exception as ex:
+                self.session.rollback()
                 return False
 
     def create_bucketlist(self, bucketlist_name, user):
@@ -179,10 +815,35 @@ class DatabaseController:
 
         created_bucketlist = Bucketlist(bucketlist_name=bucketlist_name, user=user)
         self.session.add(created_bucketlist)
+        self.session.flush()
+        search_index.index_bucketlist(self.session, created_bucketlist)
+        self.bump_data_version(user_id=user)
         self.session.commit()
 
         return created_bucketlist.bucketlist_name
 
+    def create_bucketlists(self, bucketlist_names, user):
+        """
+
+        The method saves many new bucketlists in a single transaction.
+
+        :param bucketlist_names: names of the new bucketlists
+        :param user: user that creates the bucketlists
+        :return: ids of the new bucketlists, in the order of the names
+        """
+
+        rows = [{"bucketlist_name": bucketlist_name, "user": user} for bucketlist_name in bucketlist_names]
+        bucketlist_ids = self.insert_rows(Bucketlist, rows)
+        for row, bucketlist_id in zip(rows, bucketlist_ids):
+            row["bucketlist_id"] = bucketlist_id
+
+        search_index.add_bucketlists(self.session, rows)
+        self.bump_data_version(user_id=user)
+        self.session.commit()
+
+        return bucketlist_ids
+
+    @read_only
     def get_bucketlist_by_id(self, bucket_id=None, user=None, serialize=False):
         """
         If the bucket_id parameter is  provided, the application looks up the buketlist with the provided id,
@@ -193,50 +854,155 @@ class DatabaseController:
         :return: The bucketlist with the matching id or all bucketlists.
         """
 
-        all_bucketlists = []
+        all_bucketlists = self.query_bucketlists(bucket_id=bucket_id, user=user, eager=serialize).all()
 
-        if bucket_id is None:
-            all_bucketlists = self.session.query(Bucketlist).filter(Bucketlist.user == user).all()
+        if serialize:
+            return [bucketlist.serialize() for bucketlist in all_bucketlists]
         else:
+            return all_bucketlists
+
+    def query_bucketlists(self, bucket_id=None, user=None, eager=False):
+        """
+        Builds the query that selects the user's bucketlist with the provided id, or all the user's bucketlists.
+        With eager set, a single bucketlist is joined to its items while many bucketlists load
+        their items with a subquery.
+
+        :param bucket_id: The id of the bucketlist intended to be searched(default value is None)
+        :param user: id of user who owns the bucketlist
+        :param eager: load the bucketlist items along with the bucketlists
+        :return: SQLAlchemy query
+        """
+        query = self.session.query(Bucketlist).filter(Bucketlist.user == user)
+
+        if bucket_id is not None:
             if int(bucket_id) < 0:
                 raise ValueError('Parameter [bucket_id] should be positive!')
+            query = query.filter(Bucketlist.bucketlist_id == bucket_id)
+
+        if eager:
+            if bucket_id is None:
+                query = query.options(subqueryload(Bucketlist.bucketlist_items))
             else:
-                all_bucketlists = self.session.query(Bucketlist).filter(Bucketlist.user == user)\
-                    .filter(Bucketlist.bucketlist_id == bucket_id).all()
+                query = query.options(joinedload(Bucketlist.bucketlist_items))
 
-        if serialize:
-            return [bucketlist.serialize() for bucketlist in all_bucketlists]
-        else:
-            return all_bucketlists
+        return query
+
+    @read_only
+    def get_bucketlist_page(self, bucket_id=None, user=None, page=None, page_size=None, cursor=None,
+                            serialize=False, fieldset=None):
+        """
+        Returns a single page of the user's bucketlists, ordered by id
+
+        :param bucket_id: The id of the bucketlist intended to be searched(default value is None)
+        :param user: id of user who owns the bucketlist
+        :param page: page number for LIMIT/OFFSET paging
+        :param page_size: number of bucketlists in a page
+        :param cursor: cursor returned with the previous page for keyset paging
+        :param fieldset: fields and nested resources of the serialized bucketlists
+        :return: dictionary with the page of bucketlists, the total count and the next cursor
+        """
+        return self.paginate(self.query_bucketlists(bucket_id=bucket_id, user=user,
+                                                    eager=serialize and fieldset is None),
+                             [Bucketlist.bucketlist_id],
+                             page=page, page_size=page_size, cursor=cursor, serialize=serialize, fieldset=fieldset)
+
+    @read_only
+    def get_bucketlist_projection(self, bucket_id=None, user=None, fieldset=None):
+        """
+        Read-only fast path of get_bucketlist_by_id with serialize set. Only the fields in the fieldset are
+        selected, as plain rows, and the nested bucketlist and items dictionaries are built from them
+        without creating ORM objects.
+
+        :param bucket_id: The id of the bucketlist intended to be searched(default value is None)
+        :param user: id of user who owns the bucketlist
+        :param fieldset: fieldset built by build_fieldset, every field and the items by default
+        :return: list of serialized bucketlists
+        """
+        bucketlists = Bucketlist.__table__
+
+        condition = bucketlists.c.user == user
+        if bucket_id is not None:
+            if int(bucket_id) < 0:
+                raise ValueError('Parameter [bucket_id] should be positive!')
+            condition = and_(condition, bucketlists.c.bucketlist_id == bucket_id)
+
+        return self.select_fieldset(fieldset or full_fieldset('bucketlists'), condition)
+
+    @read_only
+    def get_bucketlist_summary(self, user=None):
+        """
+        Returns the id, name and item counters of each of the user's bucketlists, read from the
+        Bucketlist table alone
+
+        :param user: id of user who owns the bucketlists
+        :return: list of bucketlist summaries
+        """
+        return self.get_bucketlist_projection(user=user, fieldset=build_fieldset('bucketlists', fields=SUMMARY_FIELDS))
+
+    def export_bucketlists(self, user=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Streams the user's bucketlists joined to their items. The rows are fetched batch_size at a time,
+        from a server side cursor where the database has one, so the memory used does not grow with the
+        size of the export.
+
+        :param user: id of user who owns the bucketlists
+        :param batch_size: number of rows fetched at a time
+        :return: generator of (bucketlist, item) dictionary tuples, item is None for a bucketlist without items
+        """
+        if int(batch_size) < 1:
+            raise ValueError('Parameter [batch_size] should be positive!')
+
+        bucketlists = Bucketlist.__table__
+        items = BucketlistItems.__table__
+        bucketlist_columns = [bucketlists.c[name] for name in RESOURCES['bucketlists']['fields']]
+        item_columns = [items.c[name] for name in RESOURCES['bucketlist_items']['fields']]
+
+        rows = self.session.query(*(bucketlist_columns + item_columns))\
+            .select_from(bucketlists.outerjoin(items, items.c.bucketlist == bucketlists.c.bucketlist_id))\
+            .filter(bucketlists.c.user == user)\
+            .order_by(bucketlists.c.bucketlist_id, items.c.item_id)\
+            .yield_per(int(batch_size))
+
+        split = len(bucketlist_columns)
+
+        def export_rows():
+            for row in rows:
+                bucketlist = dict((column.key, column_value(column, value))
+                                  for column, value in zip(bucketlist_columns, row[:split]))
+                item = None
+                if row[split] is not None:
+                    item = dict((column.key, column_value(column, value))
+                                for column, value in zip(item_columns, row[split:]))
+                yield bucketlist, item
+
+        return export_rows()
 
     def update_bucketlist(self, bucket_id=None, new_bucketlist=None, user=None):
         """
-        The application looks up the bucketlist with the provided bucket_id
-        in order to update the bucketlist's details
+        The application renames the user's bucketlist with the provided bucket_id
+        with a single conditional UPDATE
 
         :param bucket_id: The id of the bucketlist intended to be updated
         :param new_bucketlist: bucketlist object that holds updated details
-        :return: The Bucketlist with the matching id.
+        :param user: id of user who owns the bucketlist
+        :return: The serialized bucketlist, or None if there is no such bucketlist or it belongs to someone else.
         """
 
         if int(bucket_id) < 0:
             raise ValueError('Parameter [bucket_id] should be positive!')
 
-        updated_bucketlist = None
-        bucketlists = self.get_bucketlist_by_id(bucket_id=bucket_id, user=user)
-        bucketlist = None
-        if len(bucketlists) is not 1:
-            return updated_bucketlist
-        else:
-            bucketlist = bucketlists[0]
-
-        if bucketlist:
-            bucketlist.bucketlist_name = new_bucketlist["bucketlist_name"]
-            self.session.add(bucketlist)
-            self.session.commit()
-            updated_bucketlist = self.get_bucketlist_by_id(bucket_id=bucket_id, user=user)[0]
+        bucketlists = Bucketlist.__table__
+        bucketlist = self.update_returning(bucketlists,
+                                           and_(bucketlists.c.bucketlist_id == bucket_id, bucketlists.c.user == user),
+                                           {'bucketlist_name': new_bucketlist["bucketlist_name"]})
+        if bucketlist is None:
+            self.session.rollback()
+            return None
 
-        return updated_bucketlist.serialize()
+        search_index.index_bucketlist(self.session, bucketlist)
+        self.bump_data_version(user_id=bucketlist.user)
+        self.session.commit()
+        return serialize_row('bucketlists', bucketlist)
 
     def delete_bucketlist(self, bucket_id):
         """
@@ -252,11 +1018,19 @@ class DatabaseController:
 
         if bucket_id:
             try:
-                bucket_list = self.session.query(Bucketlist).filter(Bucketlist.bucketlist_id == bucket_id).first()
-                self.session.delete(bucket_list)
+                # the owner is looked up before the row is gone
+                self.bump_data_version(bucket_id=bucket_id)
+                search_index.remove_bucketlist(self.session, bucket_id)
+                # the bucketlist's items are removed by ON DELETE CASCADE in the same statement
+                deleted = self.session.query(Bucketlist).filter(Bucketlist.bucketlist_id == bucket_id)\
+                    .delete(synchronize_session=False)
+                if deleted != 1:
+                    self.session.rollback()
+                    return False
                 self.session.commit()
                 return True
             except Exception as ex:
+                self.session.rollback()
                 return False
 
     def create_bucketlist_item(self, bucketlist_item_name, description, bucketlist):
@@ -273,10 +1047,271 @@ class DatabaseController:
         new_bucketlist_item = BucketlistItems(item_name=bucketlist_item_name,
                                               description=description, bucketlist=bucketlist)
         self.session.add(new_bucketlist_item)
+        self.session.flush()
+        search_index.index_item(self.session, new_bucketlist_item)
+        self.adjust_item_counts(bucketlist, items=1)
+        self.bump_data_version(bucket_id=bucketlist)
         self.session.commit()
 
         return new_bucketlist_item.item_name
 
+    def create_bucketlist_items(self, items, bucketlist):
+        """
+
+        The method saves many new bucket list items in a single transaction.
+
+        :param items: list of dictionaries with the item_name and description of the new items
+        :param bucketlist: bucketlist under which the items are created
+        :return: ids of the new items, in the order of the items
+        """
+
+        rows = [{"item_name": item["item_name"], "description": item.get("description"), "bucketlist": bucketlist}
+                for item in items]
+        item_ids = self.insert_rows(BucketlistItems, rows)
+        for row, item_id in zip(rows, item_ids):
+            row["item_id"] = item_id
+
+        search_index.add_items(self.session, rows)
+        self.adjust_item_counts(bucketlist, items=len(rows))
+        self.bump_data_version(bucket_id=bucketlist)
+        self.session.commit()
+
+        return item_ids
+
+    def adjust_item_counts(self, bucket_id, items=0, done=0):
+        """
+        Adds to the item_count and done_count of a bucketlist in the current transaction, the counters
+        are incremented by the database so concurrent writes are not lost
+
+        :param bucket_id: id of the bucketlist, or a scalar subquery selecting it
+        :param items: change of the number of items
+        :param done: change of the number of done items, a number or a scalar subquery
+        :return: None
+        """
+        bucketlists = Bucketlist.__table__
+        self.session.execute(bucketlists.update()
+                             .where(bucketlists.c.bucketlist_id == bucket_id)
+                             .values(item_count=bucketlists.c.item_count + items,
+                                     done_count=bucketlists.c.done_count + done))
+
+    def repair_item_counts(self):
+        """
+        Recomputes the item_count and done_count of every bucketlist whose counters disagree with its items,
+        with a single UPDATE, and bumps the change counter of the owners of the repaired bucketlists
+
+        :return: number of repaired bucketlists
+        """
+        bucketlists = Bucketlist.__table__
+        items = BucketlistItems.__table__
+        item_count = select([func.count(items.c.item_id)])\
+            .where(items.c.bucketlist == bucketlists.c.bucketlist_id).as_scalar()
+        done_count = select([func.count(items.c.item_id)])\
+            .where(and_(items.c.bucketlist == bucketlists.c.bucketlist_id, items.c.done.is_(True))).as_scalar()
+        wrong = or_(bucketlists.c.item_count != item_count, bucketlists.c.done_count != done_count)
+
+        owners = set(row[0] for row in self.session.execute(select([bucketlists.c.user]).where(wrong)))
+        for owner in owners:
+            self.bump_data_version(user_id=owner)
+        repaired = self.session.execute(bucketlists.update().where(wrong)
+                                        .values(item_count=item_count, done_count=done_count)).rowcount
+        self.session.commit()
+        return repaired
+
+    def insert_rows(self, model, rows):
+        """
+        Inserts many rows of a model in the current transaction. Databases with RETURNING get a single
+        multi-row INSERT, elsewhere the ORM batches the inserts in one flush.
+
+        :param model: model class of the table
+        :param rows: list of dictionaries of column values
+        :return: primary keys of the new rows, in the order of the rows
+        """
+        if not rows:
+            return []
+
+        primary_key = model.__table__.primary_key.columns.values()[0]
+        if self.db_engine.dialect.implicit_returning:
+            result = self.session.execute(model.__table__.insert().values(rows).returning(primary_key))
+            return [row[0] for row in result]
+
+        objects = [model(**row) for row in rows]
+        self.session.add_all(objects)
+        self.session.flush()
+        return [getattr(created, primary_key.key) for created in objects]
+
+    def import_records(self, records, owner=None, batch_size=IMPORT_BATCH_SIZE, progress=None):
+        """
+        Imports users, bucketlists and items, committing every batch_size records. The ids in the records
+        only link bucketlists to their users and items to their bucketlists, the imported rows get new ids.
+        Items are never loaded as objects, so only the id maps of the users and bucketlists grow with the
+        size of the import.
+
+        :param records: (line number, record, error message) tuples of data_import.ndjson_records
+        :param owner: id of the user who owns every imported bucketlist, by default bucketlists belong to
+        the imported user they name
+        :param batch_size: number of records inserted in each transaction
+        :param progress: method called with the import report after each batch is committed
+        :return: import report, the number of lines read, the users, bucketlists and items imported,
+        the invalid lines and the rate
+        """
+        if int(batch_size) < 1:
+            raise ValueError('Parameter [batch_size] should be positive!')
+
+        report = {'lines': 0, 'users': 0, 'bucketlists': 0, 'items': 0, 'errors': 0, 'ERRORS': [],
+                  'seconds': 0.0, 'records_per_second': 0.0}
+        user_ids = {}
+        bucketlist_ids = {}
+        batch = {'user': [], 'bucketlist': [], 'item': []}
+        started = time.time()
+
+        def reject(line_number, error):
+            report['errors'] += 1
+            if len(report['ERRORS']) < MAX_REPORTED_ERRORS:
+                report['ERRORS'].append({'line': line_number, 'MESSAGE': error})
+
+        def flush():
+            report['users'] += self.import_users(batch['user'], user_ids, reject)
+            report['bucketlists'] += self.import_bucketlists(batch['bucketlist'], bucketlist_ids,
+                                                             owner if owner is not None else user_ids, reject)
+            report['items'] += self.import_items(batch['item'], bucketlist_ids, reject)
+            if owner is not None:
+                self.bump_data_version(user_id=owner)
+            self.session.commit()
+
+            for records in batch.values():
+                del records[:]
+            report['seconds'] = round(time.time() - started, 3)
+            imported = report['users'] + report['bucketlists'] + report['items']
+            report['records_per_second'] = round(imported / report['seconds'], 1) if report['seconds'] else 0.0
+            if progress is not None:
+                progress(report)
+
+        pending = 0
+        for line_number, record, error in records:
+            report['lines'] = line_number
+            if error:
+                reject(line_number, error)
+                continue
+            batch[record['type']].append((line_number, record))
+            pending += 1
+            if pending >= int(batch_size):
+                flush()
+                pending = 0
+        if pending:
+            flush()
+        return report
+
+    def import_users(self, records, user_ids, reject):
+        """
+        Inserts a batch of imported users, users whose username or email is taken are rejected
+
+        :param records: (line number, record) tuples
+        :param user_ids: map of the imported user ids to the new ids, updated with the batch
+        :param reject: method called with the line number and error of a rejected record
+        :return: number of users inserted
+        """
+        if not records:
+            return 0
+        users = Users.__table__
+        usernames = [record['username'] for line_number, record in records]
+        emails = [record['email'] for line_number, record in records]
+        taken = set()
+        for username, email in self.session.execute(select([users.c.username, users.c.email])
+                                                    .where(or_(users.c.username.in_(usernames),
+                                                               users.c.email.in_(emails)))):
+            taken.update([username, email])
+
+        rows = []
+        accepted = []
+        for line_number, record in records:
+            if record['username'] in taken or record['email'] in taken:
+                reject(line_number, 'The username or email is already taken.')
+                continue
+            taken.update([record['username'], record['email']])
+            rows.append({'first_name': record['first_name'], 'last_name': record['last_name'],
+                         'username': record['username'], 'email': record['email'],
+                         'hash_password': self.password_hasher.hash(record['password'])})
+            accepted.append(record)
+
+        for record, user_id in zip(accepted, self.insert_rows(Users, rows)):
+            user_ids[record['user_id']] = user_id
+        return len(rows)
+
+    def import_bucketlists(self, records, bucketlist_ids, owners, reject):
+        """
+        Inserts a batch of imported bucketlists
+
+        :param records: (line number, record) tuples
+        :param bucketlist_ids: map of the imported bucketlist ids to the new ids, updated with the batch
+        :param owners: id of the user who owns the bucketlists, or map of the imported user ids to the new ids
+        :param reject: method called with the line number and error of a rejected record
+        :return: number of bucketlists inserted
+        """
+        rows = []
+        accepted = []
+        for line_number, record in records:
+            user = owners.get(record.get('user')) if isinstance(owners, dict) else owners
+            if user is None:
+                reject(line_number, 'The bucketlist user was not imported.')
+                continue
+            rows.append({'bucketlist_name': record['bucketlist_name'], 'user': user,
+                         'date': parse_date(record.get('date')) or datetime.utcnow().date()})
+            accepted.append(record)
+        if not rows:
+            return 0
+
+        for row, record, bucketlist_id in zip(rows, accepted, self.insert_rows(Bucketlist, rows)):
+            row['bucketlist_id'] = bucketlist_id
+            bucketlist_ids[record['bucketlist_id']] = bucketlist_id
+        search_index.add_bucketlists(self.session, rows)
+        return len(rows)
+
+    def import_items(self, records, bucketlist_ids, reject):
+        """
+        Inserts a batch of imported items and adds them to the item counters and the search index of their
+        bucketlists. The ids of the items are read back from the insert itself, a multi-row INSERT ...
+        RETURNING where the database has it, elsewhere bulk insert mappings which fill in each new id.
+
+        :param records: (line number, record) tuples
+        :param bucketlist_ids: map of the imported bucketlist ids to the new ids
+        :param reject: method called with the line number and error of a rejected record
+        :return: number of items inserted
+        """
+        rows = []
+        counts = {}
+        for line_number, record in records:
+            bucket_id = bucketlist_ids.get(record['bucketlist'])
+            if bucket_id is None:
+                reject(line_number, 'The item bucketlist was not imported.')
+                continue
+            done = bool(record.get('done'))
+            rows.append({'item_name': record['item_name'], 'description': record.get('description'),
+                         'done': done, 'bucketlist': bucket_id,
+                         'date_created': parse_date(record.get('date_created')) or datetime.utcnow().date(),
+                         'date_completed': parse_date(record.get('date_completed'))})
+            item_count, done_count = counts.get(bucket_id, (0, 0))
+            counts[bucket_id] = (item_count + 1, done_count + int(done))
+        if not rows:
+            return 0
+
+        bucketlists = Bucketlist.__table__
+        # items inserted meanwhile by another transaction are neither indexed nor counted as imported
+        if self.db_engine.dialect.implicit_returning:
+            for row, item_id in zip(rows, self.insert_rows(BucketlistItems, rows)):
+                row['item_id'] = item_id
+        else:
+            self.session.bulk_insert_mappings(BucketlistItems, rows, return_defaults=True)
+        search_index.add_items(self.session, rows)
+        self.session.execute(bucketlists.update()
+                             .where(bucketlists.c.bucketlist_id == bindparam('counted_bucketlist'))
+                             .values(item_count=bucketlists.c.item_count + bindparam('counted_items'),
+                                     done_count=bucketlists.c.done_count + bindparam('counted_done')),
+                             [{'counted_bucketlist': bucket_id, 'counted_items': item_count,
+                               'counted_done': done_count}
+                              for bucket_id, (item_count, done_count) in counts.items()])
+        return len(rows)
+
+    @read_only
     def get_item_by_id(self, item_id=None, bucket_id=None, serialize=False):
         """
         If the item_id parameter is  provided, the application looks up the item with the id, in the bucket lists
@@ -290,20 +1325,197 @@ class DatabaseController:
 
         all_items = []
 
-        if item_id is None:
-            all_items = self.session.query(BucketlistItems).filter(BucketlistItems.bucketlist == bucket_id).all()
-        else:
-            if int(item_id) < 0:
-                return all_items
-            else:
-                all_items = self.session.query(BucketlistItems).filter(BucketlistItems.item_id == item_id)\
-                    .all()
+        if item_id is None or int(item_id) >= 0:
+            all_items = self.query_items(item_id=item_id, bucket_id=bucket_id).all()
 
         if serialize:
             return [item.serialize() for item in all_items]
         else:
             return all_items
 
+    def query_items(self, item_id=None, bucket_id=None):
+        """
+        Builds the query that selects the item with the provided id, or all the items in the bucket list
+
+        :param item_id: The id of the item intended to be searched(default value is None)
+        :param bucket_id: bucket list id
+        :return: SQLAlchemy query
+        """
+        if item_id is None:
+            return self.session.query(BucketlistItems).filter(BucketlistItems.bucketlist == bucket_id)
+        return self.session.query(BucketlistItems).filter(BucketlistItems.item_id == item_id)
+
+    @read_only
+    def get_item_projection(self, item_id=None, bucket_id=None, fieldset=None):
+        """
+        Read-only fast path of get_item_by_id with serialize set, the fields in the fieldset are selected
+        as plain rows without creating ORM objects.
+
+        :param item_id: The id of the item intended to be searched(default value is None)
+        :param bucket_id: bucket list id
+        :param fieldset: fieldset built by build_fieldset, every field by default
+        :return: list of serialized items
+        """
+        items = BucketlistItems.__table__
+
+        if item_id is None:
+            condition = items.c.bucketlist == bucket_id
+        elif int(item_id) < 0:
+            return []
+        else:
+            condition = items.c.item_id == item_id
+
+        return self.select_fieldset(fieldset or full_fieldset('bucketlist_items'), condition)
+
+    @read_only
+    def get_item_page(self, item_id=None, bucket_id=None, page=None, page_size=None, cursor=None,
+                      serialize=False, fieldset=None):
+        """
+        Returns a single page of the items in a bucket list, ordered by id
+
+        :param item_id: The id of the item intended to be searched(default value is None)
+        :param bucket_id: bucket list id
+        :param page: page number for LIMIT/OFFSET paging
+        :param page_size: number of items in a page
+        :param cursor: cursor returned with the previous page for keyset paging
+        :param fieldset: fields of the serialized items
+        :return: dictionary with the page of items, the total count and the next cursor
+        """
+        if item_id is not None and int(item_id) < 0:
+            raise ValueError('Parameter [item_id] should be positive!')
+
+        return self.paginate(self.query_items(item_id=item_id, bucket_id=bucket_id), [BucketlistItems.item_id],
+                             page=page, page_size=page_size, cursor=cursor, serialize=serialize, fieldset=fieldset)
+
+    def paginate(self, query, order_by, page=None, page_size=None, cursor=None, serialize=False, fieldset=None):
+        """
+        Runs a query one page at a time. The rows after the cursor are selected with a keyset
+        (WHERE key > :cursor) condition, else the page number is turned into LIMIT/OFFSET.
+        The total is computed with COUNT so rows outside the page are never loaded.
+        With a fieldset only the ordering columns are paged, and the fields of the rows in the page
+        are selected with select_fieldset.
+
+        :param query: SQLAlchemy query to be paged
+        :param order_by: list of columns that give the rows a unique order, ending with the primary key
+        :param page: page number, starting from 1
+        :param page_size: number of rows in a page, capped at MAX_PAGE_SIZE
+        :param cursor: cursor returned with the previous page
+        :param serialize: serialize the rows in the page
+        :param fieldset: fieldset of the serialized rows
+        :return: dictionary of results, count, pages and next_cursor
+        """
+        page_size = min(int(page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        if page_size < 1:
+            raise ValueError('Parameter [page_size] should be positive!')
+
+        if fieldset is not None:
+            query = query.with_entities(*order_by)
+        count = query.enable_eagerloads(False).order_by(None).count()
+        number_of_pages = int(ceil(float(count) / page_size))
+
+        query = query.order_by(*order_by)
+        rows = []
+        if cursor:
+            rows = query.filter(keyset_filter(order_by, decode_cursor(cursor))).limit(page_size + 1).all()
+        elif page is None:
+            rows = query.limit(page_size + 1).all()
+        else:
+            if int(page) < 1:
+                raise ValueError('Parameter [page] should be positive!')
+            if int(page) <= number_of_pages:
+                rows = query.offset((int(page) - 1) * page_size).limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in order_by])
+
+        if fieldset is not None:
+            primary_key = order_by[-1]
+            results = self.select_fieldset(fieldset, primary_key.in_([row[-1] for row in rows])) if rows else []
+        elif serialize:
+            results = [row.serialize() for row in rows]
+        else:
+            results = rows
+
+        return {
+            "results": results,
+            "count": count,
+            "pages": number_of_pages,
+            "next_cursor": next_cursor
+        }
+
+    def bump_data_version(self, user_id=None, bucket_id=None, item_id=None):
+        """
+        Increments the change counter of the user who owns the changed data, in the current transaction
+
+        :param user_id: id of the user whose data changed
+        :param bucket_id: id of the changed bucketlist, used to look up its owner
+        :param item_id: id of the changed item, used to look up its owner
+        :return: None
+        """
+        if item_id is not None:
+            bucket_id = select([BucketlistItems.bucketlist]).where(BucketlistItems.item_id == item_id).as_scalar()
+        if bucket_id is not None:
+            owner = select([Bucketlist.user]).where(Bucketlist.bucketlist_id == bucket_id)
+            if self.cache is None and not self.replicas:
+                user_id = owner.as_scalar()
+            else:
+                # the owner's id is needed to invalidate the cache and route its reads, not just inside the UPDATE
+                user_id = self.session.execute(owner).scalar()
+        if user_id is None:
+            return
+
+        self.invalidate_cache(user_id)
+
+        self.session.query(Users).filter(Users.user_id == user_id)\
+            .update({Users.data_version: Users.data_version + 1}, synchronize_session=False)
+
+    def get_data_version(self, user_id=None, bucket_id=None, item_id=None):
+        """
+        Reads the change counter of the user who owns the data, without loading the data itself
+
+        :param user_id: id of the user
+        :param bucket_id: id of a bucketlist owned by the user
+        :param item_id: id of an item in a bucketlist owned by the user
+        :return: the change counter or None if the owner cannot be found
+        """
+        return self.get_data_owner(user_id=user_id, bucket_id=bucket_id, item_id=item_id)[1]
+
+    @read_only
+    def get_data_owner(self, user_id=None, bucket_id=None, item_id=None):
+        """
+        Reads the id and the change counter of the user who owns the data, without loading the data itself
+
+        :param user_id: id of the user
+        :param bucket_id: id of a bucketlist owned by the user
+        :param item_id: id of an item in a bucketlist owned by the user
+        :return: tuple of the owner's id and change counter, (None, None) if the owner cannot be found
+        """
+        query = self.session.query(Users.user_id, Users.data_version)
+        if item_id is not None:
+            query = query.join(Bucketlist, Bucketlist.user == Users.user_id)\
+                .join(BucketlistItems, BucketlistItems.bucketlist == Bucketlist.bucketlist_id)\
+                .filter(BucketlistItems.item_id == item_id)
+        elif bucket_id is not None:
+            query = query.join(Bucketlist, Bucketlist.user == Users.user_id)\
+                .filter(Bucketlist.bucketlist_id == bucket_id)
+        else:
+            query = query.filter(Users.user_id == user_id)
+
+        owner = query.first()
+        return (owner[0], owner[1]) if owner else (None, None)
+
+    def rebuild_search_index(self):
+        """
+        Rebuilds the search index from the bucketlists and items in the database
+
+        :return: String
+        """
+        search_index.rebuild_search_index(self.session)
+        self.session.commit()
+        return 'Search Index Rebuilt'
+
     def get_by_username(self, username=None):
         """
         If the username parameter is  provided, the application looks up the user with the username provided.
@@ -318,54 +1530,110 @@ class DatabaseController:
 
         return searched_user
 
-    def update_bucketlist_item(self, item_id=None, new_item=None):
+    def update_bucketlist_item(self, item_id=None, new_item=None, user=None):
         """
-        The application looks up the item with the provided item_id
-        in order to update the items's details
+        The application locks the row of the item with the provided item_id (SELECT ... FOR UPDATE),
+        adjusts the done_count of its bucketlist by the difference between the new and the locked
+        done value, then updates the item with a single conditional UPDATE.
 
         :param item_id: The id of the item intended to be updated
-        :param bucket_id: The id of the bucket intended to be updated
         :param new_item: item object that holds updated details
-        :return: The item with the matching id.
+        :param user: id of user who owns the item's bucketlist, any owner by default
+        :return: The serialized item, or None if there is no such item or it belongs to someone else.
         """
-        updated_item = None
-        items = self.get_item_by_id(item_id=item_id)
-        item = None
         if int(item_id) < 0:
             raise ValueError('Parameter [item_id] should be positive!')
 
-        if len(items) is not 1:
-            return updated_item
+        items = BucketlistItems.__table__
+        bucketlists = Bucketlist.__table__
+        condition = items.c.item_id == item_id
+        if user is not None:
+            condition = and_(condition, items.c.bucketlist.in_(
+                select([bucketlists.c.bucketlist_id]).where(bucketlists.c.user == user)))
+
+        # the done value the counter is adjusted by cannot change before this transaction ends
+        stored = self.session.execute(select([items.c.done, items.c.bucketlist]).where(condition)
+                                      .with_for_update()).fetchone()
+        if stored is None:
+            self.session.rollback()
+            return None
+        self.adjust_item_counts(stored.bucketlist, done=int(bool(new_item["done"])) - int(bool(stored.done)))
+
+        item = self.update_returning(items, condition, {'item_name': new_item["item_name"],
+                                                        'done': new_item["done"],
+                                                        'description': new_item["description"],
+                                                        'date_completed': new_item["date_completed"]})
+        if item is None:
+            self.session.rollback()
+            return None
+
+        search_index.index_item(self.session, item)
+        if user is not None:
+            self.bump_data_version(user_id=user)
         else:
-            item = items[0]
-
-        if item:
-            item.item_name = new_item["item_name"]
-            item.done = new_item["done"]
-            item.description = new_item["description"]
-            item.date_completed = new_item["date_completed"]
-            self.session.add(item)
-            self.session.commit()
-            updated_item = self.get_item_by_id(item_id)[0]
+            self.bump_data_version(bucket_id=item.bucketlist)
+        self.session.commit()
+        return serialize_row('bucketlist_items', item)
+
+    def update_returning(self, table, condition, values):
+        """
+        Updates the single row matching the condition and returns it. Databases with RETURNING
+        send the new row back with the UPDATE, elsewhere it is selected again by the same condition
+        in the same transaction. When the UPDATE affects no row, or more than one, None is returned
+        and the caller decides what becomes of its transaction.
+
+        :param table: table of the row
+        :param condition: WHERE clause matching the row and its owner
+        :param values: dictionary of the new column values
+        :return: the updated row, or None
+        """
+        statement = table.update().where(condition).values(**values)
+        if self.db_engine.dialect.implicit_returning:
+            statement = statement.returning(*table.c)
+
+        result = self.session.execute(statement)
+        if result.rowcount != 1:
+            return None
 
-        return updated_item.serialize()
+        if self.db_engine.dialect.implicit_returning:
+            return result.fetchone()
+        return self.session.execute(select(table.c).where(condition)).fetchone()
 
-    def search_database(self, search_value, user, serialize=False):
+    @read_only
+    def search_database(self, search_value, user, serialize=False, page=None, page_size=None):
         """
 
-        The search method searches bucket list database.
+        The search method searches the full text index of bucket list names and item names and descriptions.
 
         :param search_value: value to be searched
         :param user: owner of bucketlist
-        :return: item with the matching value.
+        :param page: page number, the first page when only page_size is provided, all the matches are
+        returned if neither is provided
+        :param page_size: number of bucketlists in a page, capped at MAX_PAGE_SIZE
+        :return: bucketlists with the matching value, best match first.
         """
 
         all_bucketlists = []
 
-        if search_value:
-            all_bucketlists = self.session.query(Bucketlist).filter(
-                Bucketlist.bucketlist_name.like('%{}%'.format(search_value)))\
-                .filter(Bucketlist.user == user).all()
+        limit = None
+        offset = 0
+        if page is None and page_size is not None:
+            page = 1
+        if page is not None:
+            if int(page) < 1:
+                raise ValueError('Parameter [page] should be positive!')
+            limit = min(int(page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            offset = (int(page) - 1) * limit
+
+        bucketlist_ids = search_index.search_bucketlist_ids(self.session, search_value, user,
+                                                            limit=limit, offset=offset)
+        if bucketlist_ids:
+            query = self.session.query(Bucketlist).filter(Bucketlist.bucketlist_id.in_(bucketlist_ids))\
+                .filter(Bucketlist.user == user)
+            if serialize:
+                query = query.options(subqueryload(Bucketlist.bucketlist_items))
+            ranks = dict((bucketlist_id, rank) for rank, bucketlist_id in enumerate(bucketlist_ids))
+            all_bucketlists = sorted(query.all(), key=lambda bucketlist: ranks[bucketlist.bucketlist_id])
 
         if serialize:
             return [bucketlist.serialize() for bucketlist in all_bucketlists]
@@ -374,7 +1642,8 @@ class DatabaseController:
 
     def user_login_authentication(self, username=None, email=None, password=None):
         """
-        The method checks for username/email and password match in the database
+        The method checks for username/email and password match in the database. A password hash made
+        with outdated cost parameters is replaced with a new hash once the password is verified.
 
         :param username: authentication username
         :param email: authentication email
@@ -383,7 +1652,10 @@ class DatabaseController:
         """
         if username and password:
             user = self.get_user_by_email_or_username(username=username)
-            if user and user.check_user_password(password):
+            if user and self.password_hasher.verify(user.hash_password, password):
+                if self.password_hasher.needs_rehash(user.hash_password):
+                    user.hash_password = self.password_hasher.hash(password)
+                    self.session.commit()
                 return {'status': True, 'User': user}
             else:
                 return {'status': False, 'User': None}
@@ -404,11 +1676,23 @@ class DatabaseController:
 
         if item_id:
             try:
-                item_deleted = self.session.query(BucketlistItems).filter(BucketlistItems.item_id == item_id).first()
-                self.session.delete(item_deleted)
+                # the owner and the counters are updated before the row is gone
+                self.bump_data_version(item_id=item_id)
+                items = BucketlistItems.__table__
+                self.adjust_item_counts(
+                    select([items.c.bucketlist]).where(items.c.item_id == item_id).as_scalar(), items=-1,
+                    done=-select([case([(items.c.done.is_(True), 1)], else_=0)]).where(items.c.item_id == item_id)
+                    .as_scalar())
+                search_index.remove_item(self.session, item_id)
+                deleted = self.session.query(BucketlistItems).filter(BucketlistItems.item_id == item_id)\
+                    .delete(synchronize_session=False)
+                if deleted != 1:
+                    self.session.rollback()
+                    return False
                 self.session.commit()
                 return True
             except Exception as ex:
+                self.session.rollback()
                 return False
 
     def populate_database(self):
@@ -480,5 +1764,101 @@ class DatabaseController:
         self.session.add(bucketlist_item4)
         self.session.add(bucketlist_item5)
         self.session.add(bucketlist_item6)
+        self.session.flush()
+        search_index.rebuild_search_index(self.session)
         self.session.commit()
+        self.repair_item_counts()
         return 'Database Populated'
+
+    def seed_database(self, users, lists_per_user, items_per_list, seed=0, batch_size=SEED_BATCH_SIZE,
+                      index=True, progress=None, end_date=None):
+        """
+        Adds generated users, bucketlists and items for benchmarks and capacity tests. The same seed on the
+        same database always gives the same rows. The ids are assigned here, after the largest ids already
+        in the tables, so the rows are written with executemany inserts and their counters are set as they
+        are written, nothing is read back. Nothing else should write to the database while it is seeded.
+
+        :param users: number of users to add, every one logs in with data_seed.SEED_PASSWORD
+        :param lists_per_user: number of bucketlists of each user
+        :param items_per_list: number of items of each bucketlist
+        :param seed: seed of the random generator
+        :param batch_size: number of items, bucketlists or users inserted in each transaction
+        :param index: adds the rows to the search index, which is the slower part of a large seed
+        :param progress: method called with the seed report after each batch is committed
+        :param end_date: latest date of the generated rows, data_seed.DEFAULT_END_DATE by default
+        :return: seed report, the number of users, bucketlists and items added and the rate
+        """
+        for name, value in (('users', users), ('lists_per_user', lists_per_user),
+                            ('items_per_list', items_per_list)):
+            if int(value) < 0:
+                raise ValueError('Parameter [{}] should be 0 or more!'.format(name))
+        if int(batch_size) < 1:
+            raise ValueError('Parameter [batch_size] should be positive!')
+
+        generator = SeedGenerator(seed, end_date)
+        hash_password = self.password_hasher.hash(SEED_PASSWORD)
+        tables = (Users.__table__, Bucketlist.__table__, BucketlistItems.__table__)
+        next_ids = [(self.session.execute(select([func.max(table.primary_key.columns.values()[0])])).scalar()
+                     or 0) + 1 for table in tables]
+        user_id, bucket_id, item_id = next_ids
+        report = {'users': 0, 'bucketlists': 0, 'items': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        batch = ([], [], [])
+        started = time.time()
+
+        def flush():
+            for table, rows in zip(tables, batch):
+                if rows:
+                    self.session.execute(table.insert(), rows)
+            if index:
+                search_index.add_bucketlists(self.session, batch[1])
+                search_index.add_bucketlist_items(self.session, [row['bucketlist_id'] for row in batch[1]],
+                                                  batch[2][0]['item_id'] - 1 if batch[2] else 0)
+            self.session.commit()
+
+            for name, rows in zip(('users', 'bucketlists', 'items'), batch):
+                report[name] += len(rows)
+                del rows[:]
+            report['seconds'] = round(time.time() - started, 3)
+            written = report['users'] + report['bucketlists'] + report['items']
+            report['rows_per_second'] = round(written / report['seconds'], 1) if report['seconds'] else 0.0
+            if progress is not None:
+                progress(report)
+
+        for _ in range(int(users)):
+            batch[0].append(generator.user(user_id, hash_password))
+            for _ in range(int(lists_per_user)):
+                bucketlist, items = generator.bucketlist(bucket_id, user_id, int(items_per_list))
+                for item in items:
+                    item['item_id'] = item_id
+                    item_id += 1
+                batch[1].append(bucketlist)
+                batch[2].extend(items)
+                bucket_id += 1
+                # a user's bucketlists may span batches, the user is written with the first one
+                if len(batch[2]) >= int(batch_size) or len(batch[1]) >= int(batch_size):
+                    flush()
+            user_id += 1
+            # users without bucketlists fill the batches too
+            if len(batch[0]) >= int(batch_size):
+                flush()
+        if any(batch):
+            flush()
+
+        self.reset_id_sequences()
+        return report
+
+    def reset_id_sequences(self):
+        """
+        Moves the id sequences of PostgreSQL past the largest ids, after rows were inserted with their ids.
+        The other databases take the next id from the table.
+
+        :return: None
+        """
+        if self.db_engine.dialect.name != 'postgresql':
+            return
+        for table in (Users.__table__, Bucketlist.__table__, BucketlistItems.__table__):
+            column = table.primary_key.columns.values()[0]
+            self.session.execute(select([func.setval(func.pg_get_serial_sequence('"{}"'.format(table.name),
+                                                                                 column.name),
+                                                     func.coalesce(func.max(column), 0) + 1, False)]))
+        self.session.commit()
@@ -0,0 +1,212 @@
+"""
+File      : password_hasher.py
+Date      : October, 2026
+Author    : agent
+Desc      : Hashes and verifies passwords on a bounded pool of worker processes
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import time
+import threading
+import multiprocessing
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_HASH_METHOD = 'pbkdf2:sha256:50000'
+
+DEFAULT_SALT_LENGTH = 8
+
+
+class PasswordHasherBusy(RuntimeError):
+    """
+    Raised when the hashing queue stays full, or a hash does not finish, within the hasher's timeout
+    """
+
+
+def call_on_worker(func, args):
+    """
+    Runs a hashing function on a worker process, its exception is returned rather than raised so that
+    the callback of the task, which frees its slot, always runs
+
+    :param func: hashing function
+    :param args: arguments of the hashing function
+    :return: tuple of the exception raised, or None, and the return value
+    """
+    try:
+        return None, func(*args)
+    except Exception as error:
+        return error, None
+
+
+class PasswordHasher(object):
+    """
+    PBKDF2 is CPU bound and holds the GIL, running it on worker processes lets password hashing
+    scale with the cores without blocking the threads serving the rest of the API.
+    At most max_pending passwords are queued, callers wait up to timeout seconds for a slot and as long
+    again for their hash. A slot is only freed once its task has finished, a task whose caller gave up
+    still holds its slot, so the queue of the worker processes never grows past max_pending.
+    With processes set to 0 the passwords are hashed in the calling thread. An executor, called with
+    the hashing function and its arguments, replaces the worker processes, e.g. the thread pool of
+    the gevent hub when the API is served on greenlets.
+    """
+
+    def __init__(self, processes=None, max_pending=None, timeout=10, method=DEFAULT_HASH_METHOD,
+                 salt_length=DEFAULT_SALT_LENGTH, executor=None):
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+        self.max_pending = max_pending or max(processes, 1) * 4
+        self.timeout = timeout
+        self.method = method
+        self.salt_length = salt_length
+        self.executor = executor
+
+        self.pool = None
+        self.pool_pid = None
+        self.lock = threading.Lock()
+        self.slot_freed = threading.Condition(threading.Lock())
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def get_pool(self):
+        """
+        Creates the worker processes on first use, and again in a forked child process
+
+        :return: multiprocessing pool
+        """
+        with self.lock:
+            if self.pool is None or self.pool_pid != os.getpid():
+                self.pool = multiprocessing.Pool(self.processes)
+                self.pool_pid = os.getpid()
+            return self.pool
+
+    def run(self, func, *args):
+        """
+        Runs func on a worker process once a slot in the queue is free
+
+        :param func: hashing function
+        :param args: arguments of the hashing function
+        :return: return value of func
+        :raises PasswordHasherBusy: when no slot is freed, or func does not finish, within the timeout
+        """
+        deadline = time.time() + self.timeout
+        with self.slot_freed:
+            while self.pending >= self.max_pending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise PasswordHasherBusy('Password hashing queue is full')
+                self.slot_freed.wait(remaining)
+            self.pending += 1
+
+        if self.executor is None and self.processes != 0:
+            return self.run_on_pool(func, args)
+        try:
+            if self.executor is not None:
+                return self.executor(func, args)
+            return func(*args)
+        finally:
+            self.release_slot()
+
+    def run_on_pool(self, func, args):
+        """
+        Runs func on the worker processes, its slot is freed by the callback of the task once it finished
+
+        :param func: hashing function
+        :param args: arguments of the hashing function
+        :return: return value of func
+        """
+        try:
+            result = self.get_pool().apply_async(call_on_worker, (func, args),
+                                                 callback=lambda outcome: self.release_slot())
+        except Exception:
+            self.release_slot()
+            raise
+        try:
+            error, value = result.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            with self.slot_freed:
+                self.timed_out += 1
+            raise PasswordHasherBusy('Password hashing did not finish in time')
+        if error is not None:
+            raise error
+        return value
+
+    def release_slot(self):
+        with self.slot_freed:
+            self.pending -= 1
+            self.completed += 1
+            self.slot_freed.notify()
+
+    def hash(self, password):
+        """
+        :param password: plain text password
+        :return: salted hash of the password
+        """
+        return self.run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        """
+        :param password_hash: stored hash of the password
+        :param password: plain text password
+        :return: True if the password matches the hash
+        """
+        if not password_hash:
+            return False
+        return self.run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """
+        A hash needs to be upgraded when it was made with different cost parameters than the configured ones
+
+        :param password_hash: stored hash of the password
+        :return: True if the hash does not use the configured method
+        """
+        return password_hash.split('$', 1)[0] != self.method
+
+    def stats(self):
+        """
+        :return: dictionary of the queue depth and task counters
+        """
+        with self.slot_freed:
+            return {
+                'processes': self.processes,
+                'pending': self.pending,
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out
+            }
+
+    def render(self):
+        """
+        :return: the queue depth and task counters of this process in the Prometheus text format
+        """
+        stats = self.stats()
+        lines = []
+        for key, kind, description in (('pending', 'gauge', 'Passwords queued or being hashed'),
+                                       ('max_pending', 'gauge', 'Most passwords queued at once'),
+                                       ('completed', 'counter', 'Passwords hashed or verified'),
+                                       ('rejected', 'counter', 'Passwords refused because the queue was full'),
+                                       ('timed_out', 'counter', 'Passwords whose hash did not finish in time')):
+            name = 'bucketlist_password_hasher_{}'.format(key)
+            lines += ['# HELP {} {}'.format(name, description), '# TYPE {} {}'.format(name, kind),
+                      '{}{{pid="{}"}} {}'.format(name, os.getpid(), stats[key])]
+        return u'\n'.join(lines) + u'\n'
+
+    def close(self):
+        """
+        Stops the worker processes
+
+        :return: None
+        """
+        with self.lock:
+            if self.pool is not None and self.pool_pid == os.getpid():
+                self.pool.terminate()
+            self.pool = None
+            self.pool_pid = None
@@ -0,0 +1,230 @@
+"""
+File      : replica_router.py
+Date      : October, 2026
+Author    : agent
+Desc      : Picks the read replica a read goes to, in turn among the healthy replicas, and keeps the
+            reads of a client who just wrote on the primary
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import time
+import logging
+import threading
+
+from flask import request, has_request_context
+
+# seconds between two health checks of a replica, and before a failed replica is tried again
+DEFAULT_CHECK_INTERVAL = 5
+
+# seconds after a client's write during which its reads go to the primary, longer than the replication lag
+DEFAULT_STICKY_SECONDS = 5
+
+# cookie, and header, carrying the time of a client's last write back to the server
+WRITTEN_COOKIE = 'bucketlist_written'
+WRITTEN_HEADER = 'BUCKET-LIST-WRITTEN'
+
+# key of the time of the write committed by the current request in the WSGI environment
+ENVIRON_KEY = 'bucketlist.written'
+
+
+class Replica(object):
+    """
+    Engine of a read replica and the result of its last health check, None until it is checked
+    """
+
+    def __init__(self, db_engine):
+        self.db_engine = db_engine
+        self.healthy = None
+
+
+class ReplicaRouter(object):
+    """
+    Hands out the healthy replicas in turn. The replicas are checked with SELECT 1 every check_interval
+    seconds by a background thread, so a request never waits on the connection of a health check. A
+    replica is used once it passed its first check, and a replica which fails a check, or a read, is
+    skipped until it passes the next one.
+    """
+
+    def __init__(self, db_engines, check_interval=DEFAULT_CHECK_INTERVAL):
+        """
+        :param db_engines: engines of the replicas
+        :param check_interval: seconds between two health checks of the replicas
+        """
+        self.replicas = [Replica(db_engine) for db_engine in db_engines]
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.next = 0
+        self.checker_pid = None
+        self.checker = None
+        self.stopped = threading.Event()
+
+    def choose(self):
+        """
+        :return: engine of the next healthy replica, or None when no replica is healthy
+        """
+        self.start_checker()
+        with self.lock:
+            start = self.next
+            self.next = (self.next + 1) % len(self.replicas)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica.db_engine
+        return None
+
+    def start_checker(self):
+        """
+        Starts the thread of the health checks, again in a forked process where it does not run
+
+        :return: None
+        """
+        with self.lock:
+            if self.checker_pid == os.getpid() or self.stopped.is_set():
+                return
+            self.checker_pid = os.getpid()
+            self.checker = threading.Thread(target=self.run_checks)
+            self.checker.daemon = True
+            self.checker.start()
+
+    def run_checks(self):
+        while not self.stopped.is_set():
+            self.check_all()
+            self.stopped.wait(self.check_interval)
+
+    def stop(self):
+        """
+        Stops the health checks and waits for the one running
+
+        :return: None
+        """
+        self.stopped.set()
+        if self.checker is not None and self.checker_pid == os.getpid():
+            self.checker.join()
+
+    def check_all(self):
+        """
+        Runs the health check of every replica
+
+        :return: None
+        """
+        for replica in self.replicas:
+            self.check(replica)
+
+    @staticmethod
+    def check(replica):
+        """
+        Runs the health check of a replica
+
+        :param replica: Replica to check
+        :return: True if the replica is healthy
+        """
+        try:
+            connection = replica.db_engine.connect()
+            try:
+                connection.scalar('SELECT 1')
+            finally:
+                connection.close()
+        except Exception:
+            if replica.healthy is not False:
+                # the representation of the url hides its password
+                logging.getLogger(__name__).exception('Read replica %r failed its health check',
+                                                      replica.db_engine.url)
+            replica.healthy = False
+            return False
+        replica.healthy = True
+        return True
+
+    def failed(self, db_engine):
+        """
+        Skips a replica whose read failed until it passes a health check
+
+        :param db_engine: engine of the replica
+        :return: None
+        """
+        for replica in self.replicas:
+            if replica.db_engine is db_engine:
+                logging.getLogger(__name__).warning('Read replica %r failed, reading from the primary',
+                                                    db_engine.url)
+                replica.healthy = False
+
+    def reset_after_fork(self):
+        """
+        Replaces the connection pools inherited from the parent process, the health checks start again
+        with the first read
+
+        :return: None
+        """
+        self.lock = threading.Lock()
+        self.checker_pid = None
+        self.checker = None
+        for replica in self.replicas:
+            replica.db_engine.pool = replica.db_engine.pool.recreate()
+
+
+class ReadYourWrites(object):
+    """
+    Keeps the reads of a client on the primary for sticky_seconds after it wrote. The time of the write
+    is sent back with the response, in a cookie and a header, and the client's next requests carry it,
+    so whichever worker process or server serves them knows of the write.
+    """
+
+    def __init__(self, sticky_seconds=DEFAULT_STICKY_SECONDS):
+        """
+        :param sticky_seconds: seconds after a client's write during which its reads go to the primary
+        """
+        self.sticky_seconds = float(sticky_seconds)
+
+    def init_app(self, app):
+        """
+        Sends the time of a write back with the response of the request which committed it
+
+        :param app: flask application
+        :return: None
+        """
+        app.after_request(self.send_written)
+
+    def wrote(self):
+        """
+        Notes that the current request committed a write, outside a request it does nothing
+
+        :return: None
+        """
+        if has_request_context():
+            request.environ[ENVIRON_KEY] = time.time()
+
+    def written(self):
+        """
+        :return: time of the last write of the client the current request is made by, or None
+        """
+        if not has_request_context():
+            return None
+        if ENVIRON_KEY in request.environ:
+            return request.environ[ENVIRON_KEY]
+        value = request.headers.get(WRITTEN_HEADER) or request.cookies.get(WRITTEN_COOKIE)
+        try:
+            written = float(value) if value else None
+        except ValueError:
+            return None
+        # a time further ahead than the clocks of the servers differ was not sent by them, it would keep
+        # the client's reads on the primary for as long as it is sent
+        if written is not None and written > time.time() + self.sticky_seconds:
+            return None
+        return written
+
+    def sticky(self):
+        """
+        :return: True if the client wrote in the last sticky_seconds, its reads then go to the primary
+        """
+        written = self.written()
+        return written is not None and time.time() - written < self.sticky_seconds
+
+    def send_written(self, response):
+        written = request.environ.get(ENVIRON_KEY)
+        if written is not None:
+            value = '{:.3f}'.format(written)
+            response.set_cookie(WRITTEN_COOKIE, value, max_age=int(self.sticky_seconds) + 1, httponly=True)
+            response.headers[WRITTEN_HEADER] = value
+        return response
@@ -0,0 +1,402 @@
+"""
+File      : request_metrics.py
+Date      : October, 2026
+Author    : agent
+Desc      : Per endpoint request latency, query counts, database and serialization time and response bytes,
+            served in the Prometheus text format
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import multiprocessing.util
+
+from flask import g, request, _request_ctx_stack
+from sqlalchemy import event
+
+# upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# seconds between two writes of the counters of a process to the metrics directory
+WRITE_INTERVAL = 1.0
+
+# key of the sample of the current request in the WSGI environment, which streamed responses keep
+ENVIRON_KEY = 'bucketlist.request_metrics'
+
+# endpoint label of the requests which matched no route
+UNMATCHED_ENDPOINT = 'unmatched'
+
+# file of the metrics directory the counters of the exited processes are folded into
+RETIRED_FILE = 'metrics_retired.json'
+
+COUNTERS = ['count', 'seconds', 'queries', 'db_seconds', 'serialization_seconds', 'bytes']
+
+#
+# endpoint counter, name and help of each counter metric
+#
+COUNTER_METRICS = [
+    ('queries', 'bucketlist_request_queries_total', 'SQL statements executed by the requests'),
+    ('db_seconds', 'bucketlist_request_db_seconds_total', 'Seconds spent executing SQL statements'),
+    ('serialization_seconds', 'bucketlist_request_serialization_seconds_total', 'Seconds spent encoding JSON'),
+    ('bytes', 'bucketlist_response_bytes_total', 'Bytes of the response bodies')
+]
+
+
+def label_value(value):
+    """
+    :param value: value of a label
+    :return: the value escaped for the Prometheus text format
+    """
+    return u'{}'.format(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def empty_endpoint():
+    return dict({name: 0 for name in COUNTERS}, buckets=[0] * len(LATENCY_BUCKETS))
+
+
+def merge_snapshots(snapshots):
+    """
+    Adds up the counters of several processes
+
+    :param snapshots: snapshots of RequestMetrics.snapshot
+    :return: snapshot of the sums
+    """
+    endpoints = {}
+    requests = {}
+    for snapshot in snapshots:
+        for endpoint, counters in snapshot['endpoints'].items():
+            total = endpoints.setdefault(endpoint, empty_endpoint())
+            for name in COUNTERS:
+                total[name] += counters[name]
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], counters['buckets'])]
+        for endpoint, method, status, count in snapshot['requests']:
+            requests[(endpoint, method, status)] = requests.get((endpoint, method, status), 0) + count
+    return {'endpoints': endpoints,
+            'requests': [list(key) + [count] for key, count in sorted(requests.items())]}
+
+
+def timed_json_encoder(encoder, metrics):
+    """
+    :param encoder: JSON encoder class of the application
+    :param metrics: RequestMetrics the encoding time is added to
+    :return: subclass of the encoder which times every document it encodes
+    """
+    class TimedJSONEncoder(encoder):
+
+        def encode(self, o):
+            started = time.time()
+            try:
+                return super(TimedJSONEncoder, self).encode(o)
+            finally:
+                metrics.add('serialization_seconds', time.time() - started)
+
+    return TimedJSONEncoder
+
+
+class RequestMetrics(object):
+    """
+    Counters of the requests served by each endpoint of this process. A request costs a few dictionary
+    updates, and each statement two clock reads, so the metrics can stay on in production.
+
+    With a directory, every process writes its counters to a file of its own there, at most every
+    write_interval seconds, and render adds up the files of all the processes. The files of stopped
+    processes are folded into one file by retire, their requests stay in the totals. A forked process
+    starts from zero counters.
+    The requests counted since the last write are written when the process exits, a server which
+    leaves through os._exit calls flush itself.
+    """
+
+    def __init__(self, directory=None, write_interval=WRITE_INTERVAL):
+        """
+        :param directory: directory shared by the worker processes, None keeps the counters in this process
+        :param write_interval: seconds between two writes of the counters to the directory
+        """
+        self.directory = directory
+        self.write_interval = write_interval
+        self.lock = threading.Lock()
+        self.reset()
+        if directory is not None:
+            atexit.register(self.flush)
+            # processes started by multiprocessing leave through os._exit, which skips atexit
+            multiprocessing.util.register_after_fork(self, RequestMetrics.flush_at_exit)
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.written = 0
+        self.unwritten = 0
+        self.endpoints = {}
+        self.requests = {}
+
+    def flush_at_exit(self):
+        multiprocessing.util.Finalize(self, self.flush, exitpriority=0)
+
+    def init_app(self, app):
+        """
+        Times every request of the application and the JSON documents it encodes. It has to be called
+        before DatabaseController.init_app, so that the commit at the end of a request is counted too.
+
+        :param app: flask application
+        :return: None
+        """
+        app.before_request(self.start_request)
+        app.after_request(self.end_request)
+        app.teardown_appcontext(self.teardown)
+        app.json_encoder = timed_json_encoder(app.json_encoder, self)
+
+    def watch_engine(self, db_engine):
+        """
+        Counts and times the statements executed on an engine
+
+        :param db_engine: SQLAlchemy engine
+        :return: None
+        """
+        event.listen(db_engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(db_engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    @staticmethod
+    def current_sample():
+        """
+        :return: counters of the request being served, or None outside a request
+        """
+        context = _request_ctx_stack.top
+        if context is None:
+            return None
+        return context.request.environ.get(ENVIRON_KEY)
+
+    def add(self, name, value):
+        sample = self.current_sample()
+        if sample is not None:
+            sample[name] += value
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.time()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        sample = self.current_sample()
+        started = conn.info.pop('query_started', None)
+        if sample is not None and started is not None:
+            sample['queries'] += 1
+            sample['db_seconds'] += time.time() - started
+
+    def start_request(self):
+        sample = {'started': time.time(), 'endpoint': request.endpoint, 'method': request.method, 'status': 500,
+                  'queries': 0, 'db_seconds': 0.0, 'serialization_seconds': 0.0, 'bytes': 0, 'streamed': False}
+        request.environ[ENVIRON_KEY] = sample
+        g.request_metrics = sample
+
+    def end_request(self, response):
+        """
+        Reads the status and size of the response. A streamed response is counted once it has been sent,
+        with the statements executed while it was written.
+
+        :param response: response of the request
+        :return: the response
+        """
+        sample = request.environ.get(ENVIRON_KEY)
+        if sample is None:
+            return response
+        sample['status'] = response.status_code
+        if response.is_streamed:
+            sample['streamed'] = True
+            response.response = self.count_bytes(response.response, sample)
+            response.call_on_close(lambda: self.record(sample))
+        else:
+            sample['bytes'] = response.calculate_content_length() or 0
+        return response
+
+    def count_bytes(self, chunks, sample):
+        for chunk in chunks:
+            sample['bytes'] += len(chunk)
+            yield chunk
+
+    def teardown(self, exception=None):
+        sample = g.pop('request_metrics', None)
+        if sample is not None and not sample['streamed']:
+            self.record(sample)
+
+    def record(self, sample):
+        """
+        Adds a finished request to the counters of its endpoint
+
+        :param sample: counters of the request
+        :return: None
+        """
+        seconds = time.time() - sample['started']
+        endpoint = sample['endpoint'] or UNMATCHED_ENDPOINT
+        with self.lock:
+            if os.getpid() != self.pid:
+                self.reset()
+            counters = self.endpoints.get(endpoint)
+            if counters is None:
+                counters = self.endpoints[endpoint] = empty_endpoint()
+            counters['count'] += 1
+            counters['seconds'] += seconds
+            for name in ('queries', 'db_seconds', 'serialization_seconds', 'bytes'):
+                counters[name] += sample[name]
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    counters['buckets'][index] += 1
+            key = (endpoint, sample['method'], sample['status'])
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.unwritten += 1
+            write = self.directory is not None and time.time() - self.written >= self.write_interval
+
+        if write:
+            self.write()
+
+    def snapshot(self):
+        """
+        :return: JSON serializable copy of the counters of this process
+        """
+        with self.lock:
+            if os.getpid() != self.pid:
+                self.reset()
+            return {'endpoints': {endpoint: dict(counters, buckets=list(counters['buckets']))
+                                  for endpoint, counters in self.endpoints.items()},
+                    'requests': [list(key) + [count] for key, count in self.requests.items()]}
+
+    def file_name(self):
+        return 'metrics_{}_{}.json'.format(self.pid, int(self.started * 1000))
+
+    def write(self):
+        """
+        Replaces the file of this process in the metrics directory, readers never see a partial file
+
+        :return: None
+        """
+        with self.lock:
+            unwritten = self.unwritten
+        snapshot = self.snapshot()
+        self.write_file(self.file_name(), snapshot)
+        with self.lock:
+            self.written = time.time()
+            self.unwritten = max(self.unwritten - unwritten, 0)
+
+    def flush(self):
+        """
+        Writes the requests counted since the last write, called when the process exits
+
+        :return: None
+        """
+        if self.directory is None or os.getpid() != self.pid or not self.unwritten:
+            return
+        try:
+            self.write()
+        except (IOError, OSError):
+            logging.getLogger(__name__).exception('Request metrics of process %s could not be written', self.pid)
+
+    def read_file(self, name):
+        """
+        :param name: name of a file of the metrics directory
+        :return: the snapshot in the file, or None if it cannot be read
+        """
+        try:
+            with open(os.path.join(self.directory, name)) as metrics_file:
+                return json.load(metrics_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def write_file(self, name, snapshot):
+        path = os.path.join(self.directory, name)
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as metrics_file:
+            json.dump(snapshot, metrics_file)
+        os.rename(temporary, path)
+
+    def read_directory(self):
+        """
+        :return: snapshots of every process which wrote to the metrics directory
+        """
+        snapshots = []
+        folded = set()
+        retired = self.read_file(RETIRED_FILE)
+        if retired is not None:
+            snapshots.append(retired)
+            folded.update(retired['files'])
+        for name in os.listdir(self.directory):
+            if not (name.startswith('metrics_') and name.endswith('.json')) or name == RETIRED_FILE or name in folded:
+                continue
+            snapshot = self.read_file(name)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def retire(self, pids):
+        """
+        Folds the files of exited processes into the file of the retired processes, so that the metrics
+        directory does not grow as the workers are replaced. It is called by the process which reaps them.
+
+        :param pids: ids of the exited processes
+        :return: None
+        """
+        if self.directory is None or not pids:
+            return
+        prefixes = tuple('metrics_{}_'.format(pid) for pid in pids)
+        names = [name for name in os.listdir(self.directory) if name.startswith(prefixes) and name.endswith('.json')]
+        if not names:
+            return
+
+        retired = self.read_file(RETIRED_FILE) or {'endpoints': {}, 'requests': [], 'processes': 0}
+        snapshots = [snapshot for snapshot in (self.read_file(name) for name in names) if snapshot is not None]
+        merged = merge_snapshots([retired] + snapshots)
+        merged['processes'] = retired['processes'] + len(names)
+        # readers skip the folded files which are not removed yet
+        merged['files'] = names
+        self.write_file(RETIRED_FILE, merged)
+        for name in names:
+            os.remove(os.path.join(self.directory, name))
+
+    def clear(self):
+        """
+        Removes the files of earlier runs from the metrics directory, called when the server starts
+
+        :return: None
+        """
+        if self.directory is None:
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith('metrics_'):
+                os.remove(os.path.join(self.directory, name))
+
+    def render(self):
+        """
+        :return: the counters of every process in the Prometheus text format
+        """
+        if self.directory is None:
+            snapshot = self.snapshot()
+        else:
+            self.write()
+            snapshot = merge_snapshots(self.read_directory())
+
+        lines = ['# HELP bucketlist_requests_total Requests served',
+                 '# TYPE bucketlist_requests_total counter']
+        for endpoint, method, status, count in sorted(snapshot['requests']):
+            lines.append(u'bucketlist_requests_total{{endpoint="{}",method="{}",status="{}"}} {}'.format(
+                label_value(endpoint), label_value(method), status, count))
+
+        lines += ['# HELP bucketlist_request_duration_seconds Request latency',
+                  '# TYPE bucketlist_request_duration_seconds histogram']
+        for endpoint, counters in sorted(snapshot['endpoints'].items()):
+            label = label_value(endpoint)
+            for bound, count in zip(LATENCY_BUCKETS, counters['buckets']):
+                lines.append(u'bucketlist_request_duration_seconds_bucket{{endpoint="{}",le="{}"}} {}'.format(
+                    label, bound, count))
+            lines.append(u'bucketlist_request_duration_seconds_bucket{{endpoint="{}",le="+Inf"}} {}'.format(
+                label, counters['count']))
+            lines.append(u'bucketlist_request_duration_seconds_sum{{endpoint="{}"}} {}'.format(
+                label, repr(float(counters['seconds']))))
+            lines.append(u'bucketlist_request_duration_seconds_count{{endpoint="{}"}} {}'.format(
+                label, counters['count']))
+
+        for counter, name, description in COUNTER_METRICS:
+            lines += ['# HELP {} {}'.format(name, description), '# TYPE {} counter'.format(name)]
+            for endpoint, counters in sorted(snapshot['endpoints'].items()):
+                lines.append(u'{}{{endpoint="{}"}} {}'.format(name, label_value(endpoint), counters[counter]))
+        return u'\n'.join(lines) + u'\n'
@@ -0,0 +1,178 @@
+"""
+File      : response_cache.py
+Date      : October, 2026
+Author    : agent
+Desc      : Read-through cache of serialized responses, invalidated per user on writes
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import time
+import threading
+
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+
+DEFAULT_TTL = 300
+
+
+class CacheBackend(object):
+    """
+    Storage interface of the response cache. Every entry belongs to a namespace, the id of the user who owns
+    the cached data, so that a write drops exactly the entries of that user. The generation read before a
+    value is loaded tells whether its namespace was invalidated since, a value read before the change is not
+    stored after it. A cache shared between processes, memcached or redis, can implement the same methods.
+    """
+
+    def get(self, key):
+        """
+        :param key: cache key
+        :return: cached value, or None on a miss
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, namespace, generation=None):
+        """
+        :param key: cache key
+        :param value: value to be cached
+        :param namespace: id of the user who owns the cached data
+        :param generation: generation of the namespace read before the value was loaded
+        :return: True if the value was stored
+        """
+        raise NotImplementedError
+
+    def generation(self, namespace):
+        """
+        :param namespace: id of the user who owns the cached data
+        :return: current generation of the namespace, compared by set with the later invalidations
+        """
+        raise NotImplementedError
+
+    def invalidate(self, namespace):
+        """
+        Drops all the entries of a namespace
+
+        :param namespace: id of the user whose data changed
+        :return: None
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Drops every entry
+
+        :return: None
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        """
+        :return: dictionary of the cache counters
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process cache of at most max_entries values, the least recently used entry is evicted first
+    and entries expire ttl seconds after they are stored. A max_entries of 0 disables the cache.
+    The generation is the number of invalidations, and the cache remembers when each of the last
+    max_entries invalidated namespaces was invalidated, an older invalidation counts for every namespace.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.namespaces = {}
+        # namespace: number of invalidations when it was last invalidated, in the order of the invalidations
+        self.generations = OrderedDict()
+        self.forgotten_generation = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, namespace, value = entry
+            if expires <= time.time():
+                self.remove(key)
+                self.misses += 1
+                return None
+
+            # move the entry to the most recently used end
+            del self.entries[key]
+            self.entries[key] = entry
+            self.hits += 1
+            return value
+
+    def set(self, key, value, namespace, generation=None):
+        if self.max_entries <= 0:
+            return False
+
+        with self.lock:
+            if generation is not None and generation < self.generations.get(namespace, self.forgotten_generation):
+                return False
+
+            self.remove(key)
+            self.entries[key] = (time.time() + self.ttl, namespace, value)
+            self.namespaces.setdefault(namespace, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+            return True
+
+    def generation(self, namespace):
+        with self.lock:
+            return self.invalidations
+
+    def invalidate(self, namespace):
+        with self.lock:
+            self.invalidations += 1
+            self.generations.pop(namespace, None)
+            self.generations[namespace] = self.invalidations
+            while len(self.generations) > self.max_entries:
+                self.forgotten_generation = self.generations.popitem(last=False)[1]
+            for key in self.namespaces.pop(namespace, ()):
+                del self.entries[key]
+
+    def remove(self, key):
+        """
+        Removes an entry, the caller holds the lock
+
+        :param key: cache key
+        :return: None
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self.namespaces.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.namespaces[entry[1]]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.namespaces.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
@@ -0,0 +1,318 @@
+"""
+File      : slow_query_log.py
+Date      : October, 2026
+Author    : agent
+Desc      : Logs the SQL statements slower than a threshold, with their redacted parameters, route
+            and query plan, as JSON lines
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import json
+import time
+import re
+import random
+import logging
+import threading
+
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from flask import _request_ctx_stack
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+DEFAULT_THRESHOLD = 500
+
+DEFAULT_MAX_PER_MINUTE = 30
+
+LOG_MAX_BYTES = 10 * 1024 * 1024
+
+LOG_BACKUP_COUNT = 5
+
+LOGGER_NAME = 'bucketlist.slow_queries'
+
+# slow statements waiting for their plan, the entries of the statements after them are written without one
+EXPLAIN_QUEUE_SIZE = 100
+
+# the module whose methods issue the statements, its innermost frame names the caller
+CALLER_MODULE = 'database_controller'
+
+# a locking read waits on the locks of the request which ran it, and these functions write even in a
+# transaction which is rolled back, such statements are explained without being run
+NOT_ANALYZED = re.compile(r'\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b|\bINTO\b|'
+                          r'\b(nextval|setval|pg_advisory\w*|pg_sleep\w*|pg_terminate_backend|'
+                          r'pg_cancel_backend|lo_\w+|dblink\w*)\s*\(', re.IGNORECASE)
+
+# values logged as they are, every other parameter is replaced by its type and length
+PLAIN_TYPES = (bool, int, float, type(None)) + ((long,) if sys.version_info[0] == 2 else ())
+
+
+def redact(parameters):
+    """
+    :param parameters: parameters of a statement, a sequence or a dictionary
+    :return: the parameters with the text, bytes and dates replaced by their type and length
+    """
+    def redact_value(value):
+        if isinstance(value, PLAIN_TYPES):
+            return value
+        return '<{} len={}>'.format(type(value).__name__, len(value) if hasattr(value, '__len__') else 1)
+
+    if isinstance(parameters, dict):
+        return {name: redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+def can_analyze(statement):
+    """
+    :param statement: SQL statement
+    :return: True for a plain SELECT, which EXPLAIN ANALYZE can run again without waiting or writing
+    """
+    return statement.lstrip().upper().startswith('SELECT') and NOT_ANALYZED.search(statement) is None
+
+
+def explain_prefix(dialect_name, analyze=False):
+    """
+    :param dialect_name: name of the database dialect
+    :param analyze: run the statement to measure the plan, where the database supports it
+    :return: prefix which turns a statement into its query plan
+    """
+    if dialect_name == 'sqlite':
+        return 'EXPLAIN QUERY PLAN '
+    if dialect_name == 'postgresql' and analyze:
+        return 'EXPLAIN (ANALYZE, BUFFERS) '
+    return 'EXPLAIN '
+
+
+def calling_method():
+    """
+    :return: name of the innermost DatabaseController method on the stack, or None
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        if os.path.basename(frame.f_code.co_filename).startswith(CALLER_MODULE):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog(object):
+    """
+    Times every statement of an engine, a statement slower than the threshold is written to the log with
+    its plan. Entries are sampled and at most max_per_minute are written, the statements that were
+    skipped are counted in the next entry. The plan is read by a background thread, on an engine of its
+    own without a pool, so a request never waits for a connection for it and a failed EXPLAIN never
+    aborts its transaction. EXPLAIN ANALYZE runs the statement again and is only used for plain SELECT
+    statements, not for locking reads or calls of functions which write.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, path=None, analyze=False, sample_rate=1.0,
+                 max_per_minute=DEFAULT_MAX_PER_MINUTE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        """
+        :param threshold: milliseconds above which a statement is logged
+        :param path: file of the log, rotated every max_bytes, by default the entries go to the logging tree
+        :param analyze: add the measured plan of SELECT statements, on PostgreSQL
+        :param sample_rate: share of the slow statements that are logged, from 0 to 1
+        :param max_per_minute: most entries written in a minute
+        :param max_bytes: size of a log file before it is rotated
+        :param backup_count: number of rotated log files kept
+        """
+        if float(threshold) <= 0:
+            raise ValueError('Parameter [threshold] should be positive!')
+        if not 0 <= float(sample_rate) <= 1:
+            raise ValueError('Parameter [sample_rate] should be between 0 and 1!')
+        self.threshold = float(threshold) / 1000
+        self.analyze = analyze
+        self.sample_rate = float(sample_rate)
+        self.max_per_minute = int(max_per_minute)
+        self.db_engine = None
+        self.lock = threading.Lock()
+        self.random = random.Random()
+        self.window = 0
+        self.logged = 0
+        self.skipped = 0
+        self.plans = None
+        self.explainer_pid = None
+        self.explain_engines = {}
+
+        self.handler = None
+        if path:
+            # a logger of its own, outside the logging tree, writes only to the file
+            self.logger = logging.Logger(LOGGER_NAME)
+            self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+            self.handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(self.handler)
+        else:
+            self.logger = logging.getLogger(LOGGER_NAME)
+
+    def close(self):
+        self.join()
+        if self.handler is not None:
+            self.logger.removeHandler(self.handler)
+            self.handler.close()
+
+    def watch_engine(self, db_engine):
+        """
+        Times the statements executed on an engine
+
+        :param db_engine: SQLAlchemy engine
+        :return: None
+        """
+        self.db_engine = db_engine
+        event.listen(db_engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(db_engine, 'after_cursor_execute', self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['slow_query_started'] = time.time()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('slow_query_started', None)
+        if started is None:
+            return
+        duration = time.time() - started
+        if duration >= self.threshold:
+            self.slow_statement(statement, parameters, duration, executemany, conn.engine)
+
+    def allow(self):
+        """
+        Samples the slow statements and limits the entries to max_per_minute
+
+        :return: number of slow statements skipped before this one, or None if this one is skipped too
+        """
+        with self.lock:
+            window = int(time.time() // 60)
+            if window != self.window:
+                self.window = window
+                self.logged = 0
+            if self.logged >= self.max_per_minute or self.random.random() >= self.sample_rate:
+                self.skipped += 1
+                return None
+            self.logged += 1
+            skipped, self.skipped = self.skipped, 0
+            return skipped
+
+    def slow_statement(self, statement, parameters, duration, executemany=False, db_engine=None):
+        """
+        Writes the entry of a slow statement, unless it is sampled out or over the limit
+
+        :param statement: SQL statement
+        :param parameters: parameters of the statement
+        :param duration: seconds the statement took
+        :param executemany: the statement was executed once for each set of parameters
+        :param db_engine: engine the statement ran on, the last one watched by default
+        :return: the entry, written once the background thread added its plan, or None
+        """
+        skipped = self.allow()
+        if skipped is None:
+            return None
+
+        entry = {'time': datetime.utcnow().isoformat() + 'Z', 'duration_ms': round(duration * 1000, 3),
+                 'statement': statement, 'method': calling_method(), 'skipped': skipped}
+        if executemany:
+            entry['executions'] = len(parameters)
+            entry['parameters'] = redact(parameters[0]) if parameters else None
+        else:
+            entry['parameters'] = redact(parameters)
+
+        context = _request_ctx_stack.top
+        if context is not None:
+            url_rule = context.request.url_rule
+            entry['endpoint'] = context.request.endpoint
+            entry['route'] = url_rule.rule if url_rule is not None else None
+            entry['http_method'] = context.request.method
+
+        if executemany:
+            self.write(entry)
+            return entry
+        try:
+            self.plan_queue().put_nowait((entry, statement, parameters, db_engine or self.db_engine))
+        except queue.Full:
+            entry['plan'] = 'EXPLAIN skipped, too many statements waiting for their plan'
+            self.write(entry)
+        return entry
+
+    def write(self, entry):
+        self.logger.warning(json.dumps(entry, default=str, sort_keys=True))
+
+    def plan_queue(self):
+        """
+        :return: queue of the entries waiting for their plan, its thread is started again in a forked process
+        """
+        with self.lock:
+            if self.explainer_pid != os.getpid():
+                self.plans = queue.Queue(EXPLAIN_QUEUE_SIZE)
+                thread = threading.Thread(target=self.explain_entries, args=(self.plans,))
+                thread.daemon = True
+                thread.start()
+                self.explainer_pid = os.getpid()
+            return self.plans
+
+    def explain_entries(self, plans):
+        """
+        Adds the plan to the queued entries and writes them, runs on the background thread
+
+        :param plans: queue of the entries waiting for their plan
+        :return: None
+        """
+        while True:
+            entry, statement, parameters, db_engine = plans.get()
+            try:
+                entry['plan'] = self.explain(statement, parameters, db_engine)
+                self.write(entry)
+            except Exception:
+                logging.getLogger(__name__).exception('Slow statement could not be logged')
+            finally:
+                plans.task_done()
+
+    def join(self):
+        """
+        Waits for the entries queued for their plan to be written
+
+        :return: None
+        """
+        if self.plans is not None and self.explainer_pid == os.getpid():
+            self.plans.join()
+
+    def explain_engine(self, db_engine):
+        """
+        :param db_engine: engine the statement ran on
+        :return: engine without a pool on the same database, whose connections are opened for each plan
+        """
+        key = str(db_engine.url)
+        if key not in self.explain_engines:
+            self.explain_engines[key] = create_engine(db_engine.url, poolclass=NullPool)
+        return self.explain_engines[key]
+
+    def explain(self, statement, parameters, db_engine):
+        """
+        :param statement: SQL statement
+        :param parameters: parameters of the statement
+        :param db_engine: engine the statement ran on, a replica or the primary
+        :return: rows of the query plan, or the error which prevented reading it
+        """
+        analyze = self.analyze and can_analyze(statement)
+        try:
+            connection = self.explain_engine(db_engine).raw_connection()
+        except Exception as error:
+            return 'EXPLAIN failed: {}'.format(error)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(explain_prefix(db_engine.dialect.name, analyze) + statement, parameters)
+            plan = [list(row) for row in cursor.fetchall()]
+            cursor.close()
+            return plan
+        except Exception as error:
+            return 'EXPLAIN failed: {}'.format(error)
+        finally:
+            # the connection is rolled back as it is closed
+            connection.close()
@@ -9,33 +9,83 @@ Desc      : initialize test database
 # necessary imports
 # ============================================================================
 import os
+import sys
 
 from bucketlist.controllers.database_controller import DatabaseController
+from bucketlist.controllers.data_import import ndjson_records, IMPORT_BATCH_SIZE
 
-# development database
-db_engine = os.environ['BUCKETLIST_SQLALCHEMY_DATABASE_URI']
-DATA_CONTROLLER = DatabaseController(db_engine)
+DATABASE_URI_KEY = 'BUCKETLIST_SQLALCHEMY_DATABASE_URI'
 
-# test database
-test_database = os.environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI']
-TEST_DATA_CONTROLLER = DatabaseController(test_database)
+TEST_DATABASE_URI_KEY = 'TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI'
+
+# controllers of the development and test databases, created when a command first uses them
+CONTROLLERS = {}
+
+
+def data_controller(uri_key=DATABASE_URI_KEY):
+    """
+    :param uri_key: environment key of the database URI, the development database by default
+    :return: DatabaseController of the database, only the databases a command uses have to be configured
+    """
+    if uri_key not in CONTROLLERS:
+        CONTROLLERS[uri_key] = DatabaseController(os.environ.get(uri_key))
+    return CONTROLLERS[uri_key]
 
 
 def initialize_test_database():
-    TEST_DATA_CONTROLLER.initialize_database()
+    data_controller(TEST_DATABASE_URI_KEY).initialize_database()
 
 
 def drop_test_database():
-    TEST_DATA_CONTROLLER.drop_tables()
+    data_controller(TEST_DATABASE_URI_KEY).drop_tables()
 
 
 def init_bucketlist_database():
-    DATA_CONTROLLER.initialize_database()
+    data_controller().initialize_database()
 
 
 def fill_database():
-    DATA_CONTROLLER.populate_database()
+    data_controller().populate_database()
 
 
 def drop_database_tables():
-    DATA_CONTROLLER.drop_tables()
\ No newline at end of file
+    data_controller().drop_tables()
+
+
+def rebuild_search_index():
+    data_controller().rebuild_search_index()
+
+
+def repair_item_counts():
+    return data_controller().repair_item_counts()
+
+
+def seed_database(users, lists_per_user, items_per_list, seed=0, index=True, progress=None, end_date=None):
+    return data_controller().seed_database(users, lists_per_user, items_per_list, seed=seed, index=index,
+                                           progress=progress, end_date=end_date)
+
+
+def import_file(path, username=None, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """
+    Imports an NDJSON file of users, bucketlists and items into the development database
+
+    :param path: path of the file, - reads standard input
+    :param username: username of the user who owns every imported bucketlist, by default users are imported too
+    :param batch_size: number of records inserted in each transaction
+    :param progress: method called with the import report after each batch
+    :return: import report
+    """
+    owner = None
+    if username:
+        user = data_controller().get_by_username(username)
+        if user is None:
+            raise ValueError('User [{}] does not exist!'.format(username))
+        owner = user.user_id
+
+    lines = sys.stdin if path == '-' else open(path, 'rb')
+    try:
+        return data_controller().import_records(ndjson_records(lines, owner=owner), owner=owner,
+                                                batch_size=batch_size, progress=progress)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
@@ -8,7 +8,7 @@ Desc      : Model class that creates bucketlists and connects to database
 # ============================================================================
 # necessary imports
 # ============================================================================
-from sqlalchemy import Column, String, Integer, ForeignKey, Date
+from sqlalchemy import Column, String, Integer, ForeignKey, Date, Index
 from datetime import datetime
 from sqlalchemy.orm import relationship
 
@@ -20,8 +20,17 @@ class Bucketlist(Model):
     bucketlist_id = Column(Integer, primary_key=True, nullable=False, autoincrement=True)
     bucketlist_name = Column(String(100), nullable=False)
     date = Column(Date, default=datetime.utcnow)
-    user = Column(Integer, ForeignKey('Users.user_id'))
-    bucketlist_items = relationship('BucketlistItems')
+    # kept in step with the bucketlist's items by the DatabaseController writes
+    item_count = Column(Integer, default=0, server_default='0', nullable=False)
+    done_count = Column(Integer, default=0, server_default='0', nullable=False)
+    user = Column(Integer, ForeignKey('Users.user_id', name='Bucketlist_user_fkey', ondelete='CASCADE'))
+    # the items are deleted by the database's ON DELETE CASCADE, not loaded and deleted one by one
+    bucketlist_items = relationship('BucketlistItems', cascade='all', passive_deletes=True)
+
+    # a user's bucketlists are selected by user and ordered by id, the index also covers the user foreign key
+    __table_args__ = (
+        Index('ix_Bucketlist_user_bucketlist_id', 'user', 'bucketlist_id'),
+    )
 
     def serialize(self):
         """
@@ -33,5 +42,7 @@ class Bucketlist(Model):
             "bucketlist_name": self.bucketlist_name,
             "date": self.date.isoformat() if self.date else "",
             "user": self.user,
+            "item_count": self.item_count,
+            "done_count": self.done_count,
             "bucketlist_items": [item.serialize() for item in self.bucketlist_items]
         }
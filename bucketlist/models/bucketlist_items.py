@@ -8,7 +8,7 @@ Desc      : Model class that creates bucketlists items and connects to database
 # ============================================================================
 # necessary imports
 # ============================================================================
-from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, Boolean, Date, desc
+from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, Boolean, Date, Index, desc
 from datetime import datetime
 from sqlalchemy.orm import relationship
 
@@ -23,7 +23,15 @@ class BucketlistItems(Model):
     done = Column(Boolean, default=False, nullable=False)
     date_completed = Column(Date)
     description = Column(String(500))
-    bucketlist = Column(Integer, ForeignKey('Bucketlist.bucketlist_id'))
+    bucketlist = Column(Integer, ForeignKey('Bucketlist.bucketlist_id', name='BucketlistItems_bucketlist_fkey',
+                                            ondelete='CASCADE'))
+
+    # a bucketlist's items are selected by bucketlist and ordered by id, or filtered on done and date_created,
+    # both indexes also cover the bucketlist foreign key
+    __table_args__ = (
+        Index('ix_BucketlistItems_bucketlist_item_id', 'bucketlist', 'item_id'),
+        Index('ix_BucketlistItems_bucketlist_done_date_created', 'bucketlist', 'done', 'date_created'),
+    )
 
     def serialize(self):
         """
@@ -38,4 +46,4 @@ class BucketlistItems(Model):
             "done": self.done,
             "description": self.description,
             "bucketlist": self.bucketlist
-        }
\ No newline at end of file
+        }
@@ -10,12 +10,15 @@ Desc      : Initializes tables in the database
 # ============================================================================
 from sqlalchemy import create_engine
 from db_model import Model
+from search_index import create_search_index, drop_search_index
 
 
 def init_bucketlist_database(engine):
     db_engine = create_engine(engine, echo=True)
     Model.metadata.create_all(db_engine)
+    create_search_index(db_engine)
 
 
 def drop_bucketlist_database(db_engine):
+    drop_search_index(db_engine)
     Model.metadata.drop_all(db_engine)
@@ -0,0 +1,298 @@
+"""
+File      : search_index.py
+Date      : October, 2026
+Author    : agent
+Desc      : Full text search index over bucketlist names and bucketlist items
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+from sqlalchemy import text
+
+#
+# The index holds one document per bucketlist name and one per bucketlist item.
+# Documents are keyed by doc_id, the negated bucketlist_id for bucketlists and the item_id for items,
+# which is the rowid of the FTS5 table on SQLite.
+#
+SEARCH_TABLE = 'BucketlistSearch'
+
+SQLITE_DDL = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS "BucketlistSearch" '
+    'USING fts5(bucketlist_id UNINDEXED, owner UNINDEXED, name, description)'
+]
+
+POSTGRES_DOCUMENT = "to_tsvector('english', name || ' ' || description)"
+
+POSTGRES_DDL = [
+    'CREATE TABLE IF NOT EXISTS "BucketlistSearch" (doc_id INTEGER PRIMARY KEY, bucketlist_id INTEGER NOT NULL, '
+    'owner INTEGER, name VARCHAR(100) NOT NULL, description VARCHAR(500) NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS "ix_BucketlistSearch_owner" ON "BucketlistSearch" (owner)',
+    'CREATE INDEX IF NOT EXISTS "ix_BucketlistSearch_bucketlist_id" ON "BucketlistSearch" (bucketlist_id)',
+    'CREATE INDEX IF NOT EXISTS "ix_BucketlistSearch_document" ON "BucketlistSearch" '
+    'USING GIN ({})'.format(POSTGRES_DOCUMENT)
+]
+
+DEFAULT_DDL = [
+    'CREATE TABLE IF NOT EXISTS "BucketlistSearch" (doc_id INTEGER PRIMARY KEY, bucketlist_id INTEGER NOT NULL, '
+    'owner INTEGER, name VARCHAR(100) NOT NULL, description VARCHAR(500) NOT NULL)'
+]
+
+
+def dialect_name(bind):
+    """
+    :param bind: SQLAlchemy engine or connection
+    :return: name of the database dialect
+    """
+    return bind.dialect.name
+
+
+def doc_id_column(name):
+    """
+    :param name: name of the database dialect
+    :return: column holding the document id
+    """
+    return 'rowid' if name == 'sqlite' else 'doc_id'
+
+
+def search_index_ddl(name):
+    """
+    :param name: name of the database dialect
+    :return: statements creating the search index, an FTS5 virtual table on SQLite and a table with
+    a GIN tsvector index on PostgreSQL
+    """
+    if name == 'sqlite':
+        return SQLITE_DDL
+    elif name == 'postgresql':
+        return POSTGRES_DDL
+    return DEFAULT_DDL
+
+
+def create_search_index(db_engine):
+    """
+    Creates the search index table
+
+    :param db_engine: SQLAlchemy engine
+    :return: None
+    """
+    with db_engine.begin() as connection:
+        for statement in search_index_ddl(dialect_name(db_engine)):
+            connection.execute(text(statement))
+
+
+def drop_search_index(db_engine):
+    """
+    Drops the search index table
+
+    :param db_engine: SQLAlchemy engine
+    :return: None
+    """
+    with db_engine.begin() as connection:
+        connection.execute(text('DROP TABLE IF EXISTS "BucketlistSearch"'))
+
+
+def index_bucketlist(session, bucketlist):
+    """
+    Adds, or replaces, the document of a bucketlist name
+
+    :param session: database session
+    :param bucketlist: Bucketlist object
+    :return: None
+    """
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('DELETE FROM "BucketlistSearch" WHERE {} = :doc_id'.format(column)),
+                    {'doc_id': -bucketlist.bucketlist_id})
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'VALUES (:doc_id, :bucketlist_id, :owner, :name, :description)'.format(column)),
+                    {'doc_id': -bucketlist.bucketlist_id, 'bucketlist_id': bucketlist.bucketlist_id,
+                     'owner': bucketlist.user, 'name': bucketlist.bucketlist_name, 'description': ''})
+
+
+def index_item(session, item):
+    """
+    Adds, or replaces, the document of a bucketlist item. The owner is read from the item's bucketlist.
+
+    :param session: database session
+    :param item: BucketlistItems object
+    :return: None
+    """
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('DELETE FROM "BucketlistSearch" WHERE {} = :doc_id'.format(column)),
+                    {'doc_id': item.item_id})
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'SELECT :doc_id, bucketlist_id, "user", :name, :description FROM "Bucketlist" '
+                         'WHERE bucketlist_id = :bucketlist_id'.format(column)),
+                    {'doc_id': item.item_id, 'bucketlist_id': item.bucketlist, 'name': item.item_name,
+                     'description': item.description or ''})
+
+
+def add_bucketlists(session, bucketlists):
+    """
+    Adds the documents of newly created bucketlists with a single executemany
+
+    :param session: database session
+    :param bucketlists: list of dictionaries with bucketlist_id, user and bucketlist_name
+    :return: None
+    """
+    if not bucketlists:
+        return
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'VALUES (:doc_id, :bucketlist_id, :owner, :name, \'\')'.format(column)),
+                    [{'doc_id': -bucketlist['bucketlist_id'], 'bucketlist_id': bucketlist['bucketlist_id'],
+                      'owner': bucketlist['user'], 'name': bucketlist['bucketlist_name']}
+                     for bucketlist in bucketlists])
+
+
+def add_items(session, items):
+    """
+    Adds the documents of newly created bucketlist items with a single executemany
+
+    :param session: database session
+    :param items: list of dictionaries with item_id, bucketlist, item_name and description
+    :return: None
+    """
+    if not items:
+        return
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'SELECT :doc_id, bucketlist_id, "user", :name, :description FROM "Bucketlist" '
+                         'WHERE bucketlist_id = :bucketlist_id'.format(column)),
+                    [{'doc_id': item['item_id'], 'bucketlist_id': item['bucketlist'], 'name': item['item_name'],
+                      'description': item.get('description') or ''}
+                     for item in items])
+
+
+def add_bucketlist_items(session, bucketlist_ids, after_item_id=0):
+    """
+    Adds the documents of the items of the given bucketlists inserted after an item id, used when
+    the items were inserted without reading their ids back
+
+    :param session: database session
+    :param bucketlist_ids: ids of the bucketlists of the new items
+    :param after_item_id: largest item id before the items were inserted
+    :return: None
+    """
+    if not bucketlist_ids:
+        return
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'SELECT item.item_id, item.bucketlist, bucketlist."user", item.item_name, '
+                         'COALESCE(item.description, \'\') '
+                         'FROM "BucketlistItems" AS item '
+                         'JOIN "Bucketlist" AS bucketlist ON bucketlist.bucketlist_id = item.bucketlist '
+                         'WHERE item.item_id > :after_item_id AND item.bucketlist IN ({})'
+                         .format(column, ', '.join(str(int(bucketlist_id)) for bucketlist_id in bucketlist_ids))),
+                    {'after_item_id': after_item_id})
+
+
+def remove_item(session, item_id):
+    """
+    Removes the document of a bucketlist item
+
+    :param session: database session
+    :param item_id: id of the deleted item
+    :return: None
+    """
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('DELETE FROM "BucketlistSearch" WHERE {} = :doc_id'.format(column)),
+                    {'doc_id': int(item_id)})
+
+
+def remove_bucketlist(session, bucketlist_id):
+    """
+    Removes the documents of a bucketlist and its items
+
+    :param session: database session
+    :param bucketlist_id: id of the deleted bucketlist
+    :return: None
+    """
+    session.execute(text('DELETE FROM "BucketlistSearch" WHERE bucketlist_id = :bucketlist_id'),
+                    {'bucketlist_id': int(bucketlist_id)})
+
+
+def remove_user(session, user_id):
+    """
+    Removes the documents of all the bucketlists owned by a user
+
+    :param session: database session
+    :param user_id: id of the deleted user
+    :return: None
+    """
+    session.execute(text('DELETE FROM "BucketlistSearch" WHERE owner = :owner'), {'owner': int(user_id)})
+
+
+def rebuild_search_index(session):
+    """
+    Rebuilds the whole search index from the Bucketlist and BucketlistItems tables
+
+    :param session: database session
+    :return: None
+    """
+    column = doc_id_column(dialect_name(session.bind))
+    session.execute(text('DELETE FROM "BucketlistSearch"'))
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'SELECT -bucketlist_id, bucketlist_id, "user", bucketlist_name, \'\' '
+                         'FROM "Bucketlist"'.format(column)))
+    session.execute(text('INSERT INTO "BucketlistSearch" ({}, bucketlist_id, owner, name, description) '
+                         'SELECT item.item_id, item.bucketlist, bucketlist."user", item.item_name, '
+                         'COALESCE(item.description, \'\') '
+                         'FROM "BucketlistItems" AS item '
+                         'JOIN "Bucketlist" AS bucketlist ON bucketlist.bucketlist_id = item.bucketlist'
+                         .format(column)))
+
+
+def fts5_query(search_value):
+    """
+    Turns user input into an FTS5 query which matches every term as a prefix,
+    quoting the terms keeps FTS5 operators in the input from being interpreted
+
+    :param search_value: value to be searched
+    :return: FTS5 query string
+    """
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in search_value.split())
+
+
+def search_bucketlist_ids(session, search_value, owner, limit=None, offset=0):
+    """
+    Searches the bucketlist names and item names and descriptions of a user
+
+    :param session: database session
+    :param search_value: value to be searched
+    :param owner: id of the user who owns the bucketlists
+    :param limit: maximum number of bucketlist ids returned
+    :param offset: number of bucketlist ids skipped
+    :return: bucketlist ids ordered from the best match
+    """
+    if not search_value or not search_value.split():
+        return []
+
+    name = dialect_name(session.bind)
+    parameters = {'owner': int(owner), 'query': search_value}
+    if name == 'sqlite':
+        parameters['query'] = fts5_query(search_value)
+        # the ordered subquery is not flattened, which bm25() requires
+        statement = ('SELECT bucketlist_id FROM ('
+                     'SELECT bucketlist_id, bm25("BucketlistSearch", 0.0, 0.0, 10.0, 1.0) AS rank '
+                     'FROM "BucketlistSearch" WHERE "BucketlistSearch" MATCH :query AND owner = :owner '
+                     'ORDER BY rank LIMIT -1) '
+                     'GROUP BY bucketlist_id ORDER BY MIN(rank), bucketlist_id')
+    elif name == 'postgresql':
+        statement = ('SELECT bucketlist_id FROM "BucketlistSearch" '
+                     'WHERE owner = :owner AND {document} @@ plainto_tsquery(\'english\', :query) '
+                     'GROUP BY bucketlist_id '
+                     'ORDER BY MAX(ts_rank({document}, plainto_tsquery(\'english\', :query)) '
+                     '* CASE WHEN doc_id < 0 THEN 10 ELSE 1 END) DESC, bucketlist_id'
+                     .format(document=POSTGRES_DOCUMENT))
+    else:
+        parameters['query'] = '%{}%'.format(search_value)
+        statement = ('SELECT bucketlist_id FROM "BucketlistSearch" '
+                     'WHERE owner = :owner AND (name LIKE :query OR description LIKE :query) '
+                     'GROUP BY bucketlist_id ORDER BY MIN(doc_id), bucketlist_id')
+
+    if limit is not None:
+        statement += ' LIMIT :limit OFFSET :offset'
+        parameters['limit'] = int(limit)
+        parameters['offset'] = int(offset)
+
+    return [row[0] for row in session.execute(text(statement), parameters)]
@@ -24,7 +24,9 @@ class Users(Model, UserMixin):
     username = Column(String(200), nullable=False, unique=True)
     email = Column(String(200), nullable=False, unique=True)
     hash_password = Column(String(1000))
-    bucketlists = relationship('Bucketlist', backref="Users")
+    data_version = Column(Integer, default=0, server_default='0', nullable=False)
+    # the bucketlists are deleted by the database's ON DELETE CASCADE, not loaded and deleted one by one
+    bucketlists = relationship('Bucketlist', backref="Users", cascade='all', passive_deletes=True)
 
     def get_id(self):
         return self.user_id
@@ -0,0 +1,395 @@
+"""
+File      : prefork_server.py
+Date      : October, 2026
+Author    : agent
+Desc      : Serves the api on pre-forked worker processes which share one listening socket, every
+            worker serves its requests on a fixed number of threads. Run with python manage.py serve
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import time
+import errno
+import random
+import select
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+import traceback
+import multiprocessing
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from werkzeug.serving import BaseWSGIServer
+
+from bucketlist.controllers.controller import EXTENSION_KEY
+
+DEFAULT_HOST = '127.0.0.1'
+
+DEFAULT_PORT = 5000
+
+DEFAULT_WORKERS = multiprocessing.cpu_count()
+
+DEFAULT_THREADS = 4
+
+# connections waiting to be accepted by a worker
+DEFAULT_BACKLOG = 128
+
+# seconds a stopping worker is given to finish the requests it accepted
+DEFAULT_GRACEFUL_TIMEOUT = 30
+
+# seconds between two checks of the stop flag, and of the workers by the master
+POLL_INTERVAL = 0.5
+
+# share of max_requests added at random to the limit of each worker, so that they are not recycled together
+MAX_REQUESTS_JITTER = 0.1
+
+MEGABYTE = 1024 * 1024
+
+
+def listening_socket(host, port, backlog=DEFAULT_BACKLOG):
+    """
+    :param host: interface to listen on
+    :param port: port to listen on, 0 picks a free port
+    :param backlog: connections waiting to be accepted
+    :return: non blocking listening socket, a worker woken up for a connection another one accepted first
+    goes back to waiting instead of blocking in accept
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, int(port)))
+    listener.listen(backlog)
+    listener.setblocking(False)
+    return listener
+
+
+def resident_memory():
+    """
+    :return: bytes of memory the process currently uses, its peak where /proc is not available
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def wait_readable(sock, timeout):
+    """
+    :param sock: socket to wait on
+    :param timeout: most seconds to wait
+    :return: True when a connection is waiting, False after the timeout or a signal
+    """
+    try:
+        return bool(select.select([sock], [], [], timeout)[0])
+    except (select.error, OSError, IOError) as error:
+        if error.args[0] != errno.EINTR:
+            raise
+        return False
+
+
+class WorkerServer(BaseWSGIServer):
+    """
+    Accepts connections on the shared socket while one of its threads is idle, so that a busy worker
+    leaves the waiting connections to the others. Once stopped, by a signal, by reaching its request
+    or memory limit or by the exit of the master, it closes its copy of the socket and finishes the
+    requests it accepted.
+    """
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, app, listener, threads=DEFAULT_THREADS, max_requests=0, max_memory=0):
+        """
+        :param app: WSGI application
+        :param listener: listening socket shared by the workers
+        :param threads: requests served at once
+        :param max_requests: requests accepted before the worker stops, 0 for no limit
+        :param max_memory: bytes of resident memory above which the worker stops, 0 for no limit
+        """
+        host, port = listener.getsockname()[:2]
+        BaseWSGIServer.__init__(self, host, port, app, fd=listener.fileno())
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_memory = max_memory
+        self.alive = True
+        self.parent = os.getppid()
+        self.busy = 0
+        self.accepted = 0
+        self.condition = threading.Condition()
+        self.requests = queue.Queue()
+
+    def stop(self, *args):
+        self.alive = False
+
+    def serve(self, graceful_timeout=DEFAULT_GRACEFUL_TIMEOUT):
+        """
+        Serves requests until the worker is stopped, then waits at most graceful_timeout seconds for
+        the requests in flight
+
+        :param graceful_timeout: seconds given to the requests in flight once stopped
+        :return: True if every request in flight finished
+        """
+        threads = [threading.Thread(target=self.process_requests) for _ in range(self.threads)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        while self.alive:
+            # a worker whose master was killed stops instead of serving on
+            if os.getppid() != self.parent:
+                self.alive = False
+            with self.condition:
+                while self.busy >= self.threads and self.alive:
+                    self.condition.wait(POLL_INTERVAL)
+            if self.alive and wait_readable(self.socket, POLL_INTERVAL):
+                self._handle_request_noblock()
+        self.socket.close()
+
+        for _ in threads:
+            self.requests.put(None)
+        deadline = time.time() + graceful_timeout
+        for thread in threads:
+            thread.join(max(deadline - time.time(), 0))
+        return not any(thread.is_alive() for thread in threads)
+
+    def get_request(self):
+        connection, address = self.socket.accept()
+        connection.setblocking(True)
+        return connection, address
+
+    def process_request(self, request, client_address):
+        with self.condition:
+            self.busy += 1
+            # counted as it is accepted, a request finishing cannot stop the worker after it accepted one more
+            self.accepted += 1
+            if self.max_requests and self.accepted >= self.max_requests:
+                self.alive = False
+        self.requests.put((request, client_address))
+
+    def process_requests(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                self.request_finished()
+
+    def request_finished(self):
+        with self.condition:
+            self.busy -= 1
+            if self.max_memory and resident_memory() > self.max_memory:
+                self.alive = False
+            self.condition.notify()
+
+
+class PreforkServer(object):
+    """
+    Forks the workers after the application is loaded and replaces every worker which exits. SIGTERM,
+    or SIGINT, stops the workers and waits for them to drain, the workers still running after the
+    graceful timeout are killed. The request metrics files of the exited workers are folded into one.
+    """
+
+    def __init__(self, app, listener, workers=DEFAULT_WORKERS, threads=DEFAULT_THREADS, max_requests=0,
+                 max_memory=0, graceful_timeout=DEFAULT_GRACEFUL_TIMEOUT):
+        """
+        :param app: WSGI application, shared by the workers
+        :param listener: listening socket shared by the workers
+        :param workers: worker processes
+        :param threads: requests served at once by each worker
+        :param max_requests: requests served by a worker before it is replaced, 0 for no limit
+        :param max_memory: bytes of resident memory above which a worker is replaced, 0 for no limit
+        :param graceful_timeout: seconds given to a stopping worker to finish its requests
+        """
+        if int(workers) < 1:
+            raise ValueError('Parameter [workers] should be at least 1!')
+        if int(threads) < 1:
+            raise ValueError('Parameter [threads] should be at least 1!')
+        self.app = app
+        self.listener = listener
+        self.workers = int(workers)
+        self.threads = int(threads)
+        self.max_requests = int(max_requests)
+        self.max_memory = int(max_memory)
+        self.graceful_timeout = graceful_timeout
+        self.alive = True
+        self.pids = set()
+
+    def stop(self, *args):
+        self.alive = False
+
+    def run(self):
+        """
+        Keeps the workers running until the server is stopped
+
+        :return: None
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        while self.alive:
+            self.reap()
+            while self.alive and len(self.pids) < self.workers:
+                self.spawn()
+            time.sleep(POLL_INTERVAL)
+        self.shutdown()
+
+    def reap(self):
+        """
+        Forgets the workers which exited
+
+        :return: pids of the workers which exited
+        """
+        exited = []
+        while self.pids:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except OSError as error:
+                if error.errno != errno.ECHILD:
+                    raise
+                pid = 0
+            if not pid:
+                break
+            self.pids.discard(pid)
+            exited.append(pid)
+        self.retire(exited)
+        return exited
+
+    def retire(self, pids):
+        """
+        Folds the request metrics of exited workers into those of the retired workers
+
+        :param pids: pids of the exited workers
+        :return: None
+        """
+        request_metrics = self.app.extensions.get(EXTENSION_KEY, {}).get('request_metrics')
+        if request_metrics is not None:
+            request_metrics.retire(pids)
+
+    def spawn(self):
+        """
+        Forks a worker, the child process never returns from this call
+
+        :return: pid of the worker
+        """
+        pid = os.fork()
+        if pid:
+            self.pids.add(pid)
+            return pid
+
+        status = 0
+        try:
+            self.run_worker()
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            os._exit(status)
+
+    def run_worker(self):
+        """
+        Serves requests in the worker process until it is stopped
+
+        :return: None
+        """
+        random.seed()
+        max_requests = self.max_requests
+        if max_requests:
+            max_requests += random.randint(0, int(max_requests * MAX_REQUESTS_JITTER))
+
+        extensions = self.app.extensions.get(EXTENSION_KEY, {})
+        if 'data_controller' in extensions:
+            extensions['data_controller'].reset_after_fork()
+
+        server = WorkerServer(self.app, self.listener, self.threads, max_requests, self.max_memory)
+        signal.signal(signal.SIGTERM, server.stop)
+        signal.signal(signal.SIGINT, server.stop)
+        server.serve(self.graceful_timeout)
+
+        # the worker leaves through os._exit, which skips the atexit hook writing its last requests
+        if extensions.get('request_metrics') is not None:
+            extensions['request_metrics'].flush()
+
+    def shutdown(self):
+        """
+        Stops the workers and waits for them to drain, then kills the ones still running
+
+        :return: None
+        """
+        for pid in self.pids:
+            self.signal(pid, signal.SIGTERM)
+        deadline = time.time() + self.graceful_timeout + POLL_INTERVAL
+        while self.pids and time.time() < deadline:
+            self.reap()
+            time.sleep(POLL_INTERVAL / 5)
+        for pid in self.pids:
+            self.signal(pid, signal.SIGKILL)
+        while self.pids:
+            pid, _ = os.waitpid(-1, 0)
+            self.pids.discard(pid)
+            self.retire([pid])
+        self.listener.close()
+
+    @staticmethod
+    def signal(pid, signum):
+        try:
+            os.kill(pid, signum)
+        except OSError as error:
+            if error.errno != errno.ESRCH:
+                raise
+
+
+def serve(app, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, threads=DEFAULT_THREADS,
+          max_requests=0, max_memory=0, graceful_timeout=DEFAULT_GRACEFUL_TIMEOUT, backlog=DEFAULT_BACKLOG):
+    """
+    Serves the application on pre-forked worker processes. The application is loaded once, before the
+    workers are forked, and no database connection is opened before the first statement, so every worker
+    opens its own connections. The request metrics of the workers are added up through a metrics
+    directory, a temporary one unless METRICS_DIR is set. Each worker has its own response cache, whose
+    responses are checked against the owner's data_version before they are served.
+
+    :param app: flask application
+    :param host: interface to listen on
+    :param port: port to listen on
+    :param workers: worker processes
+    :param threads: requests served at once by each worker
+    :param max_requests: requests served by a worker before it is replaced, 0 for no limit
+    :param max_memory: megabytes of resident memory above which a worker is replaced, 0 for no limit
+    :param graceful_timeout: seconds given to a stopping worker to finish its requests
+    :param backlog: connections waiting to be accepted
+    :return: None
+    """
+    extensions = app.extensions.get(EXTENSION_KEY, {})
+    request_metrics = extensions.get('request_metrics')
+    metrics_directory = None
+    if request_metrics is not None and request_metrics.directory is None:
+        request_metrics.directory = metrics_directory = tempfile.mkdtemp(prefix='bucketlist_metrics_')
+    if request_metrics is not None:
+        request_metrics.clear()
+
+    listener = listening_socket(host, port, backlog)
+    server = PreforkServer(app, listener, workers, threads, max_requests, int(max_memory) * MEGABYTE,
+                           graceful_timeout)
+    print('Serving on http://{}:{} with {} workers of {} threads'.format(
+        host, listener.getsockname()[1], workers, threads))
+    sys.stdout.flush()
+    try:
+        server.run()
+    finally:
+        if metrics_directory is not None:
+            shutil.rmtree(metrics_directory, ignore_errors=True)
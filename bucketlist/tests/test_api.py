@@ -12,7 +12,9 @@ import json
 
 from unittest import TestCase
 
-from bucketlist.app import app
+from bucketlist.app import create_app
+
+app = create_app()
 
 
 class APITest(TestCase):
@@ -83,6 +85,124 @@ class APITest(TestCase):
         self.assertEqual(request.status_code, 200)
         self.assertEqual(resp_data['STATUS'], 'success')
 
+    def test_bucketlist_not_modified(self):
+        print('=> Test conditional get of bucket lists')
+        request = self.app.get('/api/v1/bucketlists/', headers={'TOKEN': self.data['TOKEN']})
+        etag = request.headers['ETag']
+        self.assertEqual(request.status_code, 200)
+
+        request = self.app.get('/api/v1/bucketlists/', headers={'TOKEN': self.data['TOKEN'], 'If-None-Match': etag})
+        self.assertEqual(request.status_code, 304)
+        self.assertEqual(request.data, '')
+        self.assertEqual(request.headers['ETag'], etag)
+
+    def test_bucketlist_modified_after_write(self):
+        print('=> Test conditional get of bucket lists after a write')
+        request = self.app.get('/api/v1/bucketlists/', headers={'TOKEN': self.data['TOKEN']})
+        etag = request.headers['ETag']
+
+        self.app.post('/api/v1/bucketlists/', data=json.dumps({'name': 'etag_list'}),
+                      headers={'TOKEN': self.data['TOKEN']})
+        request = self.app.get('/api/v1/bucketlists/', headers={'TOKEN': self.data['TOKEN'], 'If-None-Match': etag})
+        self.assertEqual(request.status_code, 200)
+        self.assertNotEqual(request.headers['ETag'], etag)
+
+    def cache_stats(self):
+        request = self.app.get('/api/v1/cache/stats', headers={'TOKEN': self.data['TOKEN']})
+        return json.loads(request.data)['CACHE']
+
+    def test_bucketlist_served_from_cache(self):
+        print('=> Test bucket lists served from the response cache')
+        self.app.get('/api/v1/bucketlists/?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        hits = self.cache_stats()['hits']
+        first = self.app.get('/api/v1/bucketlists/?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.cache_stats()['hits'], hits + 1)
+
+        self.app.post('/api/v1/bucketlists/', data=json.dumps({'name': 'cached_list'}),
+                      headers={'TOKEN': self.data['TOKEN']})
+        second = self.app.get('/api/v1/bucketlists/?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        self.assertNotEqual(json.loads(second.data)['count'], json.loads(first.data)['count'])
+
+    def test_cached_bucketlist_after_write_of_another_process(self):
+        print('=> Test bucket lists cached before a write served by another process')
+        first = self.app.get('/api/v1/bucketlists/?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        # another application has its own response cache, as another worker process does
+        create_app().test_client().post('/api/v1/bucketlists/', data=json.dumps({'name': 'other_process_list'}),
+                                        headers={'TOKEN': self.data['TOKEN']})
+        second = self.app.get('/api/v1/bucketlists/?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(json.loads(second.data)['count'], json.loads(first.data)['count'] + 1)
+
+    def test_bucketlist_summary(self):
+        print('=> Test bucket list summary')
+        request = self.app.get('/api/v1/bucketlists/summary', headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(sorted(resp_data['bucketlists'][0].keys()),
+                         ['bucketlist_id', 'bucketlist_name', 'done_count', 'item_count'])
+
+    def test_export_ndjson(self):
+        print('=> Test export bucket lists as NDJSON')
+        request = self.app.get('/api/v1/export', headers={'TOKEN': self.data['TOKEN']})
+        lines = [json.loads(line) for line in request.data.decode('utf-8').splitlines()]
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(request.mimetype, 'application/x-ndjson')
+        self.assertEqual([line['type'] for line in lines[:4]], ['bucketlist', 'item', 'item', 'item'])
+        bucketlist_id = None
+        for line in lines:
+            if line['type'] == 'bucketlist':
+                bucketlist_id = line['bucketlist_id']
+            else:
+                self.assertEqual(line['bucketlist'], bucketlist_id)
+
+    def test_export_csv(self):
+        print('=> Test export bucket lists as CSV')
+        request = self.app.get('/api/v1/export?format=csv', headers={'TOKEN': self.data['TOKEN']})
+        lines = request.data.decode('utf-8').splitlines()
+        self.assertEqual(request.status_code, 200)
+        self.assertTrue(lines[0].startswith('bucketlist_id,bucketlist_name,'))
+        self.assertTrue(len(lines) >= 4)
+
+    def test_export_invalid_format(self):
+        print('=> Test export with an unknown format')
+        request = self.app.get('/api/v1/export?format=xml', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(request.status_code, 400)
+
+    def test_import_exported_bucketlists(self):
+        print('=> Test import an export')
+        exported = self.app.get('/api/v1/export', headers={'TOKEN': self.data['TOKEN']}).data
+        request = self.app.post('/api/v1/import', data=exported, content_type='application/x-ndjson',
+                                headers={'TOKEN': self.data['TOKEN']})
+        report = json.loads(request.data)['IMPORTED']
+        self.assertEqual(request.status_code, 201)
+        self.assertEqual(report['bucketlists'] + report['items'], len(exported.splitlines()))
+        self.assertEqual(report['errors'], 0)
+
+    def test_import_nothing(self):
+        print('=> Test import without valid lines')
+        request = self.app.post('/api/v1/import', data='{"type": "bucketlist"}\n',
+                                content_type='application/x-ndjson', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(request.status_code, 400)
+        self.assertEqual(json.loads(request.data)['IMPORTED']['ERRORS'][0]['line'], 1)
+
+    def test_metrics(self):
+        print('=> Test request metrics')
+        self.app.get('/api/v1/bucketlists/', headers={'TOKEN': self.data['TOKEN']})
+        request = self.app.get('/api/v1/_metrics')
+        text = request.data.decode('utf-8')
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(request.mimetype, 'text/plain')
+        self.assertIn('bucketlist_requests_total{endpoint="login",method="POST",status="200"}', text)
+        self.assertIn('bucketlist_request_queries_total{endpoint="bucketlist"}', text)
+        self.assertIn('bucketlist_password_hasher_pending{pid=', text)
+
+    def test_users_not_modified(self):
+        print('=> Test conditional get of users')
+        request = self.app.get('/api/v1/users/', headers={'TOKEN': self.data['TOKEN']})
+        etag = request.headers['ETag']
+        request = self.app.get('/api/v1/users/', headers={'TOKEN': self.data['TOKEN'], 'If-None-Match': etag})
+        self.assertEqual(request.status_code, 304)
+
     def test_get_bucketlist_by_id(self):
         print('=> Test get bucket list by id')
         request = self.app.get('/api/v1/bucketlists/1', headers={'TOKEN': self.data['TOKEN']})
@@ -124,6 +244,37 @@ class APITest(TestCase):
         self.assertEqual(request.status_code, 200)
         self.assertIsNotNone(item)
 
+    def test_get_items_with_page_size(self):
+        print('=> Test get bucket list items with page size')
+        request = self.app.get('/api/v1/bucketlists/items/1?limit=1&page_size=3', headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(resp_data['total'], 3)
+        self.assertEqual(resp_data['count'], 3)
+        self.assertIsNone(resp_data['next_cursor'])
+
+    def test_get_items_with_cursor(self):
+        print('=> Test get bucket list items with cursor')
+        request = self.app.get('/api/v1/bucketlists/items/1?page_size=2', headers={'TOKEN': self.data['TOKEN']})
+        first_page = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(first_page['total'], 2)
+        self.assertIsNotNone(first_page['next_cursor'])
+
+        request = self.app.get('/api/v1/bucketlists/items/1?page_size=2&cursor=' + first_page['next_cursor'],
+                               headers={'TOKEN': self.data['TOKEN']})
+        second_page = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(second_page['total'], 1)
+        self.assertIsNone(second_page['next_cursor'])
+        self.assertGreater(second_page['bucketlist_item'][0]['item_id'],
+                           first_page['bucketlist_item'][-1]['item_id'])
+
+    def test_get_items_with_invalid_cursor(self):
+        print('=> Test get bucket list items with invalid cursor')
+        request = self.app.get('/api/v1/bucketlists/items/1?cursor=invalid', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(request.status_code, 404)
+
     def test_get_items_in_invalid_page(self):
         print('=> Test get bucket list items')
         request = self.app.get('/api/v1/bucketlists/items/1?limit=10', headers={'TOKEN': self.data['TOKEN']})
@@ -137,6 +288,43 @@ class APITest(TestCase):
         self.assertEqual(request.status_code, 200)
         self.assertIsNotNone(users)
 
+    def test_get_users_with_fields(self):
+        print('=> Test get users with sparse fieldset')
+        request = self.app.get('/api/v1/users/?fields=user_id,username', headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertEqual(sorted(resp_data['users'][0].keys()), ['user_id', 'username'])
+
+    def test_get_users_with_expand(self):
+        print('=> Test get users with expanded bucketlists')
+        request = self.app.get('/api/v1/users/?fields=username,bucketlists.bucketlist_name&limit=1&page_size=5',
+                               headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        user = resp_data['users'][0]
+        self.assertEqual(sorted(user.keys()), ['bucketlists', 'username'])
+        self.assertEqual(sorted(user['bucketlists'][0].keys()), ['bucketlist_name'])
+
+    def test_get_bucketlists_without_items(self):
+        print('=> Test get bucket lists with sparse fieldset')
+        request = self.app.get('/api/v1/bucketlists/?fields=bucketlist_id,bucketlist_name',
+                               headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(request.status_code, 200)
+        self.assertNotIn('bucketlist_items', resp_data['bucketlists'][0])
+
+        request = self.app.get('/api/v1/bucketlists/?expand=bucketlist_items&fields=bucketlist_items.item_name',
+                               headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(request.data)
+        self.assertEqual(sorted(resp_data['bucketlists'][0]['bucketlist_items'][0].keys()), ['item_name'])
+
+    def test_get_items_with_invalid_fields(self):
+        print('=> Test get bucket list items with invalid fieldset')
+        request = self.app.get('/api/v1/bucketlists/items/1?fields=hash_password', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(request.status_code, 400)
+        request = self.app.get('/api/v1/bucketlists/items/1?expand=bucketlists', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(request.status_code, 400)
+
     def test_get_user_by_id(self):
         print('=> Test get users')
         request = self.app.get('/api/v1/user/1', headers={'TOKEN': self.data['TOKEN']})
@@ -192,6 +380,38 @@ class APITest(TestCase):
         response = self.app.post('/api/v1/bucketlists/', data=json_data, headers={'TOKEN': self.data['TOKEN']})
         self.assertEqual(response.status_code, 201)
 
+    def test_create_bucketlists_in_batch(self):
+        print('=> create bucket lists in a batch')
+        json_data = json.dumps([{'name': 'batch_list_1'}, {'name': ''}, {'name': 'batch_list_2'}])
+        response = self.app.post('/api/v1/bucketlists/', data=json_data, headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(response.data)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([created['index'] for created in resp_data['CREATED']], [0, 2])
+        self.assertEqual(resp_data['ERRORS'][0]['index'], 1)
+
+    def test_create_bucketlists_in_atomic_batch(self):
+        print('=> create bucket lists in an atomic batch')
+        json_data = json.dumps([{'name': 'atomic_list'}, {'title': 'no name'}])
+        response = self.app.post('/api/v1/bucketlists/?atomic=true', data=json_data,
+                                 headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(response.data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(resp_data['CREATED'], [])
+
+        response = self.app.get('/api/v1/search/atomic_list', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(response.status_code, 404)
+
+    def test_create_bucketlist_items_in_batch(self):
+        print('=> create bucket list items in a batch')
+        json_data = json.dumps([{'name': 'batch_item_{}'.format(index), 'description': 'batch'}
+                                for index in range(5)])
+        response = self.app.post('/api/v1/bucketlists/2/items', data=json_data, headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(response.data)
+        self.assertEqual(response.status_code, 201)
+        item_ids = [created['item_id'] for created in resp_data['CREATED']]
+        self.assertEqual(len(item_ids), 5)
+        self.assertEqual(item_ids, sorted(item_ids))
+
     def test_update_bucketlist(self):
         print('=> update bucketlist')
         data = {
@@ -247,9 +467,23 @@ class APITest(TestCase):
         }
 
         json_data = json.dumps(data)
-        response = self.app.put('/api/v1/bucketlists/update-item/5', data=json_data,
+        response = self.app.put('/api/v1/bucketlists/update-item/2', data=json_data,
                                 headers={'TOKEN': self.data['TOKEN']})
         self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)['bucket_list_item']['item_name'], 'new_updated_name')
+
+    def test_update_bucketlist_item_of_another_user(self):
+        print('=> update item of another user')
+        data = {
+            "name": 'new_updated_name',
+            "done": 'True',
+            "description": 'This is a test update call'
+        }
+
+        json_data = json.dumps(data)
+        response = self.app.put('/api/v1/bucketlists/update-item/5', data=json_data,
+                                headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(response.status_code, 404)
 
     def test_update_bucketlist_item_that_does_not_exist(self):
         print('=> update item')
@@ -262,7 +496,7 @@ class APITest(TestCase):
         json_data = json.dumps(data)
         response = self.app.put('/api/v1/bucketlists/update-item/200', data=json_data,
                                 headers={'TOKEN': self.data['TOKEN']})
-        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.status_code, 404)
 
     def test_delete_bucket_list_item(self):
         print('=> delete bucket list item')
@@ -284,6 +518,24 @@ class APITest(TestCase):
         response = self.app.get('/api/v1/search/Liyai_list', headers={'TOKEN': self.data['TOKEN']})
         self.assertEqual(response.status_code, 200)
 
+    def test_api_search_item_with_paging(self):
+        print('=> test paged search of items')
+        response = self.app.get('/api/v1/search/diving?limit=1&page_size=5', headers={'TOKEN': self.data['TOKEN']})
+        resp_data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(resp_data['SEARCH'][0]['bucketlist_name'], 'Liyai_list')
+
+    def test_api_search_page_size_without_limit(self):
+        print('=> test search paged by page_size alone')
+        response = self.app.get('/api/v1/search/list?page_size=1', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['SEARCH']), 1)
+
+    def test_api_search_with_cursor(self):
+        print('=> test search with a cursor')
+        response = self.app.get('/api/v1/search/list?cursor=abc', headers={'TOKEN': self.data['TOKEN']})
+        self.assertEqual(response.status_code, 400)
+
     def test_api_search_invalid_token(self):
         print('=> test with invalid token')
         response = self.app.get('/api/v1/search/Liyai_list', headers={'TOKEN': 'Invalid_Token'})
@@ -0,0 +1,85 @@
+"""
+File      : test_async_server.py
+Date      : October, 2026
+Author    : agent
+Desc      : gevent server test file, skipped when gevent is not installed
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import re
+import sys
+import time
+import threading
+import subprocess
+
+from unittest import TestCase, skipUnless
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+try:
+    import gevent
+except ImportError:
+    gevent = None
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# serves the application, with a route which sleeps cooperatively, on greenlets and port 0
+SERVER_SCRIPT = """
+from bucketlist.async_server import patch, serve
+
+patch()
+
+import time
+
+from bucketlist.app import create_app
+
+app = create_app()
+app.add_url_rule('/slow', 'slow', lambda: time.sleep(1) or 'done')
+serve(app, '127.0.0.1', 0, 20)
+"""
+
+
+@skipUnless(gevent is not None, 'needs gevent')
+class AsyncServerTest(TestCase):
+
+    def setUp(self):
+        environ = dict(os.environ, BUCKETLIST_ENV='production')
+        self.process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT], env=environ, cwd=ROOT_DIRECTORY,
+                                        stdout=subprocess.PIPE, stderr=open(os.devnull, 'w'))
+        self.addCleanup(self.stop)
+        line = self.process.stdout.readline().decode('utf-8')
+        self.url = re.search(r'http://\S+', line).group(0)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+    def get(self, path):
+        response = urlopen(self.url + path, timeout=10)
+        return response.getcode(), response.read()
+
+    def concurrent_gets(self, paths):
+        responses = []
+        threads = [threading.Thread(target=lambda path=path: responses.append(self.get(path))) for path in paths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return responses
+
+    def test_slow_requests_share_the_hub(self):
+        started = time.time()
+        responses = self.concurrent_gets(['/slow'] * 10)
+        self.assertEqual(responses, [(200, b'done')] * 10)
+        # ten one second requests, one after the other, would take ten seconds
+        self.assertLess(time.time() - started, 5)
+
+    def test_concurrent_api_requests(self):
+        responses = self.concurrent_gets(['/api/v1/'] * 20)
+        self.assertEqual([status for status, _ in responses], [200] * 20)
@@ -9,15 +9,24 @@ Desc      : token test file
 # necessary imports
 # ============================================================================
 import json
+import time
 
 from unittest import TestCase
 
+from flask import Flask
+
 from bucketlist.controllers.authentication_controller import encode_auth_token, decode_auth_token
+from bucketlist.controllers.authentication_controller import TokenCache, TOKEN_CACHE
 
 
 class TokenAuthentcationTest(TestCase):
 
     def setUp(self):
+        self.app = Flask('token_test')
+        self.app.config['SECRET_KEY'] = 'secret'
+        self.context = self.app.app_context()
+        self.context.push()
+        self.addCleanup(self.context.pop)
         self.encoded_return = encode_auth_token(10)
 
     def test_encode_data(self):
@@ -34,6 +43,61 @@ class TokenAuthentcationTest(TestCase):
         encoded_fault = encode_auth_token(id)
         self.assertIsInstance(encoded_fault, Exception)
 
+    def test_missing_secret_key(self):
+        self.assertTrue(decode_auth_token(self.encoded_return)['status'])
+        self.app.config['SECRET_KEY'] = None
+        self.assertRaises(RuntimeError, encode_auth_token, 10)
+        self.assertRaises(RuntimeError, decode_auth_token, self.encoded_return)
+
+    def test_token_is_signed_with_the_configured_key(self):
+        # decoded, and cached, with the key it was signed with first
+        self.assertTrue(decode_auth_token(self.encoded_return)['status'])
+        self.app.config['SECRET_KEY'] = 'another secret'
+        self.assertFalse(decode_auth_token(self.encoded_return)['status'])
+
+    def test_token_cached_by_another_application_is_verified(self):
+        self.assertTrue(decode_auth_token(self.encoded_return)['status'])
+        other_app = Flask('other_token_test')
+        other_app.config['SECRET_KEY'] = 'another secret'
+        with other_app.app_context():
+            self.assertFalse(decode_auth_token(self.encoded_return)['status'])
+
     def test_invalid_token(self):
         id_return = decode_auth_token('invalid_string')
         self.assertEqual(id_return['decode_data'], 'Invalid token. Please log in again.')
+
+    def test_decoded_token_is_cached(self):
+        TOKEN_CACHE.clear()
+        decode_auth_token(self.encoded_return)
+        self.assertIsNotNone(TOKEN_CACHE.get('secret', self.encoded_return))
+        self.assertEqual(decode_auth_token(self.encoded_return)['decode_data'], 10)
+
+    def test_invalid_token_is_not_cached(self):
+        TOKEN_CACHE.clear()
+        decode_auth_token('invalid_string')
+        self.assertEqual(len(TOKEN_CACHE.tokens), 0)
+
+
+class TokenCacheTest(TestCase):
+
+    def test_token_is_only_served_for_its_key(self):
+        cache = TokenCache()
+        cache.set('secret', 'token', {'sub': 1, 'exp': time.time() + 60})
+        self.assertIsNone(cache.get('another secret', 'token'))
+        self.assertEqual(cache.get('secret', 'token')['sub'], 1)
+
+    def test_expired_token_is_not_served(self):
+        cache = TokenCache()
+        cache.set('secret', 'token', {'sub': 1, 'exp': time.time() - 1})
+        self.assertIsNone(cache.get('secret', 'token'))
+
+    def test_least_recently_used_token_is_evicted(self):
+        cache = TokenCache(max_size=2)
+        exp = time.time() + 60
+        cache.set('secret', 'first', {'sub': 1, 'exp': exp})
+        cache.set('secret', 'second', {'sub': 2, 'exp': exp})
+        cache.get('secret', 'first')
+        cache.set('secret', 'third', {'sub': 3, 'exp': exp})
+        self.assertIsNone(cache.get('secret', 'second'))
+        self.assertEqual(cache.get('secret', 'first')['sub'], 1)
+        self.assertEqual(cache.get('secret', 'third')['sub'], 3)
@@ -0,0 +1,617 @@
+"""
+File      : test_database_controller.py
+Date      : October, 2026
+Author    : agent
+Desc      : database controller test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import re
+import json
+import threading
+import types
+
+from datetime import date, timedelta
+
+from unittest import TestCase, skipUnless
+
+from sqlalchemy import event
+
+from bucketlist.controllers.database_controller import DatabaseController, MAX_PAGE_SIZE
+from bucketlist.controllers.database_controller import encode_cursor, decode_cursor, build_fieldset, full_fieldset
+from bucketlist.controllers.password_hasher import PasswordHasher
+from bucketlist.controllers.response_cache import MemoryCache
+from bucketlist.controllers.data_import import ndjson_records
+from bucketlist.controllers.data_seed import SeedGenerator, SEED_PASSWORD
+
+
+class DatabaseControllerTest(TestCase):
+
+    def setUp(self):
+        test_database = os.environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI']
+        self.TEST_DATA_CONTROLLER = DatabaseController(test_database)
+        self.TEST_DATA_CONTROLLER.initialize_database()
+        self.TEST_DATA_CONTROLLER.populate_database()
+        self.user = self.TEST_DATA_CONTROLLER.get_by_username('liyai')
+
+    def tearDown(self):
+        self.TEST_DATA_CONTROLLER.session.remove()
+        self.TEST_DATA_CONTROLLER.drop_tables()
+
+    def count_queries(self, func, *args, **kwargs):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            self.TEST_DATA_CONTROLLER.session.expire_all()
+            func(*args, **kwargs)
+        finally:
+            event.remove(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+        return len(statements)
+
+    def add_bucketlists(self, number_of_bucketlists, items_per_bucketlist):
+        controller = self.TEST_DATA_CONTROLLER
+        for index in range(number_of_bucketlists):
+            controller.create_bucketlist('list {}'.format(index), self.user.user_id)
+        for created in controller.get_bucketlist_by_id(user=self.user.user_id):
+            for index in range(items_per_bucketlist):
+                controller.create_bucketlist_item('item {}'.format(index), 'description', created.bucketlist_id)
+
+    def assert_query_count_is_constant(self, func, *args, **kwargs):
+        small = self.count_queries(func, *args, **kwargs)
+        self.add_bucketlists(5, 4)
+        large = self.count_queries(func, *args, **kwargs)
+        self.assertEqual(small, large)
+
+    def test_get_users_query_count(self):
+        self.assert_query_count_is_constant(self.TEST_DATA_CONTROLLER.get_user_by_id, serialize=True)
+
+    def test_get_user_page_query_count(self):
+        self.assert_query_count_is_constant(self.TEST_DATA_CONTROLLER.get_user_page, page_size=10, serialize=True)
+
+    def test_get_single_user_query_count(self):
+        self.assert_query_count_is_constant(self.TEST_DATA_CONTROLLER.get_user_by_id, user_id=self.user.user_id,
+                                            serialize=True)
+
+    def test_get_bucketlists_query_count(self):
+        self.assert_query_count_is_constant(self.TEST_DATA_CONTROLLER.get_bucketlist_by_id, user=self.user.user_id,
+                                            serialize=True)
+
+    def test_search_query_count(self):
+        self.assert_query_count_is_constant(self.TEST_DATA_CONTROLLER.search_database, 'list', self.user.user_id,
+                                            serialize=True)
+
+    def test_session_per_thread(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(self.TEST_DATA_CONTROLLER.session()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], self.TEST_DATA_CONTROLLER.session())
+
+    @skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_forked_process_opens_its_own_connection(self):
+        controller = DatabaseController('sqlite://')
+        controller.db_engine.raw_connection().close()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            connection = controller.db_engine.raw_connection()
+            os.write(write_end, str(connection.info['pid']).encode('ascii'))
+            os._exit(0)
+        os.close(write_end)
+        child_pid = int(os.read(read_end, 32))
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        self.assertEqual(child_pid, pid)
+        self.assertEqual(controller.db_engine.raw_connection().info['pid'], os.getpid())
+
+    def test_engine_is_created_on_first_use(self):
+        controller = DatabaseController(os.environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI'])
+        self.assertIsNone(controller._db_engine)
+        controller.get_by_username('liyai')
+        self.assertIsNotNone(controller._db_engine)
+        controller.session.remove()
+
+    def test_remove_session_rolls_back_failed_request(self):
+        self.user.first_name = 'rolled back'
+        self.TEST_DATA_CONTROLLER.remove_session(Exception('request failed'))
+        user = self.TEST_DATA_CONTROLLER.get_by_username('liyai')
+        self.assertEqual(user.first_name, 'eugene')
+
+    def search(self, search_value, **kwargs):
+        results = self.TEST_DATA_CONTROLLER.search_database(search_value, self.user.user_id, **kwargs)
+        return [bucketlist.bucketlist_name for bucketlist in results]
+
+    def test_search_bucketlist_name(self):
+        self.assertEqual(self.search('Liyai_list'), ['Liyai_list'])
+
+    def test_search_item_description(self):
+        self.assertEqual(self.search('Naivasha'), ['Liyai_list'])
+        self.assertEqual(self.search('Bungy'), [])
+
+    def test_search_ranks_name_matches_first(self):
+        self.TEST_DATA_CONTROLLER.create_bucketlist('Diving spots', self.user.user_id)
+        self.assertEqual(self.search('diving'), ['Diving spots', 'Liyai_list'])
+        self.assertEqual(self.search('diving', page=2, page_size=1), ['Liyai_list'])
+        self.assertEqual(self.search('diving', page_size=1), ['Diving spots'])
+
+    def test_search_index_follows_updates(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucketlist = controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+        controller.create_bucketlist_item('Climb Kilimanjaro', 'Book the Marangu route', bucketlist.bucketlist_id)
+        self.assertEqual(self.search('Marangu'), ['Liyai_list'])
+
+        item = controller.get_item_by_id(bucket_id=bucketlist.bucketlist_id)[-1]
+        controller.update_bucketlist_item(item.item_id, {'item_name': 'Climb Kenya', 'done': False,
+                                                         'description': 'Sirimon route', 'date_completed': None})
+        self.assertEqual(self.search('Marangu'), [])
+        self.assertEqual(self.search('Sirimon'), ['Liyai_list'])
+
+        controller.delete_bucketlist_item(item.item_id)
+        self.assertEqual(self.search('Sirimon'), [])
+
+        controller.update_bucketlist(bucketlist.bucketlist_id, {'bucketlist_name': 'Renamed'}, self.user.user_id)
+        self.assertEqual(self.search('Liyai_list'), [])
+        self.assertEqual(self.search('Renamed'), ['Renamed'])
+
+        controller.delete_bucketlist(bucketlist.bucketlist_id)
+        self.assertEqual(self.search('Renamed'), [])
+        self.assertEqual(self.search('Naivasha'), [])
+
+    def test_search_input_is_not_a_query(self):
+        self.assertEqual(self.search('"Sky" OR NEAR('), [])
+
+    def test_password_hash_upgraded_on_login(self):
+        controller = self.TEST_DATA_CONTROLLER
+        controller.password_hasher = PasswordHasher(processes=0, method='pbkdf2:sha256:1000')
+        self.assertTrue(controller.user_login_authentication(username='liyai', password='password')['status'])
+        self.assertTrue(self.user.hash_password.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(controller.user_login_authentication(username='liyai', password='password')['status'])
+        self.assertFalse(controller.user_login_authentication(username='liyai', password='wrong')['status'])
+
+    def test_writes_bump_data_version(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucketlist = controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+        item = controller.get_item_by_id(bucket_id=bucketlist.bucketlist_id)[0]
+        version = controller.get_data_version(user_id=self.user.user_id)
+        self.assertEqual(controller.get_data_version(bucket_id=bucketlist.bucketlist_id), version)
+        self.assertEqual(controller.get_data_version(item_id=item.item_id), version)
+
+        controller.update_bucketlist_item(item.item_id, {'item_name': 'Sky diving', 'done': True,
+                                                         'description': '', 'date_completed': None})
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 1)
+        controller.create_bucketlist('another list', self.user.user_id)
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 2)
+        self.assertIsNone(controller.get_data_version(bucket_id=1000))
+
+    def test_updates_are_scoped_by_owner(self):
+        controller = self.TEST_DATA_CONTROLLER
+        other = controller.get_by_username('maasai').user_id
+        bucketlist = controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+        item = controller.get_item_by_id(bucket_id=bucketlist.bucketlist_id)[0]
+        new_item = {'item_name': 'Sky diving', 'done': True, 'description': 'Naivasha', 'date_completed': None}
+
+        self.assertIsNone(controller.update_bucketlist(bucketlist.bucketlist_id, {'bucketlist_name': 'Taken'}, other))
+        self.assertIsNone(controller.update_bucketlist_item(item.item_id, new_item, user=other))
+        self.assertIsNone(controller.update_bucketlist_item(1000, new_item, user=self.user.user_id))
+        self.assertIsNone(controller.update_user(self.user.user_id, {'email': 'taken@mail.com', 'first_name': 'x',
+                                                                     'last_name': 'y', 'username': 'liyai'},
+                                                 owner=other))
+        self.assertEqual(self.item_counts(bucketlist.bucketlist_id), (3, 0))
+        self.assertEqual(self.search('Taken'), [])
+
+        updated = controller.update_bucketlist_item(item.item_id, new_item, user=self.user.user_id)
+        self.assertEqual((updated['item_id'], updated['done'], updated['description']),
+                         (item.item_id, True, 'Naivasha'))
+        self.assertEqual(self.item_counts(bucketlist.bucketlist_id), (3, 1))
+        updated = controller.update_bucketlist(bucketlist.bucketlist_id, {'bucketlist_name': 'Mine'}, self.user.user_id)
+        self.assertEqual(updated['bucketlist_name'], 'Mine')
+        updated = controller.update_user(self.user.user_id, {'email': 'new@mail.com', 'first_name': 'eugene',
+                                                             'last_name': 'liyai', 'username': 'liyai'},
+                                         owner=self.user.user_id)
+        self.assertEqual(updated['email'], 'new@mail.com')
+
+    def test_projection_matches_serialize(self):
+        controller = self.TEST_DATA_CONTROLLER
+        self.add_bucketlists(3, 2)
+        serialized = controller.get_bucketlist_by_id(user=self.user.user_id, serialize=True)
+        serialized = sorted(serialized, key=lambda bucketlist: bucketlist['bucketlist_id'])
+        for bucketlist in serialized:
+            bucketlist['bucketlist_items'].sort(key=lambda item: item['item_id'])
+        self.assertEqual(controller.get_bucketlist_projection(user=self.user.user_id), serialized)
+
+        bucket_id = serialized[0]['bucketlist_id']
+        self.assertEqual(controller.get_bucketlist_projection(bucket_id=bucket_id, user=self.user.user_id),
+                         serialized[:1])
+        self.assertEqual(controller.get_item_projection(bucket_id=bucket_id), serialized[0]['bucketlist_items'])
+        item_id = serialized[0]['bucketlist_items'][0]['item_id']
+        self.assertEqual(controller.get_item_projection(item_id=item_id), serialized[0]['bucketlist_items'][:1])
+
+    def test_commit_invalidates_owner_cache(self):
+        controller = self.TEST_DATA_CONTROLLER
+        controller.cache = MemoryCache()
+        other_user = controller.get_by_username('maasai').user_id
+        controller.cache.set('mine', 'mine', self.user.user_id)
+        controller.cache.set('other', 'other', other_user)
+
+        bucketlist = controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+        item = controller.get_item_by_id(bucket_id=bucketlist.bucketlist_id)[0]
+        controller.bump_data_version(item_id=item.item_id)
+        self.assertEqual(controller.cache.get('mine'), 'mine')
+        controller.session.rollback()
+        self.assertEqual(controller.cache.get('mine'), 'mine')
+
+        controller.delete_bucketlist_item(item.item_id)
+        self.assertIsNone(controller.cache.get('mine'))
+        self.assertEqual(controller.cache.get('other'), 'other')
+
+    def item_counts(self, bucket_id):
+        summary = [bucketlist for bucketlist in self.TEST_DATA_CONTROLLER.get_bucketlist_summary(user=self.user.user_id)
+                   if bucketlist['bucketlist_id'] == bucket_id][0]
+        return summary['item_count'], summary['done_count']
+
+    def test_item_counts_follow_writes(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucket_id = controller.get_bucketlist_by_id(user=self.user.user_id)[0].bucketlist_id
+        self.assertEqual(self.item_counts(bucket_id), (3, 0))
+
+        controller.create_bucketlist_item('Climb Kilimanjaro', 'Marangu route', bucket_id)
+        controller.create_bucketlist_items([{'item_name': 'Safari'}, {'item_name': 'Road trip'}], bucket_id)
+        self.assertEqual(self.item_counts(bucket_id), (6, 0))
+
+        item_id = controller.get_item_by_id(bucket_id=bucket_id)[0].item_id
+        done = {'item_name': 'Sky diving', 'done': True, 'description': '', 'date_completed': None}
+        controller.update_bucketlist_item(item_id, done)
+        controller.update_bucketlist_item(item_id, done)
+        self.assertEqual(self.item_counts(bucket_id), (6, 1))
+        not_done = dict(done, done=False)
+        self.assertIsNone(controller.update_bucketlist_item(item_id, not_done, user=self.user.user_id + 1))
+        self.assertEqual(self.item_counts(bucket_id), (6, 1))
+
+        controller.delete_bucketlist_item(item_id)
+        self.assertEqual(self.item_counts(bucket_id), (5, 0))
+        controller.delete_bucketlist_item(controller.get_item_by_id(bucket_id=bucket_id)[0].item_id)
+        self.assertEqual(self.item_counts(bucket_id), (4, 0))
+
+    def test_summary_does_not_read_items(self):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            summary = self.TEST_DATA_CONTROLLER.get_bucketlist_summary(user=self.user.user_id)
+        finally:
+            event.remove(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(summary, [{'bucketlist_id': 1, 'bucketlist_name': 'Liyai_list',
+                                    'item_count': 3, 'done_count': 0}])
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('BucketlistItems', statements[0])
+
+    def test_repair_item_counts(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucket_id = controller.get_bucketlist_by_id(user=self.user.user_id)[0].bucketlist_id
+        version = controller.get_data_version(user_id=self.user.user_id)
+        controller.session.execute('UPDATE "Bucketlist" SET item_count = 10, done_count = 7 '
+                                   'WHERE bucketlist_id = :bucket_id', {'bucket_id': bucket_id})
+        controller.session.commit()
+
+        self.assertEqual(controller.repair_item_counts(), 1)
+        self.assertEqual(self.item_counts(bucket_id), (3, 0))
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 1)
+        self.assertEqual(controller.repair_item_counts(), 0)
+
+    def test_export_bucketlists(self):
+        controller = self.TEST_DATA_CONTROLLER
+        controller.create_bucketlist('Empty list', self.user.user_id)
+        rows = list(controller.export_bucketlists(user=self.user.user_id, batch_size=2))
+
+        self.assertEqual([bucketlist['bucketlist_name'] for bucketlist, item in rows],
+                         ['Liyai_list'] * 3 + ['Empty list'])
+        self.assertEqual([item['item_name'] for bucketlist, item in rows[:3]],
+                         [item.item_name for item in controller.get_item_by_id(bucket_id=rows[0][0]['bucketlist_id'])])
+        self.assertIsNone(rows[3][1])
+        self.assertRaises(ValueError, controller.export_bucketlists, user=self.user.user_id, batch_size=0)
+
+    def import_lines(self, records, **kwargs):
+        lines = [json.dumps(record) if isinstance(record, dict) else record for record in records]
+        return self.TEST_DATA_CONTROLLER.import_records(ndjson_records(lines, owner=kwargs.get('owner')), **kwargs)
+
+    def test_import_users_bucketlists_and_items(self):
+        reports = []
+        report = self.import_lines([
+            {'type': 'user', 'user_id': 7, 'first_name': 'jane', 'last_name': 'doe', 'username': 'jdoe',
+             'email': 'jdoe@example.com', 'password': 'secret'},
+            {'type': 'bucketlist', 'bucketlist_id': 3, 'bucketlist_name': 'Coast', 'user': 7},
+            {'type': 'item', 'item_name': 'Snorkel at Watamu', 'bucketlist': 3, 'done': True},
+            '',
+            {'type': 'item', 'item_name': 'Visit Lamu', 'description': 'dhow ride', 'bucketlist': 3},
+            {'type': 'item', 'item_name': 'Orphan', 'bucketlist': 4},
+            'not json',
+            {'type': 'user', 'user_id': 8, 'first_name': 'eugene', 'last_name': 'liyai', 'username': 'liyai',
+             'email': 'other@example.com', 'password': 'secret'}
+        ], batch_size=2, progress=lambda progress: reports.append(dict(progress)))
+
+        self.assertEqual((report['users'], report['bucketlists'], report['items'], report['errors']), (1, 1, 2, 3))
+        self.assertEqual(sorted(error['line'] for error in report['ERRORS']), [6, 7, 8])
+        self.assertEqual(len(reports), 3)
+
+        user = self.TEST_DATA_CONTROLLER.get_by_username('jdoe')
+        self.assertTrue(user.check_user_password('secret'))
+        self.assertEqual([(bucketlist['bucketlist_name'], bucketlist['item_count'], bucketlist['done_count'])
+                          for bucketlist in self.TEST_DATA_CONTROLLER.get_bucketlist_summary(user=user.user_id)],
+                         [('Coast', 2, 1)])
+        results = self.TEST_DATA_CONTROLLER.search_database('dhow', user.user_id)
+        self.assertEqual([bucketlist.bucketlist_name for bucketlist in results], ['Coast'])
+
+    def test_import_reports_lines_which_are_not_utf8(self):
+        report = self.import_lines([b'{"type": "item", "item_name": "caf\xe9", "bucketlist": 1}'])
+        self.assertEqual((report['items'], report['errors']), (0, 1))
+        self.assertEqual(report['ERRORS'], [{'line': 1, 'MESSAGE': 'The line is not valid UTF-8.'}])
+
+    def test_import_into_account(self):
+        report = self.import_lines([
+            {'type': 'user', 'user_id': 7, 'first_name': 'jane', 'last_name': 'doe', 'username': 'jdoe',
+             'email': 'jdoe@example.com', 'password': 'secret'},
+            {'type': 'bucketlist', 'bucketlist_id': 1, 'bucketlist_name': 'Imported', 'date': '2017-04-01'},
+            {'type': 'item', 'item_name': 'Imported item', 'bucketlist': 1}
+        ], owner=self.user.user_id)
+
+        self.assertEqual((report['users'], report['bucketlists'], report['items']), (0, 1, 1))
+        self.assertIsNone(self.TEST_DATA_CONTROLLER.get_by_username('jdoe'))
+        imported = self.TEST_DATA_CONTROLLER.get_bucketlist_by_id(user=self.user.user_id)[-1]
+        self.assertEqual(imported.date.isoformat(), '2017-04-01')
+        self.assertEqual([item.item_name for item in imported.bucketlist_items], ['Imported item'])
+
+    def seeded_rows(self, seed):
+        controller = self.TEST_DATA_CONTROLLER
+        reports = []
+        report = controller.seed_database(3, 2, 4, seed=seed, batch_size=5,
+                                          progress=lambda progress: reports.append(dict(progress)))
+        self.assertEqual((report['users'], report['bucketlists'], report['items']), (3, 6, 24))
+        self.assertEqual(len(reports), 3)
+
+        rows = []
+        for user_id in range(3, 6):
+            rows.extend(controller.export_bucketlists(user=user_id))
+        return rows
+
+    def test_seed_database(self):
+        controller = self.TEST_DATA_CONTROLLER
+        rows = self.seeded_rows(seed=11)
+        self.assertEqual(len(rows), 24)
+        self.assertEqual(controller.repair_item_counts(), 0)
+
+        seeded = controller.get_user_by_id(user_id=3)[0]
+        self.assertTrue(seeded.check_user_password(SEED_PASSWORD))
+        bucketlist, item = rows[0]
+        self.assertEqual(bucketlist['user'], 3)
+        self.assertLessEqual(bucketlist['date'], item['date_created'])
+        self.assertIn(bucketlist['bucketlist_id'],
+                      [found.bucketlist_id for found in controller.search_database(item['item_name'], 3)])
+
+        controller.session.remove()
+        controller.drop_tables()
+        controller.initialize_database()
+        controller.populate_database()
+        self.assertEqual(self.seeded_rows(seed=11), rows)
+        self.assertNotEqual(SeedGenerator(12).bucketlist(1, 1, 4), SeedGenerator(11).bucketlist(1, 1, 4))
+
+    def test_seed_batches_split_the_lists_of_a_user(self):
+        reports = []
+        self.TEST_DATA_CONTROLLER.seed_database(1, 4, 4, batch_size=5,
+                                                progress=lambda progress: reports.append(dict(progress)))
+        self.assertEqual([(report['users'], report['bucketlists'], report['items']) for report in reports],
+                         [(1, 2, 8), (1, 4, 16)])
+
+    def test_seed_batches_users_without_lists(self):
+        reports = []
+        self.TEST_DATA_CONTROLLER.seed_database(5, 0, 0, batch_size=2,
+                                                progress=lambda progress: reports.append(dict(progress)))
+        self.assertEqual([report['users'] for report in reports], [2, 4, 5])
+
+    def test_seed_end_date(self):
+        end_date = date(2020, 1, 1)
+        bucketlist, items = SeedGenerator(11, end_date).bucketlist(1, 1, 20)
+        self.assertLessEqual(end_date - bucketlist['date'], timedelta(days=3 * 365))
+        for item in items:
+            self.assertLessEqual(bucketlist['date'], item['date_created'])
+            self.assertLessEqual(item['date_completed'] or item['date_created'], end_date)
+
+    def query_plans(self, func, *args, **kwargs):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            self.TEST_DATA_CONTROLLER.session.expire_all()
+            result = func(*args, **kwargs)
+            if isinstance(result, types.GeneratorType):
+                list(result)
+        finally:
+            event.remove(self.TEST_DATA_CONTROLLER.db_engine, 'before_cursor_execute', before_cursor_execute)
+
+        connection = self.TEST_DATA_CONTROLLER.db_engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            plans = []
+            for statement, parameters in statements:
+                cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                plans.append((statement, [row[-1] for row in cursor.fetchall()]))
+            return plans
+        finally:
+            connection.close()
+
+    def assert_uses_indexes(self, func, *args, **kwargs):
+        for statement, plan in self.query_plans(func, *args, **kwargs):
+            for detail in plan:
+                if re.search(r'\b(Bucketlist|BucketlistItems)\b', detail):
+                    self.assertTrue(detail.startswith('SEARCH'), '{}\n{}'.format(statement, detail))
+
+    @skipUnless(os.environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI'].startswith('sqlite'), 'SQLite query plans')
+    def test_hot_queries_use_indexes(self):
+        controller = self.TEST_DATA_CONTROLLER
+        user = self.user.user_id
+        bucket_id = controller.get_bucketlist_by_id(user=user)[0].bucketlist_id
+        item_id = controller.get_item_by_id(bucket_id=bucket_id)[0].item_id
+
+        self.assert_uses_indexes(controller.get_bucketlist_by_id, user=user, serialize=True)
+        self.assert_uses_indexes(controller.get_bucketlist_by_id, bucket_id=bucket_id, user=user, serialize=True)
+        self.assert_uses_indexes(controller.get_bucketlist_page, user=user, page_size=1, serialize=True)
+        self.assert_uses_indexes(controller.get_bucketlist_page, user=user, page_size=1, cursor=encode_cursor([1]),
+                                 serialize=True, fieldset=full_fieldset('bucketlists'))
+        self.assert_uses_indexes(controller.get_bucketlist_projection, user=user)
+        self.assert_uses_indexes(controller.get_bucketlist_summary, user=user)
+        self.assert_uses_indexes(controller.get_item_by_id, bucket_id=bucket_id, serialize=True)
+        self.assert_uses_indexes(controller.get_item_page, bucket_id=bucket_id, page_size=1, serialize=True)
+        self.assert_uses_indexes(controller.get_item_projection, bucket_id=bucket_id)
+        self.assert_uses_indexes(controller.get_data_version, item_id=item_id)
+        self.assert_uses_indexes(controller.export_bucketlists, user=user)
+        self.assert_uses_indexes(controller.delete_bucketlist_item, item_id)
+
+    def test_user_projection_matches_serialize(self):
+        controller = self.TEST_DATA_CONTROLLER
+        self.add_bucketlists(2, 2)
+        serialized = controller.get_user_by_id(user_id=self.user.user_id, serialize=True)
+        for bucketlist in serialized[0]['bucketlists']:
+            bucketlist['bucketlist_items'].sort(key=lambda item: item['item_id'])
+        serialized[0]['bucketlists'].sort(key=lambda bucketlist: bucketlist['bucketlist_id'])
+        self.assertEqual(controller.get_user_projection(user_id=self.user.user_id), serialized)
+
+    def test_build_fieldset(self):
+        self.assertIsNone(build_fieldset('users'))
+        fieldset = build_fieldset('users', fields='username,bucketlists.bucketlist_name',
+                                  expand='bucketlists.bucketlist_items')
+        self.assertEqual(fieldset['fields'], ['username'])
+        self.assertEqual(fieldset['expand']['bucketlists']['fields'], ['bucketlist_name'])
+        self.assertEqual(fieldset['expand']['bucketlists']['expand']['bucketlist_items'],
+                         full_fieldset('bucketlist_items'))
+        self.assertEqual(build_fieldset('bucketlists', expand=''), dict(full_fieldset('bucketlists'), expand={}))
+        self.assertRaises(ValueError, build_fieldset, 'users', fields='hash_password')
+        self.assertRaises(ValueError, build_fieldset, 'users', expand='bucketlist_items')
+        self.assertRaises(ValueError, build_fieldset, 'bucketlist_items', fields='bucketlists.bucketlist_name')
+
+    def test_fieldset_selects_only_requested_data(self):
+        controller = self.TEST_DATA_CONTROLLER
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(controller.db_engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            users = controller.get_user_projection(fieldset=build_fieldset('users', fields='username'))
+        finally:
+            event.remove(controller.db_engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(users, [{'username': 'liyai'}, {'username': 'maasai'}])
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('email', statements[0])
+        self.assertNotIn('Bucketlist', statements[0])
+
+    def test_fieldset_page(self):
+        controller = self.TEST_DATA_CONTROLLER
+        self.add_bucketlists(3, 1)
+        fieldset = build_fieldset('bucketlists', fields='bucketlist_name')
+        first = controller.get_bucketlist_page(user=self.user.user_id, page_size=2, serialize=True,
+                                               fieldset=fieldset)
+        second = controller.get_bucketlist_page(user=self.user.user_id, page_size=2, cursor=first['next_cursor'],
+                                                serialize=True, fieldset=fieldset)
+        names = [bucketlist['bucketlist_name'] for bucketlist in first['results'] + second['results']]
+        full = controller.get_bucketlist_projection(user=self.user.user_id)
+        self.assertEqual(names, [bucketlist['bucketlist_name'] for bucketlist in full])
+        self.assertEqual(first['count'], len(full))
+
+    def test_create_in_batch(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucketlist_ids = controller.create_bucketlists(['Safari', 'Road trip'], self.user.user_id)
+        self.assertEqual(len(bucketlist_ids), 2)
+        item_ids = controller.create_bucketlist_items([{'item_name': 'Maasai Mara', 'description': 'Migration'},
+                                                       {'item_name': 'Amboseli'}], bucketlist_ids[0])
+        items = controller.get_item_projection(bucket_id=bucketlist_ids[0])
+        self.assertEqual([item['item_id'] for item in items], item_ids)
+        self.assertEqual(self.search('Migration'), ['Safari'])
+        self.assertEqual(self.search('Road'), ['Road trip'])
+
+    def test_delete_user_cascades(self):
+        controller = self.TEST_DATA_CONTROLLER
+        self.add_bucketlists(3, 4)
+        user_id = self.user.user_id
+        small = self.count_queries(controller.delete_user, controller.get_by_username('maasai').user_id)
+        large = self.count_queries(controller.delete_user, user_id)
+        self.assertEqual(small, large)
+        self.assertEqual(controller.get_bucketlist_projection(user=user_id), [])
+        self.assertEqual(controller.session.execute('SELECT COUNT(*) FROM "BucketlistItems"').scalar(), 0)
+        self.assertEqual(controller.session.execute('SELECT COUNT(*) FROM "BucketlistSearch"').scalar(), 0)
+        self.assertFalse(controller.delete_user(user_id))
+
+    def test_delete_bucketlist_cascades(self):
+        controller = self.TEST_DATA_CONTROLLER
+        bucketlist = controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+        bucket_id = bucketlist.bucketlist_id
+        version = controller.get_data_version(user_id=self.user.user_id)
+        self.assertTrue(controller.delete_bucketlist(bucket_id))
+        self.assertEqual(controller.get_item_projection(bucket_id=bucket_id), [])
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 1)
+        self.assertFalse(controller.delete_bucketlist(bucket_id))
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 1)
+
+    def test_delete_item(self):
+        controller = self.TEST_DATA_CONTROLLER
+        item = controller.get_item_by_id(bucket_id=controller.get_bucketlist_by_id(user=self.user.user_id)[0]
+                                         .bucketlist_id)[0]
+        item_id = item.item_id
+        version = controller.get_data_version(user_id=self.user.user_id)
+        self.assertTrue(controller.delete_bucketlist_item(item_id))
+        self.assertEqual(controller.get_item_projection(item_id=item_id), [])
+        self.assertEqual(controller.get_data_version(user_id=self.user.user_id), version + 1)
+        self.assertFalse(controller.delete_bucketlist_item(item_id))
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor([u'liyia', 1])
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), [u'liyia', 1])
+
+    def test_invalid_cursor(self):
+        self.assertRaises(ValueError, decode_cursor, 'invalid')
+        self.assertRaises(ValueError, decode_cursor, encode_cursor({'id': 1}))
+
+    def test_offset_page(self):
+        bucketlist_id = self.TEST_DATA_CONTROLLER.get_bucketlist_by_id(user=self.user.user_id)[0].bucketlist_id
+        page = self.TEST_DATA_CONTROLLER.get_item_page(bucket_id=bucketlist_id, page=2, page_size=2)
+        self.assertEqual(page['count'], 3)
+        self.assertEqual(page['pages'], 2)
+        self.assertEqual(len(page['results']), 1)
+        self.assertIsNone(page['next_cursor'])
+
+    def test_page_beyond_last_page(self):
+        page = self.TEST_DATA_CONTROLLER.get_user_page(page=5, page_size=2)
+        self.assertEqual(page['results'], [])
+        self.assertEqual(page['count'], 2)
+
+    def test_keyset_pages_cover_all_rows(self):
+        seen = []
+        cursor = None
+        while True:
+            page = self.TEST_DATA_CONTROLLER.get_user_page(page_size=1, cursor=cursor, serialize=True)
+            seen.extend(user['username'] for user in page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, ['liyai', 'maasai'])
+
+    def test_page_size_is_capped(self):
+        for index in range(MAX_PAGE_SIZE + 1):
+            self.TEST_DATA_CONTROLLER.create_bucketlist('list {}'.format(index), self.user.user_id)
+        page = self.TEST_DATA_CONTROLLER.get_bucketlist_page(user=self.user.user_id, page_size=MAX_PAGE_SIZE * 2)
+        self.assertEqual(len(page['results']), MAX_PAGE_SIZE)
+        self.assertIsNotNone(page['next_cursor'])
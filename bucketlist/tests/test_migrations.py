@@ -0,0 +1,67 @@
+"""
+File      : test_migrations.py
+Date      : October, 2026
+Author    : agent
+Desc      : migrations test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+from unittest import TestCase
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from bucketlist.models.db_model import Model
+from bucketlist.models.users import Users
+from bucketlist.models.bucketlist import Bucketlist
+from bucketlist.models.bucketlist_items import BucketlistItems
+from bucketlist.models.search_index import SEARCH_TABLE
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # the search index is created outside the models
+    return not (type_ == 'table' and name.startswith(SEARCH_TABLE))
+
+
+class MigrationsTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.database_uri = 'sqlite:///{}'.format(os.path.join(self.directory, 'migrated.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def upgrade(self):
+        # the migration environment configures logging, it runs in its own interpreter
+        environ = dict(os.environ)
+        environ['BUCKETLIST_ENV'] = 'development'
+        environ['BUCKETLIST_SQLALCHEMY_DATABASE_URI'] = self.database_uri
+        environ['TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI'] = self.database_uri
+        subprocess.check_output([sys.executable, 'manage.py', 'db', 'upgrade'], env=environ,
+                                cwd=ROOT_DIRECTORY, stderr=subprocess.STDOUT)
+
+    def test_migrations_build_the_schema_of_the_models(self):
+        self.upgrade()
+        db_engine = create_engine(self.database_uri)
+        try:
+            with db_engine.connect() as connection:
+                context = MigrationContext.configure(connection, opts={'include_object': include_object})
+                changes = compare_metadata(context, Model.metadata)
+                tables = set(db_engine.table_names())
+        finally:
+            db_engine.dispose()
+        # a schema change of the models without its migration revision shows up here
+        self.assertEqual(changes, [])
+        self.assertIn(SEARCH_TABLE, tables)
@@ -0,0 +1,83 @@
+"""
+File      : test_password_hasher.py
+Date      : October, 2026
+Author    : agent
+Desc      : password hasher test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import time
+
+from unittest import TestCase
+
+from bucketlist.controllers.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+class PasswordHasherTest(TestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(processes=0, method='pbkdf2:sha256:1000')
+
+    def test_hash_and_verify(self):
+        password_hash = self.hasher.hash('password')
+        self.assertTrue(password_hash.startswith('pbkdf2:sha256:1000$'))
+        self.assertTrue(self.hasher.verify(password_hash, 'password'))
+        self.assertFalse(self.hasher.verify(password_hash, 'wrong'))
+        self.assertFalse(self.hasher.verify(None, 'password'))
+
+    def test_hash_on_worker_process(self):
+        hasher = PasswordHasher(processes=1, method='pbkdf2:sha256:1000')
+        try:
+            password_hash = hasher.hash('password')
+            self.assertTrue(hasher.verify(password_hash, 'password'))
+            self.assertEqual(hasher.stats()['completed'], 2)
+        finally:
+            hasher.close()
+
+    def test_hash_on_executor(self):
+        calls = []
+
+        def executor(func, args):
+            calls.append(func)
+            return func(*args)
+
+        hasher = PasswordHasher(processes=1, method='pbkdf2:sha256:1000', executor=executor)
+        self.assertTrue(hasher.verify(hasher.hash('password'), 'password'))
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(hasher.pool)
+
+    def test_needs_rehash(self):
+        old_hasher = PasswordHasher(processes=0, method='pbkdf2:sha256:500')
+        self.assertTrue(self.hasher.needs_rehash(old_hasher.hash('password')))
+        self.assertFalse(self.hasher.needs_rehash(self.hasher.hash('password')))
+
+    def test_full_queue_is_rejected(self):
+        hasher = PasswordHasher(processes=0, max_pending=1, timeout=0.05)
+        hasher.pending = 1
+        self.assertRaises(PasswordHasherBusy, hasher.hash, 'password')
+        self.assertEqual(hasher.stats()['rejected'], 1)
+
+    def test_slow_hash_keeps_its_slot(self):
+        hasher = PasswordHasher(processes=1, max_pending=1, timeout=0.2, method='pbkdf2:sha256:1000')
+        try:
+            self.assertRaises(PasswordHasherBusy, hasher.run, time.sleep, 1)
+            self.assertEqual(hasher.stats()['timed_out'], 1)
+            # the abandoned task still runs, so the queue stays full until it finishes
+            self.assertEqual(hasher.stats()['pending'], 1)
+            self.assertRaises(PasswordHasherBusy, hasher.hash, 'password')
+
+            time.sleep(1)
+            self.assertEqual(hasher.stats()['pending'], 0)
+            self.assertTrue(hasher.verify(hasher.hash('password'), 'password'))
+        finally:
+            hasher.close()
+
+    def test_error_on_worker_process_frees_its_slot(self):
+        hasher = PasswordHasher(processes=1, max_pending=1)
+        try:
+            self.assertRaises(TypeError, hasher.verify, 'pbkdf2:sha256:1000$salt$hash', None)
+            self.assertEqual(hasher.stats()['pending'], 0)
+        finally:
+            hasher.close()
@@ -0,0 +1,127 @@
+"""
+File      : test_prefork_server.py
+Date      : October, 2026
+Author    : agent
+Desc      : pre-fork server test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import signal
+import tempfile
+import threading
+import subprocess
+
+from unittest import TestCase, skipUnless
+
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+from bucketlist.prefork_server import PreforkServer, listening_socket, resident_memory
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# serves the application, with a slow route, on port 0 and the options given as arguments
+SERVER_SCRIPT = """
+import sys
+import time
+
+from bucketlist.app import create_app
+from bucketlist.prefork_server import serve
+
+app = create_app()
+app.add_url_rule('/slow', 'slow', lambda: time.sleep(1) or 'done')
+workers, threads, max_requests, max_memory = [int(argument) for argument in sys.argv[1:]]
+serve(app, '127.0.0.1', 0, workers, threads, max_requests=max_requests, max_memory=max_memory, graceful_timeout=5)
+"""
+
+
+@skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+class PreforkServerTest(TestCase):
+
+    def setUp(self):
+        self.metrics_directory = tempfile.mkdtemp()
+        self.environ = dict(os.environ, BUCKETLIST_METRICS_DIR=self.metrics_directory, BUCKETLIST_ENV='production')
+        self.process = None
+
+    def tearDown(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        shutil.rmtree(self.metrics_directory)
+
+    def start(self, workers=2, threads=2, max_requests=0, max_memory=0):
+        arguments = [str(value) for value in (workers, threads, max_requests, max_memory)]
+        self.process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT] + arguments, env=self.environ,
+                                        cwd=ROOT_DIRECTORY, stdout=subprocess.PIPE, stderr=open(os.devnull, 'w'))
+        line = self.process.stdout.readline().decode('utf-8')
+        self.url = re.search(r'http://\S+', line).group(0)
+
+    def get(self, path):
+        response = urlopen(self.url + path, timeout=10)
+        return response.getcode(), response.read()
+
+    def retired(self, count):
+        # the master folds the metrics of a worker into the retired file once it has reaped it
+        path = os.path.join(self.metrics_directory, 'metrics_retired.json')
+        deadline = time.time() + 5
+        while True:
+            retired = {'processes': 0, 'requests': []}
+            if os.path.exists(path):
+                with open(path) as metrics_file:
+                    retired = json.load(metrics_file)
+            if retired['processes'] >= count or time.time() > deadline:
+                return retired
+
+            time.sleep(0.1)
+
+    @staticmethod
+    def requests(retired, endpoint):
+        return sum(count for name, _, _, count in retired['requests'] if name == endpoint)
+
+    def test_workers_are_recycled_after_max_requests(self):
+        self.start(workers=2, max_requests=2)
+        statuses = [self.get('/api/v1/')[0] for _ in range(8)]
+        self.assertEqual(statuses, [200] * 8)
+
+        # the four workers which served two requests each are folded into one file
+        retired = self.retired(4)
+        self.assertEqual(retired['processes'], 4)
+        self.assertEqual(self.requests(retired, 'list_app_routes'), 8)
+        self.assertLessEqual(len(os.listdir(self.metrics_directory)), 3)
+
+    def test_workers_are_recycled_above_max_memory(self):
+        self.start(workers=1, threads=1, max_memory=1)
+        statuses = [self.get('/api/v1/')[0] for _ in range(3)]
+        self.assertEqual(statuses, [200] * 3)
+        retired = self.retired(3)
+        self.assertEqual(retired['processes'], 3)
+        self.assertEqual(self.requests(retired, 'list_app_routes'), 3)
+
+    def test_sigterm_drains_requests_in_flight(self):
+        self.start(workers=1)
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(self.get('/slow')))
+        thread.start()
+        time.sleep(0.5)
+        self.process.send_signal(signal.SIGTERM)
+        thread.join(10)
+        self.assertEqual(self.process.wait(), 0)
+        self.assertEqual(responses, [(200, b'done')])
+        self.assertRaises(IOError, self.get, '/api/v1/')
+
+    def test_invalid_parameters(self):
+        listener = listening_socket('127.0.0.1', 0)
+        self.addCleanup(listener.close)
+        self.assertRaises(ValueError, PreforkServer, None, listener, workers=0)
+        self.assertRaises(ValueError, PreforkServer, None, listener, threads=0)
+        self.assertGreater(resident_memory(), 0)
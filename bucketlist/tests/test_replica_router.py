@@ -0,0 +1,157 @@
+"""
+File      : test_replica_router.py
+Date      : October, 2026
+Author    : agent
+Desc      : read replica routing test file, SQLite files stand in for the primary and its replicas
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+
+from unittest import TestCase
+
+from flask import Flask
+from sqlalchemy import event
+
+from bucketlist.controllers.database_controller import DatabaseController
+from bucketlist.controllers.replica_router import ReadYourWrites, WRITTEN_COOKIE, WRITTEN_HEADER
+
+
+class ReplicaRouterTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.primary = os.path.join(self.directory, 'primary.db')
+        primary_controller = DatabaseController('sqlite:///' + self.primary)
+        primary_controller.initialize_database()
+        primary_controller.populate_database()
+        self.user_id = primary_controller.get_by_username('liyai').user_id
+        primary_controller.session.remove()
+        primary_controller.db_engine.dispose()
+
+        # each replica is a copy of the primary whose user is renamed after it
+        self.replicas = []
+        for name in ('replica_1', 'replica_2'):
+            path = os.path.join(self.directory, name + '.db')
+            shutil.copy(self.primary, path)
+            self.execute(path, 'UPDATE "Users" SET first_name = ? WHERE user_id = ?', name, self.user_id)
+            self.replicas.append(path)
+
+        self.read_your_writes = ReadYourWrites(sticky_seconds=5)
+        self.controllers = []
+        self.controller = self.replica_controller(self.replicas)
+
+    def tearDown(self):
+        self.controller.session.remove()
+        # a health check running as the files are removed would create them again
+        for controller in self.controllers:
+            controller.replica_router.stop()
+        shutil.rmtree(self.directory)
+
+    def replica_controller(self, replicas):
+        controller = DatabaseController('sqlite:///' + self.primary,
+                                        replicas=['sqlite:///' + path for path in replicas],
+                                        read_your_writes=self.read_your_writes)
+        # the reads wait for the first health checks of the background thread, the next ones are seconds away
+        controller.start_engine()
+        controller.replica_router.start_checker()
+        deadline = time.time() + 5
+        while any(replica.healthy is None for replica in controller.replica_router.replicas):
+            self.assertLess(time.time(), deadline)
+            time.sleep(0.01)
+        self.controllers.append(controller)
+        return controller
+
+    @staticmethod
+    def execute(path, statement, *parameters):
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                return connection.execute(statement, parameters).fetchall()
+        finally:
+            connection.close()
+
+    def read_first_name(self):
+        first_name = self.controller.get_user_by_id(user_id=self.user_id)[0].first_name
+        self.controller.session.remove()
+        return first_name
+
+    def test_reads_go_to_the_replicas_in_turn(self):
+        self.assertEqual([self.read_first_name() for _ in range(4)],
+                         ['replica_1', 'replica_2', 'replica_1', 'replica_2'])
+
+    def test_writes_go_to_the_primary(self):
+        self.controller.create_bucketlist('Primary only', self.user_id)
+        statement = 'SELECT count(*) FROM "Bucketlist" WHERE bucketlist_name = ?'
+        self.assertEqual(self.execute(self.primary, statement, 'Primary only'), [(1,)])
+        for replica in self.replicas:
+            self.assertEqual(self.execute(replica, statement, 'Primary only'), [(0,)])
+
+    def test_client_reads_its_own_writes(self):
+        app = Flask('replica_router_test')
+        self.read_your_writes.init_app(app)
+        self.controller.init_app(app)
+
+        @app.route('/bucketlists', methods=['POST'])
+        def create():
+            self.controller.create_bucketlist('Primary only', self.user_id)
+            summary = self.controller.get_bucketlist_summary(self.user_id)
+            return ','.join(bucketlist['bucketlist_name'] for bucketlist in summary)
+
+        @app.route('/first_name')
+        def first_name():
+            return self.read_first_name()
+
+        client = app.test_client()
+        response = client.post('/bucketlists')
+        self.assertIn(b'Primary only', response.data)
+        written = float(response.headers[WRITTEN_HEADER])
+        self.assertIn(WRITTEN_COOKIE, response.headers['Set-Cookie'])
+
+        # the cookie, or the header, brings the write back to any process serving the client
+        self.assertEqual(client.get('/first_name').data, b'eugene')
+        headers = {WRITTEN_HEADER: str(written)}
+        self.assertEqual(app.test_client().get('/first_name', headers=headers).data, b'eugene')
+
+        # another client, and the same client once the write is old enough, reads from the replicas
+        self.assertTrue(app.test_client().get('/first_name').data.startswith(b'replica_'))
+        headers = {WRITTEN_HEADER: str(written - self.read_your_writes.sticky_seconds)}
+        self.assertTrue(app.test_client().get('/first_name', headers=headers).data.startswith(b'replica_'))
+
+        # a time of write in the future would keep the client on the primary for good
+        headers = {WRITTEN_HEADER: str(written + 3600)}
+        self.assertTrue(app.test_client().get('/first_name', headers=headers).data.startswith(b'replica_'))
+
+    def test_transaction_with_changes_reads_the_primary(self):
+        user = self.controller.get_by_username('liyai')
+        user.first_name = 'changed'
+        self.assertEqual(self.controller.get_user_by_id(user_id=self.user_id)[0].first_name, 'changed')
+
+    def test_unreachable_replica_is_skipped(self):
+        self.controller = self.replica_controller([os.path.join(self.directory, 'missing', 'replica.db'),
+                                                   self.replicas[0]])
+        self.assertEqual([self.read_first_name() for _ in range(3)], ['replica_1'] * 3)
+
+    def test_failed_read_runs_again_on_the_primary(self):
+        # the replica answers its health check but has no tables, its connection works and it is kept
+        empty_replica = os.path.join(self.directory, 'empty.db')
+        self.execute(empty_replica, 'SELECT 1')
+        self.controller = self.replica_controller([empty_replica, self.replicas[0]])
+        self.assertEqual([self.read_first_name() for _ in range(3)], ['eugene', 'replica_1', 'eugene'])
+        self.assertTrue(self.controller.replica_router.replicas[0].healthy)
+
+    def test_replica_which_lost_its_connection_is_skipped(self):
+        replica = self.controller.replica_router.replicas[0]
+
+        # the replica's connections are closed under SQLAlchemy, which sees a disconnect
+        def close(dbapi_connection, connection_record):
+            dbapi_connection.close()
+        event.listen(replica.db_engine, 'connect', close)
+        self.assertEqual([self.read_first_name() for _ in range(3)], ['eugene', 'replica_2', 'replica_2'])
+        self.assertFalse(replica.healthy)
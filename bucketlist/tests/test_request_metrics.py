@@ -0,0 +1,149 @@
+"""
+File      : test_request_metrics.py
+Date      : October, 2026
+Author    : agent
+Desc      : request metrics test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+
+from unittest import TestCase
+
+from flask import Flask, Response, jsonify, stream_with_context
+
+from bucketlist.controllers.database_controller import DatabaseController
+from bucketlist.controllers.request_metrics import RequestMetrics
+
+
+# counts requests to a metrics directory, given as argument, and exits before the write interval has passed
+EXITING_SCRIPT = """
+import sys
+
+from flask import Flask
+
+from bucketlist.controllers.request_metrics import RequestMetrics
+
+metrics = RequestMetrics(directory=sys.argv[1], write_interval=60)
+app = Flask('exiting_process')
+metrics.init_app(app)
+app.add_url_rule('/', 'index', lambda: 'index')
+client = app.test_client()
+for _ in range(5):
+    client.get('/')
+"""
+
+
+def serve_requests(metrics, client, count):
+    for _ in range(count):
+        client.get('/users')
+
+
+class RequestMetricsTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.metrics = RequestMetrics()
+        self.app = self.create_app(self.metrics)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_app(self, metrics):
+        app = Flask('request_metrics_test')
+        app.config['PROPAGATE_EXCEPTIONS'] = False
+        metrics.init_app(app)
+        controller = DatabaseController('sqlite://', metrics=metrics)
+        controller.init_app(app)
+
+        @app.route('/users')
+        def users():
+            controller.session.execute('SELECT 1')
+            controller.session.execute('SELECT 2')
+            return jsonify({'users': ['liyai', 'maasai']})
+
+        @app.route('/export')
+        def export():
+            def lines():
+                for number in range(3):
+                    controller.session.execute('SELECT 1')
+                    yield '{}\n'.format(number)
+            return Response(stream_with_context(lines()))
+
+        @app.route('/fail')
+        def fail():
+            raise RuntimeError('request failed')
+
+        return app
+
+    def test_request_counters(self):
+        response = self.client.get('/users')
+        counters = self.metrics.snapshot()['endpoints']['users']
+        self.assertEqual((counters['count'], counters['queries'], counters['bytes']), (1, 2, len(response.data)))
+        self.assertGreater(counters['db_seconds'], 0)
+        self.assertGreater(counters['serialization_seconds'], 0)
+        self.assertEqual(counters['buckets'][-1], 1)
+
+    def test_streamed_response_is_counted_once_sent(self):
+        # a buffered test client closes the response, as a WSGI server does once it has sent it
+        response = self.client.get('/export', buffered=True)
+        self.assertEqual(response.data, b'0\n1\n2\n')
+        counters = self.metrics.snapshot()['endpoints']['export']
+        self.assertEqual((counters['count'], counters['queries'], counters['bytes']), (1, 3, 6))
+
+    def test_failed_and_unmatched_requests(self):
+        self.client.get('/fail', buffered=True)
+        self.client.get('/missing', buffered=True)
+        self.assertEqual(sorted(self.metrics.snapshot()['requests']),
+                         [['fail', 'GET', 500, 1], ['unmatched', 'GET', 404, 1]])
+
+    def test_prometheus_text(self):
+        self.client.get('/users')
+        self.client.get('/users')
+        text = self.metrics.render()
+        self.assertIn('bucketlist_requests_total{endpoint="users",method="GET",status="200"} 2\n', text)
+        self.assertIn('bucketlist_request_duration_seconds_bucket{endpoint="users",le="+Inf"} 2\n', text)
+        self.assertIn('bucketlist_request_duration_seconds_count{endpoint="users"} 2\n', text)
+        self.assertIn('bucketlist_request_queries_total{endpoint="users"} 4\n', text)
+        self.assertIn('# TYPE bucketlist_response_bytes_total counter\n', text)
+
+    def test_processes_add_up(self):
+        metrics = RequestMetrics(directory=self.directory, write_interval=60)
+        client = self.create_app(metrics).test_client()
+        client.get('/users')
+
+        workers = [multiprocessing.Process(target=serve_requests, args=(metrics, client, count)) for count in (2, 3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # the workers exit before their write interval, their last requests are written as they exit
+        self.assertEqual(len(os.listdir(self.directory)), 3)
+        self.assertIn('bucketlist_request_duration_seconds_count{endpoint="users"} 6\n', metrics.render())
+        self.assertEqual(metrics.snapshot()['endpoints']['users']['count'], 1)
+
+        # the files of the exited workers are folded into one, their requests stay in the totals
+        metrics.retire([worker.pid for worker in workers])
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertIn('bucketlist_request_duration_seconds_count{endpoint="users"} 6\n', metrics.render())
+
+        metrics.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_exiting_process_writes_its_last_requests(self):
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        subprocess.check_call([sys.executable, '-c', EXITING_SCRIPT, self.directory], cwd=root)
+        names = os.listdir(self.directory)
+        self.assertEqual(len(names), 1)
+        with open(os.path.join(self.directory, names[0])) as metrics_file:
+            self.assertEqual(json.load(metrics_file)['endpoints']['index']['count'], 5)
@@ -0,0 +1,71 @@
+"""
+File      : test_response_cache.py
+Date      : October, 2026
+Author    : agent
+Desc      : response cache test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import time
+
+from unittest import TestCase
+
+from bucketlist.controllers.response_cache import MemoryCache
+
+
+class MemoryCacheTest(TestCase):
+
+    def setUp(self):
+        self.cache = MemoryCache(max_entries=2, ttl=60)
+
+    def test_hit_and_miss(self):
+        self.assertIsNone(self.cache.get('1:/api/v1/bucketlists/'))
+        self.assertTrue(self.cache.set('1:/api/v1/bucketlists/', 'body', 1))
+        self.assertEqual(self.cache.get('1:/api/v1/bucketlists/'), 'body')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 'a', 1)
+        self.cache.set('b', 'b', 1)
+        self.cache.get('a')
+        self.cache.set('c', 'c', 2)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 'a')
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_entries_expire(self):
+        cache = MemoryCache(ttl=0.01)
+        cache.set('a', 'a', 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalidate_only_drops_the_namespace(self):
+        self.cache.set('a', 'a', 1)
+        self.cache.set('b', 'b', 2)
+        self.cache.invalidate(1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), 'b')
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+    def test_value_read_before_invalidation_is_not_stored(self):
+        generation = self.cache.generation(1)
+        self.cache.invalidate(1)
+        self.assertFalse(self.cache.set('a', 'stale', 1, generation))
+        self.assertTrue(self.cache.set('a', 'fresh', 1, self.cache.generation(1)))
+
+    def test_generations_are_bounded(self):
+        generation = self.cache.generation(1)
+        for namespace in range(1, 5):
+            self.cache.invalidate(namespace)
+        self.assertEqual(len(self.cache.generations), 2)
+        # the forgotten invalidation of namespace 1 still keeps the value read before it out
+        self.assertFalse(self.cache.set('a', 'stale', 1, generation))
+        self.assertTrue(self.cache.set('a', 'fresh', 1, self.cache.generation(1)))
+
+    def test_disabled_cache(self):
+        cache = MemoryCache(max_entries=0)
+        self.assertFalse(cache.set('a', 'a', 1))
+        self.assertIsNone(cache.get('a'))
@@ -0,0 +1,109 @@
+"""
+File      : test_slow_query_log.py
+Date      : October, 2026
+Author    : agent
+Desc      : slow query log test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import json
+import time
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from flask import Flask, jsonify
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from bucketlist.controllers.database_controller import DatabaseController
+from bucketlist.controllers.slow_query_log import SlowQueryLog, redact, can_analyze, explain_prefix
+
+
+class SlowQueryLogTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'slow_queries.log')
+        # every statement takes longer than a microsecond
+        self.slow_query_log = SlowQueryLog(threshold=0.001, path=self.path, max_per_minute=1000)
+        self.controller = DatabaseController('sqlite:///' + os.path.join(self.directory, 'bucketlist.db'),
+                                             slow_query_log=self.slow_query_log)
+        self.controller.initialize_database()
+        self.controller.populate_database()
+
+    def tearDown(self):
+        self.controller.session.remove()
+        self.slow_query_log.close()
+        shutil.rmtree(self.directory)
+
+    def entries(self):
+        self.slow_query_log.join()
+        with open(self.path) as log_file:
+            return [json.loads(line) for line in log_file]
+
+    def test_slow_statement_is_logged_with_plan(self):
+        self.controller.get_by_username('liyai')
+        entry = [entry for entry in self.entries() if entry['method'] == 'get_by_username'][-1]
+        self.assertIn('FROM "Users"', entry['statement'])
+        self.assertTrue(entry['parameters'][0].endswith(' len=5>'))
+        self.assertIn('Users', ' '.join(str(row[-1]) for row in entry['plan']))
+        self.assertGreater(entry['duration_ms'], 0)
+
+    def test_route_of_the_request(self):
+        app = Flask('slow_query_log_test')
+        self.controller.init_app(app)
+
+        @app.route('/users/<username>')
+        def user(username):
+            return jsonify({'user_id': self.controller.get_by_username(username).user_id})
+
+        self.assertEqual(app.test_client().get('/users/maasai').status_code, 200)
+        entry = [entry for entry in self.entries() if entry['method'] == 'get_by_username'][-1]
+        self.assertEqual((entry['endpoint'], entry['route'], entry['http_method']),
+                         ('user', '/users/<username>', 'GET'))
+
+    def test_plan_does_not_wait_for_a_pooled_connection(self):
+        db_engine = create_engine(self.controller.db_engine.url, poolclass=QueuePool, pool_size=1, max_overflow=0,
+                                  pool_timeout=5)
+        connection = db_engine.connect()
+        try:
+            started = time.time()
+            self.slow_query_log.slow_statement('SELECT * FROM "Users"', (), 1.0, db_engine=db_engine)
+            self.assertLess(time.time() - started, 1)
+            entry = self.entries()[-1]
+        finally:
+            connection.close()
+        self.assertIn('Users', ' '.join(str(row[-1]) for row in entry['plan']))
+
+    def test_entries_are_limited_and_sampled(self):
+        slow_query_log = SlowQueryLog(threshold=1, max_per_minute=2)
+        slow_query_log.explain = lambda statement, parameters, db_engine: []
+        entries = [slow_query_log.slow_statement('SELECT 1', (), 0.5) for _ in range(5)]
+        self.assertEqual([entry is not None for entry in entries], [True, True, False, False, False])
+
+        slow_query_log.window -= 1
+        self.assertEqual(slow_query_log.slow_statement('SELECT 1', (), 0.5)['skipped'], 3)
+
+        slow_query_log = SlowQueryLog(threshold=1, sample_rate=0)
+        self.assertIsNone(slow_query_log.slow_statement('SELECT 1', (), 0.5))
+
+    def test_only_plain_selects_are_analyzed(self):
+        self.assertTrue(can_analyze('SELECT "Users".user_id FROM "Users" WHERE "Users".username = %(username)s'))
+        for statement in ('SELECT "BucketlistItems".item_id FROM "BucketlistItems" WHERE item_id = %(id)s '
+                          'FOR UPDATE',
+                          'SELECT * FROM "Bucketlist" FOR NO KEY UPDATE',
+                          'SELECT * FROM "Bucketlist" FOR SHARE',
+                          'SELECT setval(\'"Users_user_id_seq"\', (SELECT max(user_id) FROM "Users"))',
+                          'UPDATE "Users" SET first_name = %(first_name)s'):
+            self.assertFalse(can_analyze(statement), statement)
+            self.assertEqual(explain_prefix('postgresql', can_analyze(statement)), 'EXPLAIN ')
+
+    def test_redact(self):
+        self.assertEqual(redact({'user_id': 1, 'email': 'liyai@mail.com', 'done': None}),
+                         {'user_id': 1, 'email': '<str len=14>', 'done': None})
+        self.assertEqual(redact([2, 'secret']), [2, '<str len=6>'])
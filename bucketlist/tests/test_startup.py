@@ -0,0 +1,91 @@
+"""
+File      : test_startup.py
+Date      : October, 2026
+Author    : agent
+Desc      : startup time test file
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+import os
+import sys
+import json
+import subprocess
+
+from unittest import TestCase
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# seconds each step of a cold start may take, generous so that a slow machine does not fail the suite
+IMPORT_BUDGET = 5.0
+CREATE_APP_BUDGET = 2.0
+FIRST_REQUEST_BUDGET = 2.0
+FIRST_DATABASE_REQUEST_BUDGET = 5.0
+
+# runs in a fresh interpreter, every module is imported cold, and prints the timings as its last line
+STARTUP_SCRIPT = """
+import json
+import time
+
+started = time.time()
+from bucketlist.app import create_app
+from bucketlist.controllers.controller import EXTENSION_KEY
+imported = time.time()
+app = create_app()
+created = time.time()
+data_controller = app.extensions[EXTENSION_KEY]['data_controller']
+engine_after_create = data_controller._db_engine is not None
+
+client = app.test_client()
+status = client.get('/api/v1/').status_code
+first_request = time.time()
+engine_after_first_request = data_controller._db_engine is not None
+
+login = client.post('/auth/login/', data=json.dumps({'username': 'liyai', 'password': 'password'}))
+first_database_request = time.time()
+
+print(json.dumps({
+    'import': imported - started,
+    'create_app': created - imported,
+    'first_request': first_request - created,
+    'first_database_request': first_database_request - first_request,
+    'engine_after_create': engine_after_create,
+    'engine_after_first_request': engine_after_first_request,
+    'status': status,
+    'login_status': login.status_code
+}))
+"""
+
+
+def measure_startup(environ):
+    """
+    :param environ: environment of the interpreter
+    :return: timings of the cold start, in seconds
+    """
+    output = subprocess.check_output([sys.executable, '-c', STARTUP_SCRIPT], env=environ,
+                                     cwd=ROOT_DIRECTORY)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+class StartupTest(TestCase):
+
+    def setUp(self):
+        # the test database is not needed to start the application
+        self.environ = dict(os.environ)
+        self.environ.pop('TEST_BUCKETLIST_SQLALCHEMY_DATABASE_URI', None)
+        self.environ['BUCKETLIST_ENV'] = 'development'
+
+    def test_startup_time(self):
+        timings = measure_startup(self.environ)
+        print('=> Startup timings {}'.format(timings))
+        self.assertEqual((timings['status'], timings['login_status']), (200, 200))
+        self.assertLess(timings['import'], IMPORT_BUDGET)
+        self.assertLess(timings['create_app'], CREATE_APP_BUDGET)
+        self.assertLess(timings['first_request'], FIRST_REQUEST_BUDGET)
+        self.assertLess(timings['first_database_request'], FIRST_DATABASE_REQUEST_BUDGET)
+
+    def test_engine_is_created_by_the_first_statement(self):
+        timings = measure_startup(self.environ)
+        self.assertFalse(timings['engine_after_create'])
+        self.assertFalse(timings['engine_after_first_request'])
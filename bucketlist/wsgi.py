@@ -0,0 +1,13 @@
+"""
+File      : wsgi.py
+Date      : October, 2026
+Author    : agent
+Desc      : The application served by WSGI servers, e.g. gunicorn bucketlist.wsgi:app
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+from bucketlist.app import create_app
+
+app = create_app()
@@ -8,14 +8,34 @@
 # ============================================================================
 # necessary imports
 # ============================================================================
-from flask_script import Manager
+from datetime import datetime
+
+from flask_script import Manager, Command
 from flask_migrate import Migrate, MigrateCommand
 
-from bucketlist.app import app
+from flask import current_app
+
+from bucketlist.app import create_app
+from bucketlist import prefork_server
 from bucketlist.init_test_db import *
+from bucketlist.models.db_model import Model
+
+# flask_migrate only reads the metadata of the db object, which the declarative base provides
+migrate = Migrate(db=Model)
+
+
+def create_manage_app(config=None):
+    """
+    Creates the application a command runs in, only when a command runs
+    """
+    app = create_app(config)
+    migrate.init_app(app, Model)
+    return app
+
 
-migrate = Migrate(app)
-manager = Manager(app)
+manager = Manager(create_manage_app)
+manager.add_option('-c', '--config', dest='config', required=False,
+                   help='configuration name: development, testing or production')
 
 manager.add_command('db', MigrateCommand)
 
@@ -36,6 +56,77 @@ def dropdb():
     print('Dropped the database')
 
 
+@manager.command
+def reindex():
+    rebuild_search_index()
+    print('Search index rebuilt')
+
+
+@manager.command
+def repair_counts():
+    print('{} bucketlist item counts repaired'.format(repair_item_counts()))
+
+
+def import_data(path, user=None, batch_size=None):
+    """
+    Imports users, bucketlists and items from an NDJSON file, - reads standard input
+    """
+    def progress(report):
+        print('{lines} lines, {users} users, {bucketlists} bucketlists, {items} items, {errors} errors, '
+              '{records_per_second} records/s'.format(**report))
+
+    batch_size = int(batch_size or current_app.config['IMPORT_BATCH_SIZE'])
+    report = import_file(path, username=user, batch_size=batch_size, progress=progress)
+    for error in report['ERRORS']:
+        print('line {line}: {MESSAGE}'.format(**error))
+    print('Imported {users} users, {bucketlists} bucketlists and {items} items in {seconds} seconds'.format(**report))
+
+
+# import is a python keyword, the command is registered under it by name
+manager.add_command('import', Command(import_data))
+
+
+@manager.option('--users', dest='users', type=int, default=100)
+@manager.option('--lists-per-user', dest='lists_per_user', type=int, default=5)
+@manager.option('--items-per-list', dest='items_per_list', type=int, default=10)
+@manager.option('--seed', dest='random_seed', type=int, default=0)
+@manager.option('--no-index', dest='index', action='store_false', default=True)
+@manager.option('--end-date', dest='end_date', default=None, help='latest date of the data, YYYY-MM-DD')
+def seed(users, lists_per_user, items_per_list, random_seed, index, end_date):
+    """
+    Adds generated users, bucketlists and items, the same seed gives the same data
+    """
+    def progress(report):
+        print('{users} users, {bucketlists} bucketlists, {items} items, {rows_per_second} rows/s'.format(**report))
+
+    if end_date:
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    report = seed_database(users, lists_per_user, items_per_list, seed=random_seed, index=index, progress=progress,
+                           end_date=end_date)
+    print('Seeded {users} users, {bucketlists} bucketlists and {items} items in {seconds} seconds'.format(**report))
+    if not index:
+        print('Run reindex to add them to the search index')
+
+
+@manager.option('--host', dest='host', default=prefork_server.DEFAULT_HOST)
+@manager.option('--port', dest='port', type=int, default=prefork_server.DEFAULT_PORT)
+@manager.option('--workers', dest='workers', type=int, default=prefork_server.DEFAULT_WORKERS)
+@manager.option('--threads', dest='threads', type=int, default=prefork_server.DEFAULT_THREADS)
+@manager.option('--max-requests', dest='max_requests', type=int, default=0,
+                help='requests served by a worker before it is replaced')
+@manager.option('--max-memory', dest='max_memory', type=int, default=0,
+                help='megabytes of memory above which a worker is replaced')
+@manager.option('--graceful-timeout', dest='graceful_timeout', type=float,
+                default=prefork_server.DEFAULT_GRACEFUL_TIMEOUT,
+                help='seconds a stopping worker is given to finish its requests')
+def serve(host, port, workers, threads, max_requests, max_memory, graceful_timeout):
+    """
+    Serves the api on pre-forked worker processes sharing one socket, SIGTERM drains them
+    """
+    prefork_server.serve(current_app._get_current_object(), host, port, workers, threads,
+                         max_requests=max_requests, max_memory=max_memory, graceful_timeout=graceful_timeout)
+
+
 @manager.command
 def init_test_db():
     initialize_test_database()
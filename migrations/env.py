@@ -0,0 +1,98 @@
+"""
+File      : env.py
+Date      : October, 2026
+Author    : agent
+Desc      : Alembic environment of the bucketlist database, used by the flask_migrate db commands
+"""
+
+# ============================================================================
+# necessary imports
+# ============================================================================
+from __future__ import with_statement
+
+import logging
+from logging.config import fileConfig
+
+from alembic import context
+from flask import current_app
+from sqlalchemy import engine_from_config, pool
+
+from bucketlist.models.db_model import Model
+from bucketlist.models.users import Users
+from bucketlist.models.bucketlist import Bucketlist
+from bucketlist.models.bucketlist_items import BucketlistItems
+from bucketlist.models.search_index import SEARCH_TABLE
+
+config = context.config
+
+fileConfig(config.config_file_name)
+logger = logging.getLogger('alembic.env')
+
+# the application does not use Flask-SQLAlchemy, the metadata comes from the declarative base of the models
+config.set_main_option('sqlalchemy.url', current_app.config.get('SQLALCHEMY_DATABASE_URI'))
+target_metadata = Model.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Keeps autogenerate away from the search index, which is created outside the models,
+    including the shadow tables of the FTS5 table on SQLite
+
+    :return: False for the search index tables
+    """
+    if type_ == 'table' and name.startswith(SEARCH_TABLE):
+        return False
+    return True
+
+
+def run_migrations_offline():
+    """
+    Emits the migrations as SQL without connecting to the database
+
+    :return: None
+    """
+    context.configure(url=config.get_main_option('sqlalchemy.url'), target_metadata=target_metadata,
+                      include_object=include_object)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """
+    Runs the migrations against the database
+
+    :return: None
+    """
+
+    # an autogenerated revision without changes is not written
+    def process_revision_directives(context, revision, directives):
+        if getattr(config.cmd_opts, 'autogenerate', False):
+            script = directives[0]
+            if script.upgrade_ops.is_empty():
+                directives[:] = []
+                logger.info('No changes in schema detected.')
+
+    engine = engine_from_config(config.get_section(config.config_ini_section),
+                                prefix='sqlalchemy.',
+                                poolclass=pool.NullPool)
+
+    connection = engine.connect()
+    context.configure(connection=connection,
+                      target_metadata=target_metadata,
+                      include_object=include_object,
+                      render_as_batch=connection.dialect.name == 'sqlite',
+                      process_revision_directives=process_revision_directives,
+                      **current_app.extensions['migrate'].configure_args)
+
+    try:
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        connection.close()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
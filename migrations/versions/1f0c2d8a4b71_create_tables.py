@@ -0,0 +1,52 @@
+"""create the Users, Bucketlist and BucketlistItems tables
+
+Revision ID: 1f0c2d8a4b71
+Revises:
+Create Date: 2026-10-18 20:06:54
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1f0c2d8a4b71'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('Users',
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('first_name', sa.String(length=100), nullable=False),
+                    sa.Column('last_name', sa.String(length=100), nullable=False),
+                    sa.Column('username', sa.String(length=200), nullable=False),
+                    sa.Column('email', sa.String(length=200), nullable=False),
+                    sa.Column('hash_password', sa.String(length=1000), nullable=True),
+                    sa.PrimaryKeyConstraint('user_id'),
+                    sa.UniqueConstraint('email'),
+                    sa.UniqueConstraint('username'))
+    op.create_table('Bucketlist',
+                    sa.Column('bucketlist_id', sa.Integer(), nullable=False),
+                    sa.Column('bucketlist_name', sa.String(length=100), nullable=False),
+                    sa.Column('date', sa.Date(), nullable=True),
+                    sa.Column('user', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['user'], ['Users.user_id']),
+                    sa.PrimaryKeyConstraint('bucketlist_id'))
+    op.create_table('BucketlistItems',
+                    sa.Column('item_id', sa.Integer(), nullable=False),
+                    sa.Column('item_name', sa.String(length=100), nullable=False),
+                    sa.Column('date_created', sa.Date(), nullable=True),
+                    sa.Column('done', sa.Boolean(), nullable=False),
+                    sa.Column('date_completed', sa.Date(), nullable=True),
+                    sa.Column('description', sa.String(length=500), nullable=True),
+                    sa.Column('bucketlist', sa.Integer(), nullable=True),
+                    sa.ForeignKeyConstraint(['bucketlist'], ['Bucketlist.bucketlist_id']),
+                    sa.PrimaryKeyConstraint('item_id'))
+
+
+def downgrade():
+    op.drop_table('BucketlistItems')
+    op.drop_table('Bucketlist')
+    op.drop_table('Users')
@@ -0,0 +1,32 @@
+"""create and fill the bucketlist search index
+
+Revision ID: 2a7e5b9c3d04
+Revises: 1f0c2d8a4b71
+Create Date: 2026-10-18 20:06:54
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from bucketlist.models import search_index
+
+
+# revision identifiers, used by Alembic.
+revision = '2a7e5b9c3d04'
+down_revision = '1f0c2d8a4b71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    connection = op.get_bind()
+    for statement in search_index.search_index_ddl(connection.dialect.name):
+        op.execute(statement)
+    session = Session(bind=connection)
+    search_index.rebuild_search_index(session)
+    session.commit()
+
+
+def downgrade():
+    op.drop_table(search_index.SEARCH_TABLE)
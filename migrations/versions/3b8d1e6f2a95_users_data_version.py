@@ -0,0 +1,26 @@
+"""add the data_version change counter to Users
+
+Revision ID: 3b8d1e6f2a95
+Revises: 2a7e5b9c3d04
+Create Date: 2026-10-18 20:13:34
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8d1e6f2a95'
+down_revision = '2a7e5b9c3d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Users') as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('Users') as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,37 @@
+"""delete bucketlists and items with ON DELETE CASCADE foreign keys
+
+Revision ID: 4c9f3a7b5e12
+Revises: 3b8d1e6f2a95
+Create Date: 2026-10-18 20:21:28
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c9f3a7b5e12'
+down_revision = '3b8d1e6f2a95'
+branch_labels = None
+depends_on = None
+
+# the foreign keys were created without names, this convention gives them the names PostgreSQL generated
+# and lets batch mode find them in the tables it reflects and recreates on SQLite
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+
+def replace_foreign_key(table, column, referred_table, referred_column, ondelete):
+    name = '{}_{}_fkey'.format(table, column)
+    with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred_table, [column], [referred_column], ondelete=ondelete)
+
+
+def upgrade():
+    replace_foreign_key('Bucketlist', 'user', 'Users', 'user_id', 'CASCADE')
+    replace_foreign_key('BucketlistItems', 'bucketlist', 'Bucketlist', 'bucketlist_id', 'CASCADE')
+
+
+def downgrade():
+    replace_foreign_key('BucketlistItems', 'bucketlist', 'Bucketlist', 'bucketlist_id', None)
+    replace_foreign_key('Bucketlist', 'user', 'Users', 'user_id', None)
@@ -0,0 +1,34 @@
+"""add the item_count and done_count counters to Bucketlist
+
+Revision ID: 5d1a8c2e7f36
+Revises: 4c9f3a7b5e12
+Create Date: 2026-10-18 20:33:42
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1a8c2e7f36'
+down_revision = '4c9f3a7b5e12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('Bucketlist') as batch_op:
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('done_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.execute('UPDATE "Bucketlist" SET '
+               'item_count = (SELECT COUNT(*) FROM "BucketlistItems" '
+               'WHERE "BucketlistItems".bucketlist = "Bucketlist".bucketlist_id), '
+               'done_count = (SELECT COUNT(*) FROM "BucketlistItems" '
+               'WHERE "BucketlistItems".bucketlist = "Bucketlist".bucketlist_id AND "BucketlistItems".done)')
+
+
+def downgrade():
+    with op.batch_alter_table('Bucketlist') as batch_op:
+        batch_op.drop_column('done_count')
+        batch_op.drop_column('item_count')
@@ -0,0 +1,29 @@
+"""index the bucketlists by user and the items by bucketlist
+
+Revision ID: 6e2b4f8a1c53
+Revises: 5d1a8c2e7f36
+Create Date: 2026-10-18 20:43:36
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2b4f8a1c53'
+down_revision = '5d1a8c2e7f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_Bucketlist_user_bucketlist_id', 'Bucketlist', ['user', 'bucketlist_id'])
+    op.create_index('ix_BucketlistItems_bucketlist_item_id', 'BucketlistItems', ['bucketlist', 'item_id'])
+    op.create_index('ix_BucketlistItems_bucketlist_done_date_created', 'BucketlistItems',
+                    ['bucketlist', 'done', 'date_created'])
+
+
+def downgrade():
+    op.drop_index('ix_BucketlistItems_bucketlist_done_date_created', table_name='BucketlistItems')
+    op.drop_index('ix_BucketlistItems_bucketlist_item_id', table_name='BucketlistItems')
+    op.drop_index('ix_Bucketlist_user_bucketlist_id', table_name='Bucketlist')